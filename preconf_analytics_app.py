@@ -11,131 +11,134 @@ def __():
     import pandas as pd
     import polars as pl
 
-    from lancedb_tables.lance_table import LanceTable
+    from lance_preconfs import analytics, rendering
+    from lance_preconfs.config import DASHBOARD_REFRESH_INTERVAL, TABLE_PAGE_SIZES, URI
+    from lance_preconfs.loading import TableLoader
+    from lance_preconfs.lookup import HashLookup
+    from lance_preconfs.preconf_db import get_db
+    from lance_preconfs.snapshots import load_snapshot, snapshot_manifest
+    from lance_preconfs.windows import ALL, read_windows
     from datetime import datetime, timedelta
 
     pl.Config.set_fmt_str_lengths(200)
     pl.Config.set_fmt_float("full")
     None
-    return LanceTable, alt, datetime, mo, pd, pl, timedelta
+    return (
+        ALL,
+        DASHBOARD_REFRESH_INTERVAL,
+        HashLookup,
+        TABLE_PAGE_SIZES,
+        TableLoader,
+        URI,
+        alt,
+        analytics,
+        datetime,
+        get_db,
+        load_snapshot,
+        mo,
+        pd,
+        pl,
+        read_windows,
+        rendering,
+        snapshot_manifest,
+        timedelta,
+    )
 
 
 @app.cell(hide_code=True)
-def __(LanceTable, pl):
-    # Lance table info
+def __(TableLoader, load_snapshot, snapshot_manifest):
+    # Lance table info. Each table is read through its hot/cold tiers.
     commitment_table_name: str = "commitments"
-    l1_tx_table_name: str = "l1_txs"
+    commitments_l1_table_name: str = "commitments_l1"
     mev_boost_table_name: str = "mev_boost_blocks"
     index: str = "block_number"
-    lance_tables = LanceTable()
     uri: str = "data"  # locally saved to "data folder"
 
-    # open the mev-commit commitments table
-    commitments_table = lance_tables.open_table(
-        uri=uri, table=commitment_table_name
-    )
-
-    # open the l1 txs table
-    l1_tx_table = _table = lance_tables.open_table(uri=uri, table=l1_tx_table_name)
-    l1_tx_df = pl.from_arrow(l1_tx_table.to_lance().to_table())
-
-    # open mev-boost-blocks table
-    mev_boost_blocks = lance_tables.open_table(uri=uri, table=mev_boost_table_name)
-    mev_boost_blocks_df = pl.from_arrow((mev_boost_blocks.to_lance().to_table()))
+    # memory-map the frames snapshotted by the ingester; empty if missing or stale
+    _manifest = snapshot_manifest(uri)
+    snapshot_frames = load_snapshot(uri, manifest=_manifest) or {}
+
+    # without a snapshot, start loading every table at once on a thread pool; each section below waits
+    # only for the tables it uses
+    table_loader = TableLoader(
+        uri=uri,
+        prefetch=()
+        if snapshot_frames
+        else (commitment_table_name, commitments_l1_table_name, mev_boost_table_name),
+    )
+    if snapshot_frames:
+        # writes made after the snapshot was taken are applied on the first refresh
+        table_loader.cursor = _manifest.get("notification_id", table_loader.cursor)
     return (
         commitment_table_name,
-        commitments_table,
+        commitments_l1_table_name,
         index,
-        l1_tx_df,
-        l1_tx_table,
-        l1_tx_table_name,
-        lance_tables,
-        mev_boost_blocks,
-        mev_boost_blocks_df,
         mev_boost_table_name,
+        snapshot_frames,
+        table_loader,
         uri,
     )
 
 
+@app.cell
+def __(DASHBOARD_REFRESH_INTERVAL, mo):
+    # polls the write events published by the ingesters
+    data_refresh = mo.ui.refresh(
+        options=["5s", "25s", "1m"], default_interval=DASHBOARD_REFRESH_INTERVAL, label="data refresh"
+    )
+    # one state per table, bumped only when that table gets new rows, so only its cells re-run
+    get_commitments_version, set_commitments_version = mo.state(0)
+    get_commitments_l1_version, set_commitments_l1_version = mo.state(0)
+    get_mev_boost_version, set_mev_boost_version = mo.state(0)
+    data_refresh
+    return (
+        data_refresh,
+        get_commitments_l1_version,
+        get_commitments_version,
+        get_mev_boost_version,
+        set_commitments_l1_version,
+        set_commitments_version,
+        set_mev_boost_version,
+    )
+
+
+
+
 @app.cell(hide_code=True)
-def __(commitments_table, pl):
-    commit_df = (
-        pl.from_arrow(commitments_table.to_lance().to_table())
-        .with_columns(
-            (pl.col("dispatchTimestamp") - pl.col("decayStartTimeStamp")).alias(
-                "bid_decay_latency"
-            ),
-            (pl.col("bid") / 10**18).alias("bid_eth"),
-            pl.from_epoch("timestamp", time_unit="ms").alias("datetime"),
-        )
-        # bid decay calculations
-        # the formula to calculate the bid decay = (decayEndTimeStamp - decayStartTimeStamp) / (dispatchTimestamp - decayEndTimeStamp). If it's a negative number, then bid would have decayed to 0
-        .with_columns(
-            # need to change type from uint to int to account for negative numbers
-            pl.col("decayStartTimeStamp").cast(pl.Int64),
-            pl.col("decayEndTimeStamp").cast(pl.Int64),
-            pl.col("dispatchTimestamp").cast(pl.Int64),
-        )
-        .with_columns(
-            (pl.col("decayEndTimeStamp") - pl.col("decayStartTimeStamp")).alias(
-                "decay_range"
-            ),
-            (pl.col("decayEndTimeStamp") - pl.col("dispatchTimestamp")).alias(
-                "dispatch_range"
-            ),
-        )
-        .with_columns(
-            (pl.col("dispatch_range") / pl.col("decay_range")).alias(
-                "decay_multiplier"
-            )
-        )
-        .with_columns(
-            pl.when(pl.col("decay_multiplier") < 0)
-            .then(0)
-            .otherwise(pl.col("decay_multiplier"))
-        )
-        # calculate decayed bid. The decay multiplier is the amount that the bid decays by.
-        .with_columns(
-            (pl.col("decay_multiplier") * pl.col("bid_eth")).alias(
-                "decayed_bid_eth"
-            )
-        )
-        .select(
-            "datetime",
-            "bid_decay_latency",
-            "decay_multiplier",
-            "isSlash",
-            "block_number",
-            "blockNumber",
-            "txnHash",
-            "bid_eth",
-            "decayed_bid_eth",
-            "commiter",
-            "bidder",
-        )
-        .rename(
-            {
-                "block_number": "mev_commit_block_number",
-                "blockNumber": "l1_block_number",
-                "txnHash": "l1_txnHash",
-            }
-        )
-        .sort(by="datetime", descending=True)
+def __(
+    analytics,
+    commitment_table_name,
+    get_commitments_version,
+    snapshot_frames,
+    table_loader,
+):
+    get_commitments_version()  # re-run when new commitments are applied
+    # the same transform the ingester uses for snapshots and commitments_l1
+    commit_df = table_loader.derive(
+        "commit_df",
+        commitment_table_name,
+        analytics.prepare_commitments,
+        index="mev_commit_block_number",
+        initial=snapshot_frames.get("commit_df"),
     )
     return commit_df,
 
 
 @app.cell(hide_code=True)
-def __(commit_df, l1_tx_df, pl):
-    # join commits and l1 df together
-    commits_l1_df = commit_df.join(
-        l1_tx_df.rename({"hash": "l1_txnHash"}),
-        on="l1_txnHash",
-        how="left",
-        suffix="_l1",
-    ).with_columns(
-        # calculate if the preconf block was the same as the l1 block the tx ended up in
-        (pl.col("block_number") - pl.col("l1_block_number")).alias("l1_block_diff")
+def __(
+    commitments_l1_table_name,
+    get_commitments_l1_version,
+    snapshot_frames,
+    table_loader,
+):
+    get_commitments_l1_version()  # re-run when new or backfilled commitments_l1 rows are applied
+    # commits joined with their l1 txs, including l1_block_diff, as persisted by the ingester
+    commits_l1_df = table_loader.derive(
+        "commits_l1_df",
+        commitments_l1_table_name,
+        lambda commits_l1: commits_l1.sort(by="datetime", descending=True),
+        index="mev_commit_block_number",
+        initial=snapshot_frames.get("commits_l1_df"),
     )
     return commits_l1_df,
 
@@ -153,77 +156,60 @@ def __(mo):
 
 
 @app.cell(hide_code=True)
-def __():
-    def byte_to_string(hex_string):
-        if hex_string == "0x":
-            return ""
-        # Remove the "0x" prefix and decode the hex string
-        bytes_object = bytes.fromhex(hex_string[2:])
-        try:
-            human_readable_string = bytes_object.decode("utf-8")
-        except UnicodeDecodeError:
-            human_readable_string = bytes_object.decode("latin-1")
-        return human_readable_string
-    return byte_to_string,
-
+def __(
+    analytics,
+    get_mev_boost_version,
+    mev_boost_table_name,
+    snapshot_frames,
+    table_loader,
+):
+    get_mev_boost_version()  # re-run when new mev-boost blocks are applied
 
-@app.cell(hide_code=True)
-def __(byte_to_string, mev_boost_blocks_df, pl):
-    mev_boost_relay_transformed_df = mev_boost_blocks_df.with_columns(
-        pl.from_epoch("timestamp", time_unit="s").alias("datetime"),
-        # map byte_to_string
-        pl.col("extra_data")
-        .map_elements(byte_to_string, return_dtype=str)
-        .alias("builder_graffiti"),
-        pl.when(pl.col("relay").is_null())
-        .then(False)
-        .otherwise(True)
-        .alias("mev_boost"),
-        (pl.col("value") / 10**18).round(9).alias("block_bid_eth"),
-    ).select(
-        "datetime",
-        "block_number",
-        "builder_graffiti",
-        "mev_boost",
-        "relay",
-        "block_bid_eth",
-        "base_fee_per_gas",
-        "gas_used",
+    mev_boost_relay_transformed_df = table_loader.derive(
+        "mev_boost_relay_transformed_df",
+        mev_boost_table_name,
+        analytics.prepare_mev_boost,
+        index="block_number",
+        initial=snapshot_frames.get("mev_boost_relay_transformed_df"),
     )
     return mev_boost_relay_transformed_df,
 
 
 @app.cell
-def __(commit_df, mev_boost_relay_transformed_df, pl):
-    # transform commit_df to stsandardize to block level data
-    preconf_blocks_grouped_df = (
-        commit_df.select(
-            "l1_block_number",
-            "isSlash",
-            "bid_eth",
-            "decayed_bid_eth",
-            "commiter",
-            "bidder",
-        )
-        .group_by("l1_block_number")
-        .agg(
-            pl.col("decayed_bid_eth").sum().alias("total_decayed_bid_eth"),
-            pl.col("bid_eth").sum().alias("total_bid_eth"),
-            pl.col("isSlash").first().alias("isSlash"),
-        )
-    )
+def __(
+    commit_df,
+    commitment_table_name,
+    commitments_l1_table_name,
+    commits_l1_df,
+    data_refresh,
+    mev_boost_relay_transformed_df,
+    mev_boost_table_name,
+    set_commitments_l1_version,
+    set_commitments_version,
+    set_mev_boost_version,
+    table_loader,
+):
+    data_refresh.value
+    # runs after the frames are registered with the loader; applies new rows to them and bumps the
+    # version of each table that changed
+    changed_tables = table_loader.refresh()
+    _setters = {
+        commitment_table_name: set_commitments_version,
+        commitments_l1_table_name: set_commitments_l1_version,
+        mev_boost_table_name: set_mev_boost_version,
+    }
+    for _table in changed_tables:
+        if _table in _setters:
+            _setters[_table](lambda version: version + 1)
+    return changed_tables,
+
+
+@app.cell
+def __(analytics, commit_df, mev_boost_relay_transformed_df):
+    # transform commit_df to standardize to block level data, as the read API and DuckDB views do
+    preconf_blocks_grouped_df = analytics.preconf_blocks(commit_df)
     # join mev-boost data to preconf data
-    mev_boost_blocks_preconfs_joined_df = mev_boost_relay_transformed_df.join(
-        preconf_blocks_grouped_df,
-        left_on="block_number",
-        right_on="l1_block_number",
-        how="left",
-    ).with_columns(
-        pl.when(pl.col("total_bid_eth").is_not_null())
-        .then(True)
-        .otherwise(False)
-        .alias("preconf")
-    )
+    mev_boost_blocks_preconfs_joined_df = analytics.mev_boost_preconfs(mev_boost_relay_transformed_df, commit_df)
     return mev_boost_blocks_preconfs_joined_df, preconf_blocks_grouped_df
 
 
@@ -233,6 +219,7 @@ def __(
     mev_boost_blocks_preconfs_joined_df,
     mev_boost_relay_transformed_df,
     pl,
+    rendering,
 ):
     min_mev_boost_block = (
         mev_boost_relay_transformed_df.tail(3000)
@@ -272,8 +259,14 @@ def __(
 
     preconf_block_bids_chart = (
         alt.Chart(
-            mev_boost_blocks_preconfs_joined_df.tail(3000).filter(
-                pl.col("block_bid_eth") > 0
+            # LTTB-downsampled per preconf group so the browser gets a bounded number of points
+            rendering.downsample(
+                mev_boost_blocks_preconfs_joined_df.tail(3000).filter(
+                    pl.col("block_bid_eth") > 0
+                ),
+                x="datetime",
+                y="block_bid_eth",
+                by="preconf",
             )
         )
         .mark_point()
@@ -329,10 +322,16 @@ def __(mev_boost_blocks_preconfs_joined_df, pl):
 
 
 @app.cell
-def __(alt, preconf_bid_mev_boost_df):
+def __(alt, preconf_bid_mev_boost_df, rendering):
     # Create a scatter plot
     preconf_bid_breakdown = (
-        alt.Chart(preconf_bid_mev_boost_df.tail(3000))
+        alt.Chart(
+            rendering.downsample(
+                preconf_bid_mev_boost_df.tail(3000),
+                x="datetime",
+                y="preconf_bid_amt_pct",
+            )
+        )
         .mark_point()  # Mark type for scatter plot
         .encode(
             x=alt.X("datetime:T", title="datetime"),
@@ -367,16 +366,13 @@ def __(mo):
 
 
 @app.cell(hide_code=True)
-def __(commits_l1_df, pl):
+def __(analytics, commits_l1_df, get_commitments_l1_version, snapshot_frames):
+    # the snapshot aggregates hold until new commitments_l1 rows are applied; both come from analytics
     bidder_group_df = (
-        commits_l1_df.group_by("bidder")
-        .agg(
-            pl.len().alias("bid_count"),
-            pl.col("bid_eth").sum().alias("total_eth_bids"),
-            pl.col("decayed_bid_eth").sum().alias("total_decayed_eth_bids"),
-        )
-        .sort(by="bid_count", descending=True)
+        snapshot_frames.get("bidder_group_df") if get_commitments_l1_version() == 0 else None
     )
+    if bidder_group_df is None:
+        bidder_group_df = analytics.bidder_stats(commits_l1_df)
 
     # Melt the DataFrame
     melted_bidder_df = bidder_group_df.unpivot(
@@ -389,7 +385,7 @@ def __(commits_l1_df, pl):
 
 
 @app.cell(hide_code=True)
-def __(alt, bidder_group_df, melted_bidder_df):
+def __(alt, bidder_group_df, melted_bidder_df, rendering):
     # Bidder Activity Charts
     # Preconf Bid Count
     bidder_count_chart = (
@@ -406,7 +402,7 @@ def __(alt, bidder_group_df, melted_bidder_df):
 
     # Create a grouped bar chart
     bidder_bids_chart = (
-        alt.Chart(melted_bidder_df)
+        alt.Chart(rendering.top_k(melted_bidder_df, "bidder", "eth_bids"))
         .mark_bar()  # Bar mark
         .encode(
             y=alt.X(
@@ -445,32 +441,50 @@ def __(mo):
 
 
 @app.cell
-def __(commits_l1_df, pl):
+def __(analytics, commits_l1_df, get_commitments_l1_version, pl, snapshot_frames):
     # Round the datetime column to the nearest hour
     date_truncate_df = commits_l1_df.with_columns(
         pl.col("datetime").dt.truncate("1h").alias("hour")
     )
 
-    # Group by the rounded datetime and calculate the slash rate count
-    slash_rate_df = date_truncate_df.group_by("hour").agg(
-        [
-            pl.col("isSlash")
-            .sum()
-            .alias("slash_count"),  # Count of True in 'isSlash'
-            pl.len().alias("total_count"),  # Total count per hour
-        ]
-    )
-
-    # Add a new column for the slash rate (optional)
-    slash_rate_df = slash_rate_df.with_columns(
-        (pl.col("slash_count") / pl.col("total_count")).alias("slash_rate"),
-        (pl.col("total_count") - pl.col("slash_count")).alias("non_slash_count"),
+    slash_rate_df = (
+        snapshot_frames.get("slash_rate_df") if get_commitments_l1_version() == 0 else None
     )
+    if slash_rate_df is None:
+        # hourly slash counts and rates, as in the snapshot
+        slash_rate_df = analytics.slash_rates(commits_l1_df)
     return date_truncate_df, slash_rate_df
 
 
 @app.cell
-def __(alt, date_truncate_df, datetime, pd, pl, slash_rate_df, timedelta):
+def __(ALL, URI, get_commitments_version, pl, read_windows):
+    get_commitments_version()  # re-read after each applied commitments batch
+    # Sliding-window slash rates kept up to date by the ingester (1h/24h/7d per provider)
+    slash_windows_df = read_windows(URI)
+    provider_slash_windows_df = None
+    if slash_windows_df is not None:
+        provider_slash_windows_df = (
+            slash_windows_df.filter(pl.col("commiter") != ALL)
+            .pivot(on="window", index="commiter", values="slash_rate")
+            .sort("24h", descending=True)
+        )
+    provider_slash_windows_df
+    return provider_slash_windows_df, slash_windows_df
+
+
+@app.cell
+def __(
+    ALL,
+    alt,
+    date_truncate_df,
+    datetime,
+    pd,
+    pl,
+    rendering,
+    slash_rate_df,
+    slash_windows_df,
+    timedelta,
+):
     # Calculate data for the past 24 hours
     current_time = datetime.now()
     past_24_hours = current_time - timedelta(hours=24)
@@ -478,13 +492,21 @@ def __(alt, date_truncate_df, datetime, pd, pl, slash_rate_df, timedelta):
     # Filter for the past 24 hours
     df_last_24_hours = slash_rate_df.filter(pl.col("hour") >= past_24_hours)
 
-    # Calculate total slash count and rate for the past 24 hours
-    total_slash_count = df_last_24_hours["slash_count"].sum()
-    total_non_slash_count = df_last_24_hours["non_slash_count"].sum()
-    # Check for None type and set total_slash_rate to 0 if None
-    total_slash_rate = df_last_24_hours["slash_rate"].mean()
-    if total_slash_rate is None:
-        total_slash_rate = 0
+    # Calculate total slash count and rate for the past 24 hours, from the streaming windows when published
+    window_24h = (
+        slash_windows_df.filter((pl.col("commiter") == ALL) & (pl.col("window") == "24h"))
+        if slash_windows_df is not None
+        else None
+    )
+    if window_24h is not None and not window_24h.is_empty():
+        total_slash_count = window_24h["slashed"][0]
+        total_non_slash_count = window_24h["total"][0] - total_slash_count
+        total_slash_rate = window_24h["slash_rate"][0]
+    else:
+        total_slash_count = df_last_24_hours["slash_count"].sum()
+        total_non_slash_count = df_last_24_hours["non_slash_count"].sum()
+        _total = total_slash_count + total_non_slash_count
+        total_slash_rate = total_slash_count / _total if _total else 0
 
 
     # Create formatted strings for each line of the text box
@@ -543,21 +565,23 @@ def __(alt, date_truncate_df, datetime, pd, pl, slash_rate_df, timedelta):
     #     .properties(title="Historical Slashing Rates")
     # )
 
+    # counts are aggregated per hour here, so the chart gets one row per bar
+    hourly_slash_counts = rendering.time_buckets(
+        date_truncate_df.head(3000), "hour", "1h", by="isSlash"
+    )
     grouped_slashing_chart = (
-        alt.Chart(date_truncate_df.head(3000))
+        alt.Chart(hourly_slash_counts)
         .mark_bar()
         .encode(
             x=alt.X("hour:T", title="Hour", axis=alt.Axis(labelAngle=45)),
-            y=alt.Y(
-                "count(isSlash):Q", title="Count", stack="zero"
-            ),  # Stack areas
+            y=alt.Y("count:Q", title="Count", stack="zero"),  # Stack areas
             color=alt.Color(
                 "isSlash:N", title="Metric"
             ),  # Treat 'isSlash' as a categorical variable
             tooltip=[
                 "hour:T",
                 "isSlash:N",
-                "count(isSlash):Q",
+                "count:Q",
             ],
         )
         .properties(
@@ -598,12 +622,14 @@ def __(alt, date_truncate_df, datetime, pd, pl, slash_rate_df, timedelta):
         df_last_24_hours,
         final_slashing_chart,
         grouped_slashing_chart,
+        hourly_slash_counts,
         past_24_hours,
         slash_stats_text_box,
         summary_text,
         total_non_slash_count,
         total_slash_count,
         total_slash_rate,
+        window_24h,
     )
 
 
@@ -628,13 +654,19 @@ def __(date_truncate_df, pl):
 
 
 @app.cell
-def __(alt, color, commiter_slash_rate_df, past_24_hours, pl):
-    # Melted commiter slashing dataframe (total history)
-    historical_provider_slashing = commiter_slash_rate_df.unpivot(
-        index=["hour", "commiter"],  # Columns to keep
-        on=["slash_count", "non_slash_count"],  # Columns to melt
-        variable_name="Metric",  # New column name for the metric names
-        value_name="Count",  # New column name for the counts
+def __(alt, color, commiter_slash_rate_df, past_24_hours, pl, rendering):
+    # Melted commiter slashing dataframe (total history), summed per provider and limited to the top providers
+    historical_provider_slashing = rendering.top_k(
+        commiter_slash_rate_df.group_by("commiter")
+        .agg(pl.col("slash_count").sum(), pl.col("non_slash_count").sum())
+        .unpivot(
+            index=["commiter"],  # Columns to keep
+            on=["slash_count", "non_slash_count"],  # Columns to melt
+            variable_name="Metric",  # New column name for the metric names
+            value_name="Count",  # New column name for the counts
+        ),
+        "commiter",
+        "Count",
     )
 
     # Filter the DataFrame for the past 24 hours
@@ -643,11 +675,15 @@ def __(alt, color, commiter_slash_rate_df, past_24_hours, pl):
     )
 
     # Reshape the filtered DataFrame to a long format for the second stacked bar chart
-    filtered_provider_slash_melted_df = filtered_provider_slashing_df.unpivot(
-        index=["hour", "commiter"],  # Columns to keep
-        on=["slash_count", "non_slash_count"],  # Columns to melt
-        variable_name="Metric",  # New column name for the metric names
-        value_name="Count",  # New column name for the counts
+    filtered_provider_slash_melted_df = rendering.top_k(
+        filtered_provider_slashing_df.unpivot(
+            index=["hour", "commiter"],  # Columns to keep
+            on=["slash_count", "non_slash_count"],  # Columns to melt
+            variable_name="Metric",  # New column name for the metric names
+            value_name="Count",  # New column name for the counts
+        ).drop("hour"),
+        "commiter",
+        "Count",
     )
 
     # Create the first stacked bar chart (already provided)
@@ -710,6 +746,43 @@ def __(mo):
     return
 
 
+@app.cell
+def __(HashLookup, mo, uri):
+    hash_lookup = HashLookup(uri=uri)
+    hash_search = mo.ui.text(
+        placeholder="0x...",
+        label="Find a commitment by txnHash, commitmentHash, bidHash or commitmentDigest",
+        full_width=True,
+    )
+    hash_search
+    return hash_lookup, hash_search
+
+
+@app.cell(hide_code=True)
+def __(hash_lookup, hash_search, mo):
+    # exact-match lookup through the commitment hash index
+    hash_lookup_result = hash_lookup.resolve(hash_search.value) if hash_search.value else None
+    if not hash_search.value:
+        _output = None
+    elif hash_lookup_result is None:
+        _output = mo.md("No commitment found for this hash.")
+    else:
+        _output = mo.vstack(
+            [
+                item
+                for _title, _df in (
+                    ("Commitment", hash_lookup_result["commitments"]),
+                    ("L1 transaction", hash_lookup_result["l1_txs"]),
+                    ("mev-boost block", hash_lookup_result["mev_boost_blocks"]),
+                )
+                if _df is not None
+                for item in (mo.md(f"**{_title}**"), mo.ui.table(_df, selection=None))
+            ]
+        )
+    _output
+    return hash_lookup_result,
+
+
 @app.cell
 def __(mo):
     mo.md("""Search for preconfirmation bids. Filter each column further by clicking on the column name.""")
@@ -747,18 +820,69 @@ def __(max_block_slider):
 
 
 @app.cell(hide_code=True)
-def __(commits_l1_df, max_block_slider, mo, pl):
-    # Cell 3 - display the transformed dataframe
-    filtered_df = commits_l1_df.filter(
-        pl.col("mev_commit_block_number") > min(max_block_slider.value)
-    ).filter(pl.col("mev_commit_block_number") < max(max_block_slider.value))
+def __(TABLE_PAGE_SIZES, get_db, max_block_slider, mo, rendering):
+    # rows in the selected block range are counted and paged in DuckDB, only the current page reaches the browser
+    preconf_db = get_db()
+    block_range_where = "mev_commit_block_number > $min_block AND mev_commit_block_number < $max_block"
+    block_range_params = {
+        "min_block": min(max_block_slider.value),
+        "max_block": max(max_block_slider.value),
+    }
+    filtered_row_count = rendering.count_rows(
+        preconf_db, "commitments_l1", block_range_where, block_range_params
+    )
+    page_size_dropdown = mo.ui.dropdown(
+        [str(size) for size in TABLE_PAGE_SIZES], value="50", label="rows per page"
+    )
+    page_size_dropdown
+    return (
+        block_range_params,
+        block_range_where,
+        filtered_row_count,
+        page_size_dropdown,
+        preconf_db,
+    )
+
+
+@app.cell
+def __(filtered_row_count, mo, page_size_dropdown):
+    page_count = max(1, -(-filtered_row_count // int(page_size_dropdown.value)))
+    page_number = mo.ui.number(
+        start=1,
+        stop=page_count,
+        value=1,
+        label=f"page (of {page_count}, {filtered_row_count} commitments)",
+    )
+    page_number
+    return page_count, page_number
+
+
+@app.cell(hide_code=True)
+def __(
+    block_range_params,
+    block_range_where,
+    mo,
+    page_number,
+    page_size_dropdown,
+    preconf_db,
+    rendering,
+):
+    # Cell 3 - display the current page of the transformed dataframe
+    filtered_df = rendering.page(
+        preconf_db,
+        "commitments_l1",
+        page_number.value,
+        int(page_size_dropdown.value),
+        block_range_where,
+        block_range_params,
+    )
     mo.ui.table(filtered_df)
     return filtered_df,
 
 
 @app.cell
 def __(mo):
-    mo.md("""## BI Explorer""")
+    mo.md("""## BI Explorer (current page)""")
     return
 
 
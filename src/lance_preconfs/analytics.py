@@ -0,0 +1,182 @@
+import polars as pl
+
+# Columns of `commit_df`, the prepared commitments frame.
+COMMIT_DF_COLUMNS: tuple[str, ...] = (
+    "datetime", "bid_decay_latency", "decay_multiplier", "isSlash", "mev_commit_block_number", "l1_block_number",
+    "l1_txnHash", "bid_eth", "decayed_bid_eth", "commiter", "bidder", "commitmentIndex",
+)
+
+
+def byte_to_string(hex_string):
+    if hex_string == "0x":
+        return ""
+    # Remove the "0x" prefix and decode the hex string
+    bytes_object = bytes.fromhex(hex_string[2:])
+    try:
+        human_readable_string = bytes_object.decode("utf-8")
+    except UnicodeDecodeError:
+        human_readable_string = bytes_object.decode("latin-1")
+    return human_readable_string
+
+
+def prepare_commitments(commitments: pl.DataFrame) -> pl.DataFrame:
+    """
+    Raw commitments rows -> `commit_df` with bid amounts in ETH and decayed bids, as shown in the dashboard.
+    """
+    return (
+        commitments
+        .with_columns(
+            (pl.col("dispatchTimestamp") - pl.col("decayStartTimeStamp")).alias("bid_decay_latency"),
+            (pl.col("bid") / 10**18).alias("bid_eth"),
+            pl.from_epoch("timestamp", time_unit="ms").alias("datetime"),
+        )
+        # bid decay = (decayEndTimeStamp - dispatchTimestamp) / (decayEndTimeStamp - decayStartTimeStamp), floored at 0
+        .with_columns(
+            pl.col("decayStartTimeStamp").cast(pl.Int64),
+            pl.col("decayEndTimeStamp").cast(pl.Int64),
+            pl.col("dispatchTimestamp").cast(pl.Int64),
+        )
+        .with_columns(
+            (pl.col("decayEndTimeStamp") - pl.col("decayStartTimeStamp")).alias("decay_range"),
+            (pl.col("decayEndTimeStamp") - pl.col("dispatchTimestamp")).alias("dispatch_range"),
+        )
+        .with_columns((pl.col("dispatch_range") / pl.col("decay_range")).alias("decay_multiplier"))
+        .with_columns(
+            pl.when(pl.col("decay_multiplier") < 0).then(0).otherwise(pl.col("decay_multiplier"))
+        )
+        .with_columns((pl.col("decay_multiplier") * pl.col("bid_eth")).alias("decayed_bid_eth"))
+        .select(
+            "datetime", "bid_decay_latency", "decay_multiplier", "isSlash", "block_number", "blockNumber",
+            "txnHash", "bid_eth", "decayed_bid_eth", "commiter", "bidder", "commitmentIndex",
+        )
+        .rename({
+            "block_number": "mev_commit_block_number",
+            "blockNumber": "l1_block_number",
+            "txnHash": "l1_txnHash",
+        })
+        .sort(by="datetime", descending=True)
+    )
+
+
+def join_l1(commit_df: pl.DataFrame, l1_tx_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Join commitments to the L1 transactions they preconfirmed -> `commits_l1_df`.
+    """
+    return commit_df.join(
+        l1_tx_df.rename({"hash": "l1_txnHash"}),
+        on="l1_txnHash",
+        how="left",
+        suffix="_l1",
+    ).with_columns(
+        # calculate if the preconf block was the same as the l1 block the tx ended up in
+        (pl.col("block_number") - pl.col("l1_block_number")).alias("l1_block_diff")
+    )
+
+
+def prepare_mev_boost(mev_boost_blocks: pl.DataFrame) -> pl.DataFrame:
+    """
+    Raw mev-boost blocks -> `mev_boost_relay_transformed_df`.
+    """
+    return mev_boost_blocks.with_columns(
+        pl.from_epoch("timestamp", time_unit="s").alias("datetime"),
+        pl.col("extra_data").map_elements(byte_to_string, return_dtype=str).alias("builder_graffiti"),
+        pl.col("relay").is_not_null().alias("mev_boost"),
+        (pl.col("value") / 10**18).round(9).alias("block_bid_eth"),
+    ).select(
+        "datetime", "block_number", "builder_graffiti", "mev_boost", "relay", "block_bid_eth",
+        "base_fee_per_gas", "gas_used",
+    )
+
+
+def slash_rates(commit_df: pl.DataFrame, every: str = "1h", by: tuple[str, ...] = ()) -> pl.DataFrame:
+    """
+    Slash counts and rates per time bucket, optionally split by extra columns such as "commiter".
+    """
+    return (
+        commit_df.with_columns(pl.col("datetime").dt.truncate(every).alias("hour"))
+        .group_by("hour", *by)
+        .agg(
+            pl.col("isSlash").sum().alias("slash_count"),
+            pl.len().alias("total_count"),
+        )
+        .with_columns(
+            (pl.col("slash_count") / pl.col("total_count")).alias("slash_rate"),
+            (pl.col("total_count") - pl.col("slash_count")).alias("non_slash_count"),
+        )
+        .sort("hour", *by)
+    )
+
+
+def bidder_stats(commit_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Commitment count and bid totals per bidder.
+    """
+    return (
+        commit_df.group_by("bidder")
+        .agg(
+            pl.len().alias("bid_count"),
+            pl.col("bid_eth").sum().alias("total_eth_bids"),
+            pl.col("decayed_bid_eth").sum().alias("total_decayed_eth_bids"),
+        )
+        .sort(by="bid_count", descending=True)
+    )
+
+
+def provider_stats(commit_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Commitment count, slash rate and bid totals per provider.
+    """
+    return (
+        commit_df.group_by("commiter")
+        .agg(
+            pl.len().alias("total_count"),
+            pl.col("isSlash").sum().alias("slash_count"),
+            pl.col("bid_eth").sum().alias("total_eth_bids"),
+            pl.col("decayed_bid_eth").sum().alias("total_decayed_eth_bids"),
+        )
+        .with_columns((pl.col("slash_count") / pl.col("total_count")).alias("slash_rate"))
+        .sort(by="total_count", descending=True)
+    )
+
+
+def preconf_blocks(commit_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Preconf bid totals per L1 block. A block counts as slashed if any of its preconfs was, as in the
+    preconf_per_block DuckDB view.
+    """
+    return commit_df.group_by("l1_block_number").agg(
+        pl.col("decayed_bid_eth").sum().alias("total_decayed_bid_eth"),
+        pl.col("bid_eth").sum().alias("total_bid_eth"),
+        pl.col("isSlash").any().alias("isSlash"),
+    )
+
+
+def mev_boost_preconfs(mev_boost_df: pl.DataFrame, commit_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    mev-boost blocks joined with their preconf totals -> `mev_boost_blocks_preconfs_joined_df`.
+    """
+    return mev_boost_df.join(
+        preconf_blocks(commit_df),
+        left_on="block_number",
+        right_on="l1_block_number",
+        how="left",
+    ).with_columns(pl.col("total_bid_eth").is_not_null().alias("preconf"))
+
+
+def preconf_share(mev_boost_df: pl.DataFrame, commit_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Share of blocks that went through mev-boost, share that carried preconfs, and the mean fraction of
+    the mev-boost bid paid by preconfs in those blocks.
+    """
+    joined = mev_boost_preconfs(mev_boost_df, commit_df)
+    return joined.select(
+        pl.len().alias("blocks"),
+        pl.col("mev_boost").sum().alias("mev_boost_blocks"),
+        pl.col("preconf").sum().alias("preconf_blocks"),
+        pl.col("mev_boost").mean().alias("mev_boost_share"),
+        pl.col("preconf").mean().alias("preconf_share"),
+        (pl.col("total_decayed_bid_eth") / pl.col("block_bid_eth"))
+        .filter(pl.col("preconf") & (pl.col("block_bid_eth") > 0))
+        .mean()
+        .alias("mean_preconf_bid_pct"),
+    )
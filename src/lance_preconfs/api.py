@@ -0,0 +1,278 @@
+import datetime
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import lancedb
+import polars as pl
+import pyarrow as pa
+
+from lance_preconfs import analytics
+from lance_preconfs.config import (
+    API_CACHE_SIZE,
+    API_HOST,
+    API_PORT,
+    API_WARM_INTERVAL,
+    COMMITMENT_TABLE_NAME,
+    COMMITMENTS_L1_TABLE_NAME,
+    L1_TX_TABLE_NAME,
+    LOG_FORMAT,
+    MEV_BOOST_TABLE_NAME,
+    SLASH_WINDOWS_FILE,
+    URI,
+)
+from lance_preconfs.lookup import HashLookup
+from lance_preconfs.profiles import ROLES, ProfileStore
+from lance_preconfs.tiers import TieredTable, open_tiered
+from lance_preconfs.windows import read_windows
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM: str = "application/vnd.apache.arrow.stream"
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ReadApi:
+    """
+    Computes the analytics served over HTTP and caches the encoded responses keyed by endpoint,
+    parameters, output format and the data version of the tables, so a repeated request for
+    unchanged data is answered from memory and carries a stable ETag.
+    """
+
+    def __init__(self, uri: str = URI, cache_size: int = API_CACHE_SIZE) -> None:
+        db = lancedb.connect(uri)
+        self.uri: str = uri
+        self.tables: dict[str, TieredTable] = {
+            name: open_tiered(name, uri=uri, db=db)
+            for name in (COMMITMENT_TABLE_NAME, L1_TX_TABLE_NAME, COMMITMENTS_L1_TABLE_NAME, MEV_BOOST_TABLE_NAME)
+        }
+        self.profiles: ProfileStore = ProfileStore(db)
+        self.lookup: HashLookup = HashLookup(uri=uri, db=db)
+        self.cache_size: int = cache_size
+        self._cache: OrderedDict[tuple, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, Callable[[dict[str, str]], pl.DataFrame]] = {
+            "/slash-rates": self.slash_rates,
+            "/providers/slash-rates": self.provider_slash_rates,
+            "/slash-rates/windows": self.slash_rate_windows,
+            "/bidders": self.bidders,
+            "/providers": self.providers,
+            "/mev-boost/preconf-share": self.preconf_share,
+            "/commitments": self.commitments,
+            "/similar": self.similar,
+        }
+
+    def data_version(self) -> str:
+        versions = [table.version() for table in self.tables.values()]
+        windows_path = os.path.join(self.uri, SLASH_WINDOWS_FILE)
+        if os.path.exists(windows_path):
+            versions.append(str(os.stat(windows_path).st_mtime_ns))
+        return "-".join(versions)
+
+    def _commit_df(self, params: dict[str, str]) -> pl.DataFrame:
+        start = None
+        if "hours" in params:
+            start = datetime.datetime.now() - datetime.timedelta(hours=float(params["hours"]))
+        raw = self.tables[COMMITMENT_TABLE_NAME].to_arrow(start=start)
+        return analytics.prepare_commitments(pl.from_arrow(raw))
+
+    def slash_rates(self, params: dict[str, str]) -> pl.DataFrame:
+        return analytics.slash_rates(self._commit_df(params), every=params.get("every", "1h"))
+
+    def provider_slash_rates(self, params: dict[str, str]) -> pl.DataFrame:
+        return analytics.slash_rates(self._commit_df(params), every=params.get("every", "1h"), by=("commiter",))
+
+    def slash_rate_windows(self, params: dict[str, str]) -> pl.DataFrame:
+        """
+        Sliding-window slash rates published by the ingester, optionally for one `commiter` or `window`.
+        """
+        windows = read_windows(self.uri)
+        if windows is None:
+            return pl.DataFrame()
+        if "commiter" in params:
+            windows = windows.filter(pl.col("commiter").str.to_lowercase() == params["commiter"].lower())
+        if "window" in params:
+            windows = windows.filter(pl.col("window") == params["window"])
+        return windows
+
+    def bidders(self, params: dict[str, str]) -> pl.DataFrame:
+        return analytics.bidder_stats(self._commit_df(params))
+
+    def providers(self, params: dict[str, str]) -> pl.DataFrame:
+        return analytics.provider_stats(self._commit_df(params))
+
+    def preconf_share(self, params: dict[str, str]) -> pl.DataFrame:
+        try:
+            commit_df = self._commit_df(params)
+            blocks = self.tables[MEV_BOOST_TABLE_NAME].to_arrow()
+        except FileNotFoundError:
+            return pl.DataFrame()  # nothing ingested yet
+        return analytics.preconf_share(analytics.prepare_mev_boost(pl.from_arrow(blocks)), commit_df)
+
+    def commitments(self, params: dict[str, str]) -> pl.DataFrame:
+        """
+        Commitments (joined with their L1 tx) matching `hash` on any hash column through the hash index,
+        or raw commitments in the block range `[from_block, to_block)`.
+        """
+        table = self.tables[COMMITMENT_TABLE_NAME]
+        if "hash" in params:
+            result = self.lookup.resolve(params["hash"])
+            if result is None or result["commitments"] is None:
+                return pl.DataFrame()
+            return result["commitments"]
+        if "from_block" in params or "to_block" in params:
+            from_block = int(params["from_block"]) if "from_block" in params else None
+            to_block = int(params["to_block"]) if "to_block" in params else None
+            return pl.from_arrow(table.to_arrow(from_block=from_block, to_block=to_block))
+        raise BadRequest("commitments needs hash or from_block/to_block")
+
+    def similar(self, params: dict[str, str]) -> pl.DataFrame:
+        """
+        The `k` participants whose behaviour profile is closest to `address` in `role`.
+        """
+        address = params.get("address", "").lower()
+        role = params.get("role", "commiter")
+        if role not in ROLES:
+            raise BadRequest(f"role must be one of {', '.join(ROLES)}")
+        if not address or not all(c in "0123456789abcdefx" for c in address):
+            raise BadRequest("address must be hex")
+        results = self.profiles.similar(address, role=role, k=int(params.get("k", 10)))
+        if results is None:
+            raise BadRequest(f"no profile for {role} {address}")
+        return results
+
+    @staticmethod
+    def encode(df: pl.DataFrame, fmt: str) -> bytes:
+        if fmt == "arrow":
+            sink = io.BytesIO()
+            table = df.to_arrow()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue()
+        return df.write_json().encode()
+
+    def get(self, path: str, params: dict[str, str], fmt: str, version: Optional[str] = None) -> tuple[str, bytes]:
+        """
+        Return `(etag, body)` for an endpoint, computing it only if the data changed since it was cached.
+        """
+        if path not in self.endpoints:
+            raise KeyError(path)
+        version = self.data_version() if version is None else version
+        key = (path, tuple(sorted(params.items())), fmt, version)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        body = self.encode(self.endpoints[path](params), fmt)
+        etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest() + '"'
+        with self._lock:
+            self._cache[key] = (etag, body)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return etag, body
+
+    def warm(self) -> None:
+        """
+        Precompute the default responses of the summary endpoints for the current data version.
+        """
+        version = self.data_version()
+        for path in ("/slash-rates", "/providers/slash-rates", "/bidders", "/providers", "/mev-boost/preconf-share"):
+            for fmt in ("json", "arrow"):
+                try:
+                    self.get(path, {}, fmt, version=version)
+                except Exception as e:
+                    logger.error(f"Error precomputing {path}: {e}")
+
+
+def make_handler(api: ReadApi) -> type:
+    class ReadApiHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", etag: Optional[str] = None) -> None:
+            self.send_response(status)
+            if etag is not None:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            if body:
+                self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _error(self, status: int, message: str) -> None:
+            self._send(status, json.dumps({"error": message}).encode())
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            fmt = params.pop("format", None)
+            if fmt is None:
+                fmt = "arrow" if ARROW_STREAM in self.headers.get("Accept", "") else "json"
+            if fmt not in ("json", "arrow"):
+                return self._error(400, "format must be json or arrow")
+
+            try:
+                etag, body = api.get(url.path.rstrip("/") or "/", params, fmt)
+            except KeyError:
+                return self._error(404, f"unknown endpoint {url.path}")
+            except FileNotFoundError as e:
+                return self._error(404, str(e))  # a table the endpoint reads has not been written yet
+            except (BadRequest, ValueError) as e:
+                return self._error(400, str(e))
+            except Exception as e:
+                logger.error(f"Error serving {self.path}: {e}")
+                return self._error(500, "internal error")
+
+            if etag in self.headers.get("If-None-Match", ""):
+                return self._send(304, etag=etag)
+            self._send(200, body, ARROW_STREAM if fmt == "arrow" else "application/json", etag=etag)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(format % args)
+
+    return ReadApiHandler
+
+
+def serve(host: str = API_HOST, port: int = API_PORT, uri: str = URI) -> None:
+    """
+    Serve the read API until interrupted, precomputing summary endpoints whenever the data changes.
+    """
+    api = ReadApi(uri=uri)
+    stop = threading.Event()
+
+    def warm_loop() -> None:
+        while not stop.is_set():
+            started = time.monotonic()
+            api.warm()
+            stop.wait(max(0.0, API_WARM_INTERVAL - (time.monotonic() - started)))
+
+    threading.Thread(target=warm_loop, name="api-warm", daemon=True).start()
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    logger.info(f"Read API listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# `lance-preconfs` command line. Only the standard library and the constants in config are imported at
+# module level; each command imports what it needs when it runs, so maintenance and status commands start
+# without loading polars, lancedb, duckdb or the Hypersync clients.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Optional
+
+from lance_preconfs.config import (
+    COMMITMENT_TABLE_NAME,
+    COMMITMENTS_L1_TABLE_NAME,
+    DEFAULT_NETWORK,
+    ENABLED_NETWORKS,
+    L1_TX_TABLE_NAME,
+    LOG_FORMAT,
+    MEV_BOOST_TABLE_NAME,
+    NETWORKS,
+    SLASH_WINDOWS_FILE,
+    SNAPSHOT_DIR,
+)
+
+TABLES: tuple[str, ...] = (COMMITMENT_TABLE_NAME, L1_TX_TABLE_NAME, COMMITMENTS_L1_TABLE_NAME, MEV_BOOST_TABLE_NAME)
+COMMANDS: tuple[str, ...] = ("ingest", "backfill", "compact", "bench", "lookup", "status")
+IMPORT_BUDGET: float = 1.0  # Seconds `bench` allows for starting the CLI
+
+
+def _setup_logging() -> None:
+    import logging
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+
+def ingest(args: argparse.Namespace) -> int:
+    from lance_preconfs.service import run_networks
+    run_networks(args.networks or ENABLED_NETWORKS, processes=args.processes)
+    return 0
+
+
+def backfill(args: argparse.Namespace) -> int:
+    """
+    Run one ingestion cycle of each source of the network, catching up to the chain head, and exit.
+    """
+    import asyncio
+
+    from lance_preconfs.clients import SharedClients
+    from lance_preconfs.commitments import run_commitments_cycle
+    from lance_preconfs.mev_boost import run_mev_boost_cycle
+
+    _setup_logging()
+    network = NETWORKS[args.network]
+    cycles = {"commitments": run_commitments_cycle, "mev_boost": run_mev_boost_cycle}
+
+    async def run() -> None:
+        clients = SharedClients(network)
+        for source in args.sources or network.sources:
+            await cycles[source](clients)
+        await clients.flush()
+
+    asyncio.run(run())
+    return 0
+
+
+def compact(args: argparse.Namespace) -> int:
+    """
+    Promote finalized hot rows, compact the cold partitions and apply retention for every table.
+    """
+    import lancedb
+
+    from lance_preconfs.tiers import open_tiered
+
+    _setup_logging()
+    uri = NETWORKS[args.network].uri
+    db = lancedb.connect(uri)
+    for name in args.tables or TABLES:
+        table = open_tiered(name, uri=uri, db=db)
+        promoted = table.promote()
+        table.compact()
+        print(f"{name}: promoted {promoted} rows, compacted")
+    return 0
+
+
+def lookup(args: argparse.Namespace) -> int:
+    import polars as pl
+
+    from lance_preconfs.lookup import HashLookup
+
+    pl.Config.set_fmt_str_lengths(200)
+    result = HashLookup(uri=NETWORKS[args.network].uri).resolve(args.hash)
+    if result is None:
+        print(f"No commitment found for {args.hash}")
+        return 1
+    for kind, frame in result.items():
+        print(f"{kind}:")
+        print(frame if frame is not None else "  none")
+    return 0
+
+
+def _manifest_status(uri: str, name: str) -> dict:
+    path = os.path.join(uri, f"{name}.manifest.json")
+    if not os.path.exists(path):
+        return {"table": name, "partitions": 0}
+    with open(path) as f:
+        partitions = json.load(f)["partitions"]
+    tiers: dict[str, int] = {}
+    for partition in partitions:
+        tiers[partition["tier"]] = tiers.get(partition["tier"], 0) + 1
+    blocks = [p["max_block"] for p in partitions if p["max_block"] is not None]
+    return {
+        "table": name,
+        "partitions": len(partitions),
+        "tiers": tiers,
+        "cold_rows": sum(p["rows"] for p in partitions),
+        "cold_max_block": max(blocks) if blocks else None,
+        "updated": os.stat(path).st_mtime,
+    }
+
+
+def status(args: argparse.Namespace) -> int:
+    """
+    Print table, snapshot and slash-window state from the manifests and metadata files alone.
+    """
+    uri = NETWORKS[args.network].uri
+    report: dict = {"network": args.network, "uri": uri, "tables": [_manifest_status(uri, name) for name in TABLES]}
+
+    latest = os.path.join(uri, SNAPSHOT_DIR, "LATEST")
+    if os.path.exists(latest):
+        with open(latest) as f:
+            version = f.read().strip()
+        report["snapshot"] = {"version": version, "age_seconds": round(time.time() - int(version) / 1e9)}
+
+    windows = os.path.join(uri, SLASH_WINDOWS_FILE)
+    if os.path.exists(windows):
+        report["slash_windows_age_seconds"] = round(time.time() - os.stat(windows).st_mtime)
+
+    if args.json:
+        print(json.dumps(report, indent=1))
+        return 0
+    print(f"network {report['network']} ({uri})")
+    for table in report["tables"]:
+        if not table["partitions"]:
+            print(f"  {table['table']}: no cold partitions")
+            continue
+        age = time.time() - table["updated"]
+        print(
+            f"  {table['table']}: {table['cold_rows']} cold rows in {table['partitions']} partitions {table['tiers']}, "
+            f"up to block {table['cold_max_block']}, manifest updated {age:.0f}s ago"
+        )
+    if "snapshot" in report:
+        print(f"  dashboard snapshot {report['snapshot']['version']}, {report['snapshot']['age_seconds']}s old")
+    if "slash_windows_age_seconds" in report:
+        print(f"  slash-rate windows published {report['slash_windows_age_seconds']}s ago")
+    return 0
+
+
+def _time_command(code: str, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(args: argparse.Namespace) -> int:
+    """
+    Time CLI startup in fresh interpreters and, with `--reads`, the common table reads. Exits non-zero
+    when startup exceeds `--budget`, so it can run as a check.
+    """
+    startup = _time_command("import lance_preconfs.cli", args.runs)
+    status_code = f"from lance_preconfs.cli import main; main(['status', '--network', '{args.network}', '--json'])"
+    status_time = _time_command(f"import contextlib, io\nwith contextlib.redirect_stdout(io.StringIO()): {status_code}", args.runs)
+    print(f"cli import: {startup * 1000:.0f} ms (best of {args.runs})")
+    print(f"status command: {status_time * 1000:.0f} ms (best of {args.runs})")
+
+    if args.reads:
+        import datetime
+
+        from lance_preconfs.snapshots import load_snapshot
+        from lance_preconfs.tiers import open_tiered
+
+        uri = NETWORKS[args.network].uri
+        commitments = open_tiered(COMMITMENT_TABLE_NAME, uri=uri)
+        timings = {
+            "latest block": lambda: commitments.latest_block(),
+            "commitments, last 24h": lambda: commitments.to_arrow(
+                start=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=24)
+            ),
+            "dashboard snapshot": lambda: load_snapshot(uri),
+        }
+        for label, read in timings.items():
+            start = time.perf_counter()
+            try:
+                read()
+            except FileNotFoundError:
+                print(f"{label}: no data")
+                continue
+            print(f"{label}: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if startup > args.budget:
+        print(f"cli import exceeds the {args.budget:.2f}s budget")
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lance-preconfs", description="mev-commit preconf data in Lance.")
+    commands = parser.add_subparsers(dest="command")
+
+    def network_option(command: argparse.ArgumentParser) -> None:
+        command.add_argument("--network", choices=sorted(NETWORKS), default=DEFAULT_NETWORK,
+                             help=f"Network (default: {DEFAULT_NETWORK})")
+
+    command = commands.add_parser("ingest", help="Run the ingestion service (the default command)")
+    command.add_argument("--network", action="append", choices=sorted(NETWORKS), dest="networks",
+                         help=f"Network to ingest, repeatable (default: {', '.join(ENABLED_NETWORKS)})")
+    command.add_argument("--processes", action="store_true", help="Run each (network, source) pair in its own process")
+    command.set_defaults(func=ingest)
+
+    command = commands.add_parser("backfill", help="Catch up to the chain head once and exit")
+    network_option(command)
+    command.add_argument("--source", action="append", choices=["commitments", "mev_boost"], dest="sources",
+                         help="Source to backfill, repeatable (default: all sources of the network)")
+    command.set_defaults(func=backfill)
+
+    command = commands.add_parser("compact", help="Promote, compact and apply retention to the tables")
+    network_option(command)
+    command.add_argument("--table", action="append", choices=TABLES, dest="tables", help="Table, repeatable (default: all)")
+    command.set_defaults(func=compact)
+
+    command = commands.add_parser("bench", help="Time CLI startup and common reads")
+    network_option(command)
+    command.add_argument("--runs", type=int, default=3, help="Runs per timing (default: 3)")
+    command.add_argument("--budget", type=float, default=IMPORT_BUDGET,
+                         help=f"Startup budget in seconds (default: {IMPORT_BUDGET})")
+    command.add_argument("--reads", action="store_true", help="Also time table reads")
+    command.set_defaults(func=bench)
+
+    command = commands.add_parser("lookup", help="Find a commitment by any of its hashes")
+    network_option(command)
+    command.add_argument("hash", help="txnHash, commitmentHash, bidHash or commitmentDigest")
+    command.set_defaults(func=lookup)
+
+    command = commands.add_parser("status", help="Show table, snapshot and slash-window state")
+    network_option(command)
+    command.add_argument("--json", action="store_true", help="Print JSON")
+    command.set_defaults(func=status)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point for `lance-preconfs`. Without a command it runs the ingestion service, as before.
+    """
+    parser = build_parser()
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["ingest"] + argv
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Optional
+
+import lancedb
+import polars as pl
+from lancedb import DBConnection
+from mev_commit_sdk_py.hypersync_client import Hypersync
+
+from lance_preconfs.config import DEFAULT_NETWORK, NETWORKS, NetworkConfig
+from lance_preconfs.notifications import WriteNotifier
+from lance_preconfs.tiers import TieredTable, open_tiered
+
+logger = logging.getLogger(__name__)
+
+
+class SharedClients:
+    """
+    Hypersync clients, the LanceDB connection and in-flight writes shared by every ingestion task
+    of one network running in one service process. Clients are created on first use and reused
+    afterwards, so two tasks hitting the same endpoint share one connection pool.
+    """
+
+    def __init__(self, network: NetworkConfig = NETWORKS[DEFAULT_NETWORK]) -> None:
+        self.network: NetworkConfig = network
+        self.uri: str = network.uri
+        self._tables: dict[str, TieredTable] = {}
+        self._hypersync: dict[str, Hypersync] = {}
+        self._db: Optional[DBConnection] = None
+        self.notifier: WriteNotifier = WriteNotifier(self.uri)
+        self._pending_writes: set[asyncio.Future] = set()
+
+    def hypersync(self, url: str) -> Hypersync:
+        """
+        Return the shared Hypersync client for `url`, creating it on first use.
+        """
+        client = self._hypersync.get(url)
+        if client is None:
+            client = Hypersync(url=url)
+            self._hypersync[url] = client
+        return client
+
+    @property
+    def mev_commit(self) -> Hypersync:
+        if self.network.mev_commit_hypersync_url is None:
+            raise ValueError(f"Network {self.network.name} has no mev-commit endpoint")
+        return self.hypersync(self.network.mev_commit_hypersync_url)
+
+    @property
+    def l1(self) -> Hypersync:
+        return self.hypersync(self.network.l1_hypersync_url)
+
+    @property
+    def db(self) -> DBConnection:
+        if self._db is None:
+            self._db = lancedb.connect(self.uri)
+        return self._db
+
+    def open_table(self, table: str):
+        """
+        Open a LanceDB table through the shared connection.
+        """
+        return self.db.open_table(table)
+
+    def table(self, name: str) -> TieredTable:
+        """
+        Return the shared hot/cold handle for table `name`.
+        """
+        tiered = self._tables.get(name)
+        if tiered is None:
+            tiered = open_tiered(name, uri=self.uri, db=self.db)
+            self._tables[name] = tiered
+        return tiered
+
+    @property
+    def tables(self) -> list[TieredTable]:
+        """
+        Handles for the tables this process has written to, i.e. the tables it owns.
+        """
+        return list(self._tables.values())
+
+    def notify(self, table: str, data: pl.DataFrame) -> None:
+        """
+        Publish a write event for `data` written to `table`. A failed publish only costs readers a refresh.
+        """
+        try:
+            self.notifier.publish(table, self.table(table).version(), data)
+        except Exception as e:
+            logger.error(f"Error publishing write event for {table}: {e}")
+
+    def _write(self, table: str, data: pl.DataFrame) -> None:
+        self.table(table).write(data)
+        self.notify(table, data)
+
+    async def write(self, table: str, data: pl.DataFrame) -> None:
+        """
+        Write `data` into the tiers of `table` on a worker thread so the event loop keeps serving other tasks.
+        The write is shielded: cancelling the caller does not abandon a half-finished Lance commit,
+        and `flush()` waits for it during shutdown.
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(self._write, table, data))
+        self._pending_writes.add(future)
+        future.add_done_callback(self._pending_writes.discard)
+        await asyncio.shield(future)
+
+    async def flush(self) -> None:
+        """
+        Wait for every pending write to finish.
+        """
+        if not self._pending_writes:
+            return
+        logger.info(f"Flushing {len(self._pending_writes)} pending writes")
+        results = await asyncio.gather(*self._pending_writes, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error flushing write to LanceDB: {result}")
@@ -0,0 +1,382 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import AsyncIterator, Optional, Union
+
+import polars as pl
+
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.config import (
+    COMMITMENT_EVENTS_PENDING_BLOCKS,
+    COMMITMENT_TABLE_NAME,
+    COMMITMENTS_FETCH_TIMEOUT,
+    L1_TX_TABLE_NAME,
+    SLASH_WINDOWS,
+)
+from lance_preconfs.fetch_planner import AdaptiveRangePlanner
+from lance_preconfs.inclusion import backfill_inclusion, build_profiles, rebuild_inclusion, write_inclusion
+from lance_preconfs.lookup import HashIndex
+from lance_preconfs.pipeline import run_pipeline
+from lance_preconfs.windows import SlashRateEngine
+
+logger = logging.getLogger(__name__)
+
+# Range planners per network, kept across cycles so the learned range survives between iterations.
+COMMITMENTS_PLANNERS: dict[str, AdaptiveRangePlanner] = {}
+# Commitment hash indexes per network, kept across cycles to batch index maintenance.
+HASH_INDEXES: dict[str, HashIndex] = {}
+# Sliding-window slash counts per network, fed by every written batch.
+SLASH_ENGINES: dict[str, SlashRateEngine] = {}
+
+# Opened, unopened and processed commitment events of a block range; None where a range has none.
+CommitmentEvents = tuple[Optional[pl.DataFrame], Optional[pl.DataFrame], Optional[pl.DataFrame]]
+
+
+def hash_index_for(clients: SharedClients) -> HashIndex:
+    return HASH_INDEXES.setdefault(clients.network.name, HashIndex(clients.db))
+
+
+def slash_engine_for(clients: SharedClients) -> SlashRateEngine:
+    """
+    The network's slash-rate engine, warmed up from the stored commitments of the longest window on first use.
+    """
+    engine = SLASH_ENGINES.get(clients.network.name)
+    if engine is not None:
+        return engine
+    engine = SlashRateEngine()
+    start = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=max(SLASH_WINDOWS.values()))
+    try:
+        recent = clients.table(COMMITMENT_TABLE_NAME).to_arrow(columns=["timestamp", "commiter", "isSlash"], start=start)
+        engine.warm_up(pl.from_arrow(recent))
+    except FileNotFoundError:
+        pass
+    SLASH_ENGINES[clients.network.name] = engine
+    return engine
+
+
+def build_hash_index(clients: SharedClients) -> int:
+    """
+    Index the hashes of every stored commitment. Used once, when the hash index does not exist yet or
+    was left without its index.
+    """
+    index = hash_index_for(clients)
+    if index.exists():
+        return 0
+    try:
+        commitments_df = pl.from_arrow(clients.table(COMMITMENT_TABLE_NAME).to_arrow())
+    except FileNotFoundError:
+        return 0
+    return index.build(commitments_df)
+
+
+async def fetch_events(clients: SharedClients, event_name: str, from_block: int, to_block: Optional[int]) -> Optional[pl.DataFrame]:
+    """
+    Fetch the `event_name` events of blocks `[from_block, to_block)`, or None if the range has none. The
+    SDK reports an empty range as a "No data returned" ValueError; every other error is raised.
+    """
+    try:
+        return await asyncio.wait_for(
+            clients.mev_commit.execute_event_query(event_name, from_block=from_block, to_block=to_block),
+            COMMITMENTS_FETCH_TIMEOUT
+        )
+    except ValueError as e:
+        if str(e).startswith("No data returned"):
+            return None
+        raise
+
+
+async def fetch_commitment_events(
+    clients: SharedClients, from_block: int, to_block: Optional[int] = None
+) -> CommitmentEvents:
+    """
+    Fetch the opened, unopened and processed commitment events for blocks `[from_block, to_block)` from
+    hypersync. An event type without events in the range is None. Other errors, including timeouts, are
+    raised so the caller can back off and retry the range instead of skipping it.
+    """
+    commit_stores = await fetch_events(clients, 'OpenedCommitmentStored', from_block, to_block)
+    encrypted_stores = await fetch_events(clients, 'UnopenedCommitmentStored', from_block, to_block)
+    commits_processed = await fetch_events(clients, 'CommitmentProcessed', from_block, to_block)
+    return commit_stores, encrypted_stores, commits_processed
+
+
+def join_commitment_events(commit_stores: pl.DataFrame, encrypted_stores: pl.DataFrame, commits_processed: pl.DataFrame) -> pl.DataFrame:
+    """
+    Join the commitment events of a block range into commitments_df rows.
+    """
+    return (
+        encrypted_stores
+        .join(commit_stores, on='commitmentIndex', how='inner')
+        .with_columns(('0x' + pl.col("txnHash")).alias('txnHash'))
+        .join(commits_processed.select('commitmentIndex', 'isSlash'), on='commitmentIndex', how='inner')
+    ).select(
+        'block_number', 'timestamp', 'blockNumber', 'txnHash', 'bid', 'commiter', 'bidder',
+        'isSlash', 'decayStartTimeStamp', 'decayEndTimeStamp', 'dispatchTimestamp',
+        'commitmentHash', 'commitmentIndex', 'commitmentDigest', 'commitmentSignature',
+        'revertingTxHashes', 'bidHash', 'bidSignature', 'sharedSecretKey'
+    )
+
+
+class CommitmentEventMatcher:
+    """
+    Joins the commitment events of consecutive block ranges. The events of one commitment can fall in
+    different ranges, so events still missing a counterpart are kept and joined again with the events of
+    the following ranges, and of the following cycles. Events more than `max_pending_blocks` behind the
+    newest event are dropped.
+    """
+
+    def __init__(self, max_pending_blocks: int = COMMITMENT_EVENTS_PENDING_BLOCKS) -> None:
+        self.max_pending_blocks: int = max_pending_blocks
+        self.pending: CommitmentEvents = (None, None, None)
+
+    def match(self, events: CommitmentEvents) -> Optional[pl.DataFrame]:
+        """
+        Join `events` with the pending events. Returns the commitments that are complete now, or None.
+        """
+        merged = tuple(
+            new if old is None else old if new is None
+            # a range fetched again after an aborted cycle brings the same events twice
+            else pl.concat([old, new], how="diagonal_relaxed").unique(subset="commitmentIndex", keep="last", maintain_order=True)
+            for old, new in zip(self.pending, events)
+        )
+        commitments_df = join_commitment_events(*merged) if all(frame is not None for frame in merged) else None
+        matched = commitments_df["commitmentIndex"] if commitments_df is not None else pl.Series("commitmentIndex", [])
+
+        newest = [frame["block_number"].max() for frame in merged if frame is not None and not frame.is_empty()]
+        horizon = max(newest) - self.max_pending_blocks if newest else 0
+        self.pending = tuple(
+            None if frame is None
+            else frame.filter(~pl.col("commitmentIndex").is_in(matched) & (pl.col("block_number") > horizon))
+            for frame in merged
+        )
+        if commitments_df is None or commitments_df.is_empty():
+            return None
+        return commitments_df
+
+
+# Commitment events waiting for their other events per network, kept across cycles.
+EVENT_MATCHERS: dict[str, CommitmentEventMatcher] = {}
+
+
+async def fetch_opened_commits(clients: SharedClients, from_block: int, to_block: Optional[int] = None) -> Optional[pl.DataFrame]:
+    """
+    Fetch data from hypersync client for blocks `[from_block, to_block)`. Returns commitments_df dataframe
+    or None if no data is fetched. Timeouts are raised as `asyncio.TimeoutError` so the caller can shrink the range.
+    """
+    try:
+        events = await fetch_commitment_events(clients, from_block, to_block)
+        if any(frame is None for frame in events):
+            return None
+        return join_commitment_events(*events)
+    except asyncio.TimeoutError:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error while fetching opened commits: {e}")
+        return None
+
+
+async def fetch_l1_txs(clients: SharedClients, l1_tx_list: Union[str, list[str]]) -> Optional[pl.DataFrame]:
+    """
+    Fetch l1 tx data from hypersync client. Returns l1_txs_df dataframe or None if no data is fetched.
+    """
+    try:
+        if not l1_tx_list:  # Check if list is empty
+            logger.info("No L1 transaction hashes to query.")
+            return None
+
+        l1_txs = await asyncio.wait_for(
+            clients.l1.search_txs(txs=l1_tx_list),
+            COMMITMENTS_FETCH_TIMEOUT
+        )
+
+        if l1_txs is None or l1_txs.is_empty():
+            logger.info("No L1 transactions found.")
+            return None
+
+        return l1_txs
+
+    except asyncio.TimeoutError as e:
+        logger.error(f"Timeout while fetching L1 transactions: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error while fetching L1 transactions: {e}")
+        return None
+
+
+def get_latest_block(clients: SharedClients, commitment_table_name: str) -> Optional[int]:
+    """
+    Get the latest mev-commit block number across the hot and cold commitments tables.
+    """
+    try:
+        return clients.table(commitment_table_name).latest_block()
+    except Exception as e:
+        logger.error(f"Error getting latest block number: {e}")
+        return None
+
+
+async def write_data(clients: SharedClients, data: pl.DataFrame, table_name: str) -> None:
+    """
+    Write data to the LanceDB table. Errors are logged and raised, so the cycle stops before a later batch
+    moves the watermark past the failed one.
+    """
+    try:
+        await clients.write(table_name, data)
+    except Exception as e:
+        logger.error(f"Error writing data to LanceDB: {e}")
+        raise
+
+
+async def lookup_batch_l1_txs(clients: SharedClients, commitments_df: pl.DataFrame) -> Optional[pl.DataFrame]:
+    """
+    Fetch the L1 transactions of a commitments batch.
+    """
+    l1_txs_list = commitments_df.select("txnHash").unique()["txnHash"].to_list()
+    if not l1_txs_list:  # Check if there are any transaction hashes to query
+        return None
+    logger.info(f"Fetching L1 transactions for {len(l1_txs_list)} hashes.")
+    return await fetch_l1_txs(clients, l1_tx_list=l1_txs_list)
+
+
+async def write_commitments_batch(clients: SharedClients, commitments_df: pl.DataFrame, l1_txs_df: Optional[pl.DataFrame]) -> None:
+    """
+    Write a commitments batch and its L1 transactions to LanceDB, and update the hash index, slash-rate
+    windows and commitments_l1 with it. A failed table write is raised and stops the pipeline.
+    """
+    await write_data(clients, commitments_df, COMMITMENT_TABLE_NAME)
+    logger.info(f"New commitments written: {commitments_df.shape[0]}")
+
+    try:
+        await asyncio.to_thread(hash_index_for(clients).add, commitments_df)
+    except Exception as e:
+        logger.error(f"Error indexing commitment hashes: {e}")
+
+    try:
+        engine = slash_engine_for(clients)
+        engine.ingest(commitments_df)
+        await asyncio.to_thread(engine.publish, clients.uri, clients.db)
+    except Exception as e:
+        logger.error(f"Error updating slash-rate windows: {e}")
+
+    if l1_txs_df is not None and not l1_txs_df.is_empty():
+        await write_data(clients, l1_txs_df, L1_TX_TABLE_NAME)
+        logger.info(f"New L1 transactions written: {l1_txs_df.shape[0]}")
+
+    try:
+        await write_inclusion(clients, commitments_df, l1_txs_df)
+    except Exception as e:
+        logger.error(f"Error writing commitments_l1: {e}")
+
+
+async def fetch_ranges(
+    clients: SharedClients, planner: AdaptiveRangePlanner, from_block: int, height: int
+) -> AsyncIterator[CommitmentEvents]:
+    """
+    Yield the commitment events of blocks `[from_block, height]` in sub-ranges sized by `planner`. A timeout
+    or error shrinks the range and retries after a backoff; after repeated failures the rest, starting with
+    the failed range, is left for the next cycle.
+    """
+    while from_block <= height:
+        start, end = planner.next_range(from_block, height + 1)
+        try:
+            events = await fetch_commitment_events(clients, from_block=start, to_block=end)
+        except Exception as e:
+            reason = "Timeout" if isinstance(e, asyncio.TimeoutError) else f"Error ({e})"
+            delay = planner.record_timeout()
+            if delay is None:
+                logger.error(f"Giving up on blocks {start} to {end} after repeated failures; retrying next cycle.")
+                return
+            logger.warning(f"{reason} fetching blocks {start} to {end}; retrying with span {planner.span} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        planner.record_success()
+        if any(frame is not None for frame in events):
+            yield events
+        from_block = end
+
+
+async def run_commitments_cycle(clients: SharedClients, planner: Optional[AdaptiveRangePlanner] = None) -> None:
+    """
+    Get new commitments and their L1 transactions and write them to LanceDB. The range up to the chain
+    head is fetched in sub-ranges sized by `planner` and flows through a pipeline of fetch -> join ->
+    L1 lookup -> write stages connected by bounded queues, so fetching the next sub-range overlaps with
+    writing the previous one and a slow writer throttles fetching.
+    """
+    if planner is None:
+        planner = COMMITMENTS_PLANNERS.setdefault(clients.network.name, AdaptiveRangePlanner())
+    try:
+        indexed = await asyncio.to_thread(build_hash_index, clients)
+        if indexed:
+            logger.info(f"Indexed {indexed} hashes of stored commitments")
+    except Exception as e:
+        logger.error(f"Error building the commitment hash index: {e}")
+
+    try:
+        # before any batch is written, so commitments_l1 starts from the full history
+        rebuilt = await asyncio.to_thread(rebuild_inclusion, clients)
+        if rebuilt:
+            logger.info(f"Built commitments_l1 with {rebuilt} rows")
+    except Exception as e:
+        logger.error(f"Error building commitments_l1: {e}")
+
+    try:
+        profiled = await asyncio.to_thread(build_profiles, clients)
+        if profiled:
+            logger.info(f"Built {profiled} participant profiles from commitments_l1")
+    except Exception as e:
+        logger.error(f"Error building participant profiles: {e}")
+
+    try:
+        # warm up before this cycle's batches are written so they are not counted twice
+        await asyncio.to_thread(slash_engine_for, clients)
+    except Exception as e:
+        logger.error(f"Error warming up slash-rate windows: {e}")
+
+    latest_block: Optional[int] = get_latest_block(clients, commitment_table_name=COMMITMENT_TABLE_NAME)
+    logger.info(f'Latest block: {latest_block}')
+
+    from_block: int = (latest_block + 1) if latest_block is not None else 0
+    try:
+        height: int = await asyncio.wait_for(clients.mev_commit.get_height(), COMMITMENTS_FETCH_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Error getting mev-commit chain height: {e}")
+        return
+
+    logger.info(f"Fetching data from block {from_block} to {height} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    written: int = 0
+
+    matcher = EVENT_MATCHERS.setdefault(clients.network.name, CommitmentEventMatcher())
+
+    async def join(events: CommitmentEvents) -> Optional[pl.DataFrame]:
+        # a failed join stops the cycle, so later ranges do not move the watermark past its commitments
+        return await asyncio.to_thread(matcher.match, events)
+
+    async def lookup(commitments_df: pl.DataFrame) -> tuple[pl.DataFrame, Optional[pl.DataFrame]]:
+        return commitments_df, await lookup_batch_l1_txs(clients, commitments_df)
+
+    async def write(batch: tuple[pl.DataFrame, Optional[pl.DataFrame]]) -> None:
+        nonlocal written
+        commitments_df, l1_txs_df = batch
+        await write_commitments_batch(clients, commitments_df, l1_txs_df)
+        written += commitments_df.shape[0]
+
+    pending = matcher.pending
+    try:
+        await run_pipeline(fetch_ranges(clients, planner, from_block, height), [join, lookup, write])
+    except Exception:
+        # the next cycle fetches again from the watermark; events matched but not written must be matched again
+        matcher.pending = pending
+        raise
+
+    if written == 0:
+        logger.info("No new commitments data to write.")
+        try:
+            # republish so windows expire through quiet periods
+            await asyncio.to_thread(slash_engine_for(clients).publish, clients.uri, clients.db)
+        except Exception as e:
+            logger.error(f"Error updating slash-rate windows: {e}")
+
+    try:
+        await backfill_inclusion(clients)
+    except Exception as e:
+        logger.error(f"Error backfilling commitments_l1: {e}")
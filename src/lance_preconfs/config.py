@@ -0,0 +1,159 @@
+# Constants shared by the ingestion service, the query layer and the dashboard.
+from dataclasses import dataclass
+from typing import Optional
+
+URI: str = "data"  # locally saved to "data folder"
+INDEX: str = "block_number"
+
+COMMITMENT_TABLE_NAME: str = "commitments"
+L1_TX_TABLE_NAME: str = "l1_txs"
+MEV_BOOST_TABLE_NAME: str = "mev_boost_blocks"
+COMMITMENTS_L1_TABLE_NAME: str = "commitments_l1"  # commitments joined with their L1 transactions
+
+MEV_COMMIT_HYPERSYNC_URL: str = 'https://mev-commit.hypersync.xyz'
+HOLESKY_HYPERSYNC_URL: str = 'https://holesky.hypersync.xyz'
+MAINNET_HYPERSYNC_URL: str = 'https://eth.hypersync.xyz'
+
+
+@dataclass(frozen=True)
+class NetworkConfig:
+    """
+    Endpoints and table namespace of one network. A source is ingested only if its endpoint is set:
+    commitments need `mev_commit_hypersync_url`, mev-boost blocks need `mev_boost_network`.
+    """
+    name: str
+    uri: str
+    l1_hypersync_url: str
+    mev_commit_hypersync_url: Optional[str] = None
+    mev_boost_network: Optional[str] = None  # mev_boost_py Network value
+
+    @property
+    def sources(self) -> list[str]:
+        sources = []
+        if self.mev_commit_hypersync_url is not None:
+            sources.append("commitments")
+        if self.mev_boost_network is not None:
+            sources.append("mev_boost")
+        return sources
+
+
+NETWORKS: dict[str, NetworkConfig] = {
+    # holesky keeps the original "data" namespace so existing tables are picked up as they are
+    "holesky": NetworkConfig(
+        name="holesky",
+        uri=URI,
+        l1_hypersync_url=HOLESKY_HYPERSYNC_URL,
+        mev_commit_hypersync_url=MEV_COMMIT_HYPERSYNC_URL,
+        mev_boost_network="holesky",
+    ),
+    "mainnet": NetworkConfig(
+        name="mainnet",
+        uri=f"{URI}/mainnet",
+        l1_hypersync_url=MAINNET_HYPERSYNC_URL,
+        mev_boost_network="mainnet",
+    ),
+}
+DEFAULT_NETWORK: str = "holesky"
+ENABLED_NETWORKS: list[str] = [DEFAULT_NETWORK]
+
+COMMITMENTS_INTERVAL: int = 25  # Time to wait between commitments cycles (in seconds)
+COMMITMENTS_FETCH_TIMEOUT: int = 30  # Timeout for fetching commitments data in seconds
+MEV_BOOST_INTERVAL: int = 60  # Time to wait between mev-boost cycles (in seconds)
+MEV_BOOST_FETCH_TIMEOUT: int = 60  # Timeout for fetching mev-boost data in seconds
+
+LOG_FORMAT: str = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Finality-aware storage. Rows within CONFIRMATION_DEPTHS blocks of the newest block may still change and
+# live in a small mutable "<table>_hot" table; older rows are promoted to the append-only "<table>" table.
+HOT_TABLE_SUFFIX: str = "_hot"
+CONFIRMATION_DEPTHS: dict[str, int] = {
+    COMMITMENT_TABLE_NAME: 500,  # mev-commit chain blocks
+    L1_TX_TABLE_NAME: 64,  # holesky blocks, two epochs
+    MEV_BOOST_TABLE_NAME: 64,  # holesky blocks, two epochs
+    COMMITMENTS_L1_TABLE_NAME: 500,  # mev-commit chain blocks
+}
+# Block column of tables not keyed by INDEX, and unique row keys of tables whose hot rows are updated in place.
+TABLE_INDEXES: dict[str, str] = {COMMITMENTS_L1_TABLE_NAME: "mev_commit_block_number"}
+TABLE_KEYS: dict[str, str] = {COMMITMENTS_L1_TABLE_NAME: "commitmentIndex"}
+# Rows with a null in the pending column stay hot past finality, for up to PENDING_MAX_BLOCKS more blocks,
+# so late data can still be filled in. commitments_l1 rows are pending until their L1 tx is found.
+PENDING_COLUMNS: dict[str, str] = {COMMITMENTS_L1_TABLE_NAME: "block_number"}
+PENDING_MAX_BLOCKS: int = 50_000
+KEY_FILTER_CHUNK: int = 1_000  # Keys per IN filter when looking rows up by hash or commitment index
+PROMOTION_INTERVAL: int = 300  # Time to wait between hot -> cold promotions (in seconds)
+COLD_CLEANUP_SECONDS: int = 3600  # Age of old cold table versions removed during compaction
+
+# Cold storage is split into per-N-block partitions listed in a manifest next to the tables.
+PARTITION_BLOCKS: dict[str, int] = {
+    COMMITMENT_TABLE_NAME: 400_000,  # about a day of mev-commit blocks
+    L1_TX_TABLE_NAME: 7_200,  # a day of holesky blocks
+    MEV_BOOST_TABLE_NAME: 7_200,  # a day of holesky blocks
+    COMMITMENTS_L1_TABLE_NAME: 400_000,  # about a day of mev-commit blocks
+}
+# (column, epoch unit) used to answer time-window reads; tables without one are read by block range only.
+TIMESTAMP_COLUMNS: dict[str, tuple[str, str]] = {
+    COMMITMENT_TABLE_NAME: ("timestamp", "ms"),
+    MEV_BOOST_TABLE_NAME: ("timestamp", "s"),
+}
+# Retention: the newest RETENTION_LIVE_PARTITIONS partitions stay live, older ones are moved into a
+# compacted "<table>__archive" table or, for "rollup", replaced by aggregates in "<table>__rollup".
+RETENTION_LIVE_PARTITIONS: dict[str, int] = {
+    COMMITMENT_TABLE_NAME: 30,
+    L1_TX_TABLE_NAME: 30,
+    MEV_BOOST_TABLE_NAME: 30,
+    COMMITMENTS_L1_TABLE_NAME: 30,
+}
+RETENTION_ACTIONS: dict[str, str] = {
+    COMMITMENT_TABLE_NAME: "archive",
+    L1_TX_TABLE_NAME: "archive",
+    MEV_BOOST_TABLE_NAME: "archive",
+    COMMITMENTS_L1_TABLE_NAME: "archive",
+}
+
+# Local HTTP read API
+API_HOST: str = "127.0.0.1"
+API_PORT: int = 8765
+API_CACHE_SIZE: int = 256  # Number of encoded responses kept in the version-keyed cache
+API_WARM_INTERVAL: int = 25  # Time between checks for new data to precompute (in seconds)
+
+# Dashboard rendering budgets
+CHART_MAX_POINTS: int = 500  # Points per scatter series after downsampling
+CHART_TOP_K: int = 10  # Categories shown before the rest are folded into "other"
+TABLE_PAGE_SIZES: list[int] = [25, 50, 100, 250]
+
+# Participant behaviour profiles for similarity search
+PROFILES_TABLE_NAME: str = "participant_profiles"
+PROFILE_INDEX_MIN_ROWS: int = 256  # IVF-PQ training needs at least this many profiles; smaller tables are scanned
+
+# Exact-match lookup of commitments by any of their hashes
+HASH_INDEX_TABLE_NAME: str = "commitment_hashes"
+HASH_COLUMNS: tuple[str, ...] = ("txnHash", "commitmentHash", "bidHash", "commitmentDigest")
+HASH_INDEX_OPTIMIZE_ROWS: int = 10_000  # Unindexed rows tolerated before the hash index is optimized
+
+# Streaming slash-rate windows
+SLASH_WINDOWS: dict[str, int] = {"1h": 3600, "24h": 86400, "7d": 604800}  # window name -> length in seconds
+SLASH_WINDOW_BUCKET_SECONDS: int = 60
+SLASH_WINDOWS_FILE: str = "slash_rate_windows.json"  # current window values, under the network uri
+SLASH_HISTORY_TABLE_NAME: str = "slash_rate_history"  # hourly snapshots of the window values
+
+# Dashboard snapshots
+SNAPSHOT_DIR: str = "snapshots"  # under the network uri
+SNAPSHOT_INTERVAL: int = 120  # Seconds between snapshots written by the service
+SNAPSHOT_MAX_AGE: int = 600  # Older snapshots are stale and the dashboard computes its frames live
+SNAPSHOT_KEEP: int = 2  # Snapshot versions kept on disk, so readers of the previous one are not cut off
+
+# Ingestion pipeline
+PIPELINE_QUEUE_SIZE: int = 2  # Batches buffered between pipeline stages before the upstream stage waits
+# Commitment events waiting for their other events are carried into later ranges for up to this many blocks
+COMMITMENT_EVENTS_PENDING_BLOCKS: int = 50_000
+
+# Write notifications
+NOTIFICATIONS_FILE: str = "notifications.sqlite"  # under the network uri
+NOTIFICATIONS_RETENTION: int = 86400  # Seconds write events are kept
+DASHBOARD_REFRESH_INTERVAL: str = "25s"  # How often the dashboard polls for write events
+
+# Writer coordination
+LOCK_DIR: str = ".locks"  # advisory lock files, under the network uri
+WRITE_LOCK_TIMEOUT: float = 120.0  # Seconds a writer waits for another process to release a table
+WRITE_CONFLICT_RETRIES: int = 5  # Retries of a write that hit a Lance commit conflict
+WRITE_CONFLICT_BACKOFF: float = 0.5  # Base of the exponential backoff between conflict retries (in seconds)
@@ -0,0 +1,107 @@
+import fcntl
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from lance_preconfs.config import (
+    LOCK_DIR,
+    WRITE_CONFLICT_BACKOFF,
+    WRITE_CONFLICT_RETRIES,
+    WRITE_LOCK_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# One thread lock and one per-thread holding state per lock file, so every handle on a table in this
+# process shares them and a thread re-entering through another handle does not wait on its own flock.
+_THREAD_LOCKS: dict[str, tuple[threading.RLock, threading.local]] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+class TableLock:
+    """
+    Advisory write lock on one table, held across threads of this process and across processes writing
+    to the same uri. Threads share a re-entrant lock; processes take an exclusive `flock` on
+    `<uri>/.locks/<table>.lock`, which the OS releases if the holder dies. Waiting longer than `timeout`
+    raises TimeoutError.
+    """
+
+    def __init__(self, uri: str, name: str, timeout: float = WRITE_LOCK_TIMEOUT) -> None:
+        self.path: str = os.path.join(uri, LOCK_DIR, f"{name}.lock")
+        self.timeout: float = timeout
+        with _THREAD_LOCKS_GUARD:
+            self._thread_lock, self._local = _THREAD_LOCKS.setdefault(self.path, (threading.RLock(), threading.local()))
+
+    def __enter__(self) -> "TableLock":
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Timed out waiting for the write lock {self.path}")
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            try:
+                self._local.file = self._lock_file(deadline)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._local.depth = depth + 1
+        return self
+
+    def _lock_file(self, deadline: float):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock_file = open(self.path, "a")
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(f"Timed out waiting for the write lock {self.path}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc) -> None:
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            fcntl.flock(self._local.file, fcntl.LOCK_UN)
+            self._local.file.close()
+            self._local.file = None
+        self._thread_lock.release()
+
+
+def is_commit_conflict(error: Exception) -> bool:
+    """
+    Whether `error` is a Lance commit conflict, i.e. another writer committed first.
+    """
+    return "conflict" in str(error).lower()
+
+
+def retry_on_conflict(
+    operation: Callable[[], T],
+    description: str,
+    retries: int = WRITE_CONFLICT_RETRIES,
+    backoff: float = WRITE_CONFLICT_BACKOFF,
+    rebase: Optional[Callable[[], None]] = None,
+) -> T:
+    """
+    Run `operation`, and if it fails with a commit conflict call `rebase` to pick up the latest committed
+    state and run it again, up to `retries` times with jittered exponential backoff. `operation` must be
+    safe to repeat, e.g. a merge-insert or a deduplicating append.
+    """
+    attempt = 0
+    while True:
+        try:
+            return operation()
+        except Exception as e:
+            if not is_commit_conflict(e) or attempt >= retries:
+                raise
+            delay = random.uniform(0, backoff * 2 ** attempt)
+            logger.warning(f"Commit conflict in {description} (attempt {attempt + 1}); retrying in {delay:.2f}s: {e}")
+            time.sleep(delay)
+        attempt += 1
+        if rebase is not None:
+            rebase()
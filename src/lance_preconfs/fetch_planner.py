@@ -0,0 +1,63 @@
+import random
+from typing import Optional
+
+
+class AdaptiveRangePlanner:
+    """
+    Chooses block ranges for incremental fetches. The range is halved after a timeout and grown
+    again after `grow_after` consecutive successes, so it settles at the largest range the backend
+    can serve. Retries after a timeout or error wait a jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        initial_span: int = 100_000,
+        min_span: int = 100,
+        max_span: int = 2_000_000,
+        growth: float = 2.0,
+        grow_after: int = 2,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_retries: int = 6,
+    ) -> None:
+        self.span: int = initial_span
+        self.min_span: int = min_span
+        self.max_span: int = max_span
+        self.growth: float = growth
+        self.grow_after: int = grow_after
+        self.base_backoff: float = base_backoff
+        self.max_backoff: float = max_backoff
+        self.max_retries: int = max_retries
+        self.consecutive_successes: int = 0
+        self.consecutive_timeouts: int = 0
+
+    def next_range(self, from_block: int, to_block: int) -> tuple[int, int]:
+        """
+        Return the next `[start, end)` sub-range of `[from_block, to_block)` to fetch.
+        """
+        return from_block, min(from_block + self.span, to_block)
+
+    def record_success(self) -> None:
+        """
+        Record a successful fetch and grow the range once enough fetches in a row succeeded.
+        """
+        self.consecutive_timeouts = 0
+        self.consecutive_successes += 1
+        if self.consecutive_successes >= self.grow_after:
+            self.span = min(self.max_span, int(self.span * self.growth))
+            self.consecutive_successes = 0
+
+    def record_timeout(self) -> Optional[float]:
+        """
+        Record a timed-out or failed fetch and halve the range. Returns the backoff delay in seconds before
+        the retry, or None once `max_retries` consecutive timeouts have happened.
+        """
+        self.consecutive_successes = 0
+        self.consecutive_timeouts += 1
+        self.span = max(self.min_span, self.span // 2)
+        if self.consecutive_timeouts > self.max_retries:
+            self.consecutive_timeouts = 0
+            return None
+        # full jitter: uniform between zero and the capped exponential delay
+        cap = min(self.max_backoff, self.base_backoff * 2 ** (self.consecutive_timeouts - 1))
+        return random.uniform(0, cap)
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from typing import Optional
+
+import polars as pl
+
+from lance_preconfs import analytics
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.config import (
+    COMMITMENT_TABLE_NAME,
+    COMMITMENTS_L1_TABLE_NAME,
+    KEY_FILTER_CHUNK,
+    L1_TX_TABLE_NAME,
+)
+from lance_preconfs.profiles import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+
+def l1_schema_frame(clients: SharedClients) -> Optional[pl.DataFrame]:
+    """
+    Empty frame with the schema of the L1 transactions table, or None if it has no data yet.
+    """
+    try:
+        return pl.from_arrow(clients.table(L1_TX_TABLE_NAME).to_arrow(filter="false"))
+    except FileNotFoundError:
+        return None
+
+
+def build_inclusion(commitments_df: pl.DataFrame, l1_txs_df: Optional[pl.DataFrame], l1_schema: pl.DataFrame) -> pl.DataFrame:
+    """
+    Prepared commitments joined with their L1 transactions, i.e. the dashboard's `commits_l1_df`.
+    Commitments whose L1 tx is not known yet get nulls in the L1 columns and are backfilled later.
+    """
+    if l1_txs_df is None or l1_txs_df.is_empty():
+        l1_txs_df = l1_schema
+    return analytics.join_l1(analytics.prepare_commitments(commitments_df), l1_txs_df)
+
+
+async def refresh_profiles(clients: SharedClients, inclusion_df: pl.DataFrame) -> None:
+    """
+    Update the behaviour profiles of the participants in `inclusion_df`.
+    """
+    try:
+        updated = await asyncio.to_thread(ProfileStore(clients.db).update, inclusion_df)
+        logger.info(f"Participant profiles updated: {updated}")
+    except Exception as e:
+        logger.error(f"Error updating participant profiles: {e}")
+
+
+async def write_inclusion(clients: SharedClients, commitments_df: pl.DataFrame, l1_txs_df: Optional[pl.DataFrame]) -> None:
+    """
+    Add a new commitments batch to the commitments_l1 table. Until the table has been built from the
+    stored history by `rebuild_inclusion`, batches are left for that build.
+    """
+    if await asyncio.to_thread(clients.table(COMMITMENTS_L1_TABLE_NAME).latest_block) is None:
+        return
+    l1_schema = l1_txs_df if l1_txs_df is not None else await asyncio.to_thread(l1_schema_frame, clients)
+    if l1_schema is None:
+        logger.info("No L1 transactions table yet; commitments_l1 will be built once it exists.")
+        return
+    inclusion_df = build_inclusion(commitments_df, l1_txs_df, l1_schema.clear())
+    await clients.write(COMMITMENTS_L1_TABLE_NAME, inclusion_df)
+    logger.info(f"New commitments_l1 rows written: {inclusion_df.shape[0]}")
+    await refresh_profiles(clients, inclusion_df)
+
+
+def rebuild_inclusion(clients: SharedClients) -> int:
+    """
+    Build the commitments_l1 table from the full commitments and L1 transactions tables. Runs at the start
+    of a cycle, before any batch is written, and does nothing once the table exists.
+    """
+    if clients.table(COMMITMENTS_L1_TABLE_NAME).latest_block() is not None:
+        return 0
+    try:
+        commitments_df = pl.from_arrow(clients.table(COMMITMENT_TABLE_NAME).to_arrow())
+        l1_txs_df = pl.from_arrow(clients.table(L1_TX_TABLE_NAME).to_arrow())
+    except FileNotFoundError:
+        return 0
+    inclusion_df = build_inclusion(commitments_df, l1_txs_df, l1_txs_df.clear())
+    clients.table(COMMITMENTS_L1_TABLE_NAME).write(inclusion_df)
+    clients.notify(COMMITMENTS_L1_TABLE_NAME, inclusion_df)
+    ProfileStore(clients.db).rebuild(inclusion_df)
+    return inclusion_df.shape[0]
+
+
+def build_profiles(clients: SharedClients) -> int:
+    """
+    Build the participant profiles from the full commitments_l1 table. Runs at the start of a cycle, before
+    any batch is counted, and does nothing once the profiles exist.
+    """
+    profiles = ProfileStore(clients.db)
+    if profiles.exists():
+        return 0
+    try:
+        history = pl.from_arrow(clients.table(COMMITMENTS_L1_TABLE_NAME).to_arrow())
+    except FileNotFoundError:
+        return 0
+    return profiles.rebuild(history)
+
+
+async def lookup_l1_txs(clients: SharedClients, hashes: list[str]) -> Optional[pl.DataFrame]:
+    """
+    Find L1 transactions by hash, first in the L1 transactions table and then on Hypersync for the
+    rest. Transactions found on Hypersync are written to the L1 transactions table.
+    """
+    from lance_preconfs.commitments import fetch_l1_txs, write_data
+
+    stored_chunks = []
+    try:
+        for start in range(0, len(hashes), KEY_FILTER_CHUNK):
+            quoted = ", ".join(f"'{h}'" for h in hashes[start:start + KEY_FILTER_CHUNK])
+            stored_chunks.append(pl.from_arrow(await asyncio.to_thread(
+                clients.table(L1_TX_TABLE_NAME).to_arrow, filter=f"hash IN ({quoted})"
+            )))
+    except FileNotFoundError:
+        pass
+    stored = pl.concat(stored_chunks, how="diagonal_relaxed") if stored_chunks else None
+
+    known = set() if stored is None else set(stored["hash"].to_list())
+    missing = [h for h in hashes if h not in known]
+    fetched = await fetch_l1_txs(clients, l1_tx_list=missing) if missing else None
+    if fetched is not None and not fetched.is_empty():
+        await write_data(clients, fetched, L1_TX_TABLE_NAME)
+
+    found = [df for df in (stored, fetched) if df is not None and not df.is_empty()]
+    return pl.concat(found, how="diagonal_relaxed") if found else None
+
+
+async def backfill_inclusion(clients: SharedClients) -> None:
+    """
+    Fill in the L1 columns of hot commitments_l1 rows whose L1 transaction arrived late.
+    """
+    table = clients.table(COMMITMENTS_L1_TABLE_NAME)
+    if await asyncio.to_thread(table.latest_block) is None:
+        return
+
+    pending = await asyncio.to_thread(table.hot_rows, f"{table.pending_column} IS NULL")
+    if pending is None or pending.is_empty():
+        return
+
+    hashes = pending["l1_txnHash"].drop_nulls().unique().to_list()
+    l1_txs_df = await lookup_l1_txs(clients, hashes) if hashes else None
+    if l1_txs_df is None:
+        return
+
+    resolved = (
+        analytics.join_l1(pending.select(analytics.COMMIT_DF_COLUMNS), l1_txs_df)
+        .filter(pl.col(table.pending_column).is_not_null())
+    )
+    if not resolved.is_empty():
+        await asyncio.to_thread(table.update_hot, resolved)
+        await asyncio.to_thread(clients.notify, COMMITMENTS_L1_TABLE_NAME, resolved)
+        logger.info(f"Backfilled L1 inclusion of {resolved.shape[0]} commitments")
+        await refresh_profiles(clients, resolved)
@@ -0,0 +1,180 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import polars as pl
+import pyarrow as pa
+
+from lance_preconfs.config import URI
+from lance_preconfs.notifications import WriteNotifier
+from lance_preconfs.tiers import TieredTable, open_tiered
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Derivation:
+    """
+    A frame computed row-wise by `transform` from table `table`, with its block column `index`.
+    """
+    table: str
+    transform: Callable[[pl.DataFrame], pl.DataFrame]
+    index: str
+    frame: pl.DataFrame
+
+
+def splice(frame: pl.DataFrame, new_rows: pl.DataFrame, index: str, from_block: int) -> pl.DataFrame:
+    """
+    Replace the rows of `frame` from block `from_block` on with `new_rows`. A frame sorted on `index` stays
+    sorted in the same direction, keeping the order of rows within a block; otherwise new rows go first.
+    """
+    spliced = pl.concat([new_rows, frame.filter(pl.col(index) < from_block)], how="diagonal_relaxed")
+    blocks = frame[index]
+    if frame.height > 1 and blocks[0] != blocks[-1]:
+        descending = blocks[0] > blocks[-1]
+        if blocks.is_sorted(descending=descending):
+            return spliced.sort(index, descending=descending, maintain_order=True)
+    return spliced
+
+
+class TableLoader:
+    """
+    Loads tiered tables as Arrow on a thread pool for the dashboard. Arrow decoding releases the GIL,
+    so tables loaded together decode in parallel. `prefetch` starts loads in the background and
+    `frame`/`arrow` wait only for the table asked for, starting its load on first access if needed,
+    so a section renders as soon as its own tables are in.
+
+    Frames derived from a table with `derive` are kept, and `refresh` applies the write events published
+    by the ingesters since the last refresh: only the rows from each event's first block on are read and
+    transformed, and they replace the same block range of the kept frames.
+    """
+
+    def __init__(self, uri: str = URI, prefetch: tuple[str, ...] = (), max_workers: int = 4) -> None:
+        self.uri: str = uri
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="table-loader")
+        self._loads: dict[str, Future] = {}
+        self._handles: dict[str, TieredTable] = {}
+        self._lock = threading.Lock()
+        self._derived: dict[str, Derivation] = {}
+        self.notifier: WriteNotifier = WriteNotifier(uri)
+        self.cursor: int = self.notifier.latest_id()  # last write event applied
+        self.prefetch(*prefetch)
+
+    def table(self, name: str) -> TieredTable:
+        """
+        Return the hot/cold handle for table `name`.
+        """
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is None:
+                handle = open_tiered(name, uri=self.uri)
+                self._handles[name] = handle
+            return handle
+
+    def _load(self, name: str) -> pa.Table:
+        table = self.table(name).to_arrow()
+        logger.info(f"Loaded {name}: {table.num_rows} rows")
+        return table
+
+    def prefetch(self, *names: str) -> None:
+        """
+        Start loading `names` in the background, if not already loading.
+        """
+        with self._lock:
+            for name in names:
+                if name not in self._loads:
+                    self._loads[name] = self._executor.submit(self._load, name)
+
+    def arrow(self, name: str, timeout: Optional[float] = None) -> pa.Table:
+        """
+        Table `name` as Arrow, waiting for its load and starting it on first access.
+        """
+        self.prefetch(name)
+        return self._loads[name].result(timeout)
+
+    def frame(self, name: str, timeout: Optional[float] = None) -> pl.DataFrame:
+        """
+        Table `name` as a Polars DataFrame.
+        """
+        return pl.from_arrow(self.arrow(name, timeout))
+
+    def derive(
+        self,
+        name: str,
+        table: str,
+        transform: Callable[[pl.DataFrame], pl.DataFrame],
+        index: str,
+        initial: Optional[pl.DataFrame] = None,
+    ) -> pl.DataFrame:
+        """
+        Frame `name`, computed by `transform` from table `table` (or taken from `initial`, e.g. a snapshot)
+        on first access and kept up to date by `refresh` afterwards. `index` is its block column.
+        """
+        with self._lock:
+            derivation = self._derived.get(name)
+        if derivation is not None:
+            return derivation.frame
+        frame = initial if initial is not None else transform(self.frame(table))
+        with self._lock:
+            self._derived[name] = Derivation(table, transform, index, frame)
+        return frame
+
+    def refresh(self) -> set[str]:
+        """
+        Apply the write events since the last refresh to the loaded tables and derived frames. Returns the
+        names of the tables that changed.
+        """
+        with self._lock:
+            watched = set(self._loads) | {derivation.table for derivation in self._derived.values()}
+        events = self.notifier.poll(self.cursor, tables=sorted(watched))
+        if not events:
+            return set()
+
+        from_blocks: dict[str, Optional[int]] = {}
+        for event in events:
+            # first block to re-read per table; None (no block range) means the whole table
+            if event.table not in from_blocks:
+                from_blocks[event.table] = event.min_block
+            elif from_blocks[event.table] is not None and event.min_block is not None:
+                from_blocks[event.table] = min(from_blocks[event.table], event.min_block)
+            else:
+                from_blocks[event.table] = None
+
+        for table, from_block in from_blocks.items():
+            handle = self.table(table)
+            handle.cold.reload()
+            new_rows = pl.from_arrow(handle.to_arrow(from_block=from_block))
+            with self._lock:
+                load = self._loads.get(table)
+                derivations = [d for d in self._derived.values() if d.table == table]
+            if load is not None and load.done() and load.exception() is None:
+                cached = pl.from_arrow(load.result())
+                spliced = new_rows if from_block is None else splice(cached, new_rows, handle.index, from_block)
+                loaded: Future = Future()
+                loaded.set_result(spliced.to_arrow())
+                with self._lock:
+                    self._loads[table] = loaded
+            for derivation in derivations:
+                transformed = derivation.transform(new_rows)
+                derivation.frame = (
+                    transformed if from_block is None
+                    else splice(derivation.frame, transformed, derivation.index, from_block)
+                )
+            logger.info(f"Applied {len(new_rows)} rows of {table} from block {from_block}")
+
+        self.cursor = events[-1].id
+        return set(from_blocks)
+
+    def reload(self, *names: str) -> None:
+        """
+        Drop the loaded copies of `names` (all tables if none given) and load them again in the background.
+        """
+        with self._lock:
+            for name in names or tuple(self._loads):
+                self._loads.pop(name, None)
+        self.prefetch(*(names or tuple(self._handles)))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
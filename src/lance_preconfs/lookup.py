@@ -0,0 +1,197 @@
+import logging
+from typing import Optional
+
+import polars as pl
+import pyarrow as pa
+from lancedb import DBConnection
+
+from lance_preconfs.config import (
+    COMMITMENTS_L1_TABLE_NAME,
+    HASH_COLUMNS,
+    HASH_INDEX_OPTIMIZE_ROWS,
+    HASH_INDEX_TABLE_NAME,
+    INDEX,
+    L1_TX_TABLE_NAME,
+    MEV_BOOST_TABLE_NAME,
+    URI,
+)
+from lance_preconfs.coordination import TableLock, retry_on_conflict
+from lance_preconfs.tiers import TieredTable, open_tiered
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_hash(value: str) -> str:
+    """
+    Lowercase hex without the 0x prefix, the form hashes are stored in the hash index.
+    """
+    value = value.strip().lower()
+    return value[2:] if value.startswith("0x") else value
+
+
+def hash_rows(commitments_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    One hash index row per (hash column, commitment) of a raw commitments batch.
+    """
+    return pl.concat([
+        commitments_df.select(
+            pl.col(column).cast(pl.Utf8).str.to_lowercase().str.strip_prefix("0x").alias("hash"),
+            pl.lit(column).alias("kind"),
+            pl.col("commitmentIndex"),
+            pl.col(INDEX),
+            pl.col("blockNumber").alias("l1_block_number"),
+        )
+        for column in HASH_COLUMNS
+    ]).drop_nulls("hash")
+
+
+def _to_arrow(rows: pl.DataFrame) -> pa.Table:
+    # Polars strings become large_string, which Lance cannot BTREE-index
+    table = rows.to_arrow()
+    return table.set_column(table.schema.get_field_index("hash"), "hash", table["hash"].cast(pa.string()))
+
+
+class HashIndex:
+    """
+    Compact on-disk map from every commitment hash (txnHash, commitmentHash, bidHash, commitmentDigest)
+    to the commitment's index and blocks, stored as a Lance table with a BTREE index on the hash. A lookup
+    is one index probe followed by block-window reads that open a single partition of each table.
+    """
+
+    def __init__(self, db: DBConnection, name: str = HASH_INDEX_TABLE_NAME) -> None:
+        self.db: DBConnection = db
+        self.name: str = name
+        self._unindexed: int = 0
+        self._lock: TableLock = TableLock(db.uri, name)
+
+    def _open(self):
+        try:
+            return self.db.open_table(self.name)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _indexed(self, tbl) -> bool:
+        return any("hash" in idx["fields"] for idx in tbl.to_lance().list_indices())
+
+    def exists(self) -> bool:
+        """
+        Whether the index table exists with its hash index. A table left without one, e.g. by a failed
+        build, counts as missing so the next `build()` replaces it.
+        """
+        tbl = self._open()
+        return tbl is not None and self._indexed(tbl)
+
+    def build(self, commitments_df: pl.DataFrame) -> int:
+        """
+        Replace the index with the hashes of `commitments_df`, every stored commitment. Returns the number
+        of rows written.
+        """
+        with self._lock:
+            if self._open() is not None:
+                self.db.drop_table(self.name)
+            rows = hash_rows(commitments_df)
+            if rows.is_empty():
+                return 0
+            self._create(rows)
+        return rows.shape[0]
+
+    def _create(self, rows: pl.DataFrame) -> None:
+        # the table and its index are one step: a table without the index is dropped so a retry starts over
+        tbl = self.db.create_table(name=self.name, data=_to_arrow(rows))
+        try:
+            retry_on_conflict(lambda: self._maintain(tbl), f"indexing of {self.name}")
+        except Exception:
+            self.db.drop_table(self.name)
+            raise
+        self._unindexed = 0
+
+    def add(self, commitments_df: pl.DataFrame) -> int:
+        """
+        Add the hashes of a raw commitments batch. Returns the number of rows added.
+        """
+        rows = hash_rows(commitments_df)
+        if rows.is_empty():
+            return 0
+        with self._lock:
+            tbl = self._open()
+            if tbl is None:
+                self._create(rows)
+                return rows.shape[0]
+            tbl.add(_to_arrow(rows))
+            self._unindexed += rows.shape[0]
+            if self._unindexed >= HASH_INDEX_OPTIMIZE_ROWS:
+                retry_on_conflict(lambda: self._maintain(self._open()), f"maintenance of {self.name}")
+                self._unindexed = 0
+        return rows.shape[0]
+
+    def _maintain(self, tbl) -> None:
+        tbl.compact_files()
+        dataset = tbl.to_lance()
+        if self._indexed(tbl):
+            dataset.optimize.optimize_indices()
+        else:
+            dataset.create_scalar_index("hash", index_type="BTREE")
+
+    def find(self, value: str) -> Optional[pl.DataFrame]:
+        """
+        Hash index rows for `value`, or None if the hash is unknown.
+        """
+        tbl = self._open()
+        if tbl is None:
+            return None
+        value = normalize_hash(value)
+        if not all(c in "0123456789abcdef" for c in value):
+            return None
+        rows = pl.from_arrow(tbl.to_lance().to_table(filter=f"hash = '{value}'")).unique(["kind", "commitmentIndex"])
+        return rows if not rows.is_empty() else None
+
+
+class HashLookup:
+    """
+    Resolves any commitment hash to its commitment (joined with its L1 tx), the raw L1 transaction and
+    the mev-boost block it landed in.
+    """
+
+    def __init__(self, uri: str = URI, db: Optional[DBConnection] = None) -> None:
+        self.commitments_l1: TieredTable = open_tiered(COMMITMENTS_L1_TABLE_NAME, uri=uri, db=db)
+        db = self.commitments_l1.db
+        self.l1_txs: TieredTable = open_tiered(L1_TX_TABLE_NAME, uri=uri, db=db)
+        self.mev_boost_blocks: TieredTable = open_tiered(MEV_BOOST_TABLE_NAME, uri=uri, db=db)
+        self.index: HashIndex = HashIndex(db)
+
+    @staticmethod
+    def _read(table: TieredTable, filter: str, from_block: int, to_block: int) -> Optional[pl.DataFrame]:
+        try:
+            df = pl.from_arrow(table.to_arrow(filter=filter, from_block=from_block, to_block=to_block))
+        except FileNotFoundError:
+            return None
+        return df if not df.is_empty() else None
+
+    def resolve(self, value: str) -> Optional[dict[str, Optional[pl.DataFrame]]]:
+        """
+        `{"commitments": ..., "l1_txs": ..., "mev_boost_blocks": ...}` for a hash, or None if it is unknown.
+        """
+        matches = self.index.find(value)
+        if matches is None:
+            return None
+
+        indexes = ", ".join(
+            f"'{i}'" if isinstance(i, str) else str(i) for i in matches["commitmentIndex"].unique().to_list()
+        )
+        commitments = self._read(
+            self.commitments_l1,
+            f"`commitmentIndex` IN ({indexes})",  # quoted: Lance folds unquoted identifiers to lower case
+            matches[INDEX].min(),
+            matches[INDEX].max() + 1,
+        )
+        result: dict[str, Optional[pl.DataFrame]] = {"commitments": commitments, "l1_txs": None, "mev_boost_blocks": None}
+        if commitments is None or commitments["block_number"].drop_nulls().is_empty():
+            return result
+
+        # block_number is the block the L1 tx was included in
+        included = commitments.drop_nulls("block_number")
+        tx_hashes = ", ".join(f"'{h}'" for h in included["l1_txnHash"].unique().to_list())
+        first, last = included["block_number"].min(), included["block_number"].max() + 1
+        result["l1_txs"] = self._read(self.l1_txs, f"hash IN ({tx_hashes})", first, last)
+        result["mev_boost_blocks"] = self._read(self.mev_boost_blocks, None, first, last)
+        return result
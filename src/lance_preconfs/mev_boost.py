@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Optional
+
+import polars as pl
+from mev_boost_py.proposer_payload import Network, ProposerPayloadFetcher
+
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.config import MEV_BOOST_TABLE_NAME
+
+logger = logging.getLogger(__name__)
+
+
+async def fetch_blocks(clients: SharedClients) -> Optional[pl.DataFrame]:
+    """
+    Fetch the latest mev-boost payloads of the client network and join them onto the matching L1 blocks.
+    """
+    try:
+        # get mev-boost data. The relay fetcher is synchronous, so keep it off the shared event loop.
+        mev_boost_query: ProposerPayloadFetcher = ProposerPayloadFetcher(
+            network=Network(clients.network.mev_boost_network),
+        )
+        mev_boost_blocks_df: pl.DataFrame = (
+            await asyncio.to_thread(mev_boost_query.run)
+        ).with_columns(pl.col('block_number').cast(pl.UInt64))
+
+        # get latest 300 block numbers
+        block_numbers: list[str] = (
+            mev_boost_blocks_df.sort(by="block_number")["block_number"].unique().to_list()[-300:]
+        )
+        logger.info(f'querying block range {min(block_numbers)} to {max(block_numbers)}')
+
+        # get L1 block data
+        l1_blocks_df: pl.DataFrame = await clients.l1.get_blocks(
+            from_block=min(block_numbers), to_block=max(block_numbers)+1
+        )
+
+        l1_blocks_df = l1_blocks_df.select('number', 'timestamp', 'hash', 'base_fee_per_gas', 'gas_used', 'extra_data')
+
+        boost_blocks_df = (
+            l1_blocks_df
+            .rename({'number': 'block_number'})
+            .join(mev_boost_blocks_df, on='block_number', how='left', suffix='_mev_boost')
+        )
+
+        return boost_blocks_df
+    except Exception as e:
+        logger.error(f"Error fetching blocks data: {e}")
+        return None
+
+
+async def run_mev_boost_cycle(clients: SharedClients) -> None:
+    """
+    Fetch the latest mev-boost blocks and merge them into LanceDB.
+    """
+    boost_blocks_df: Optional[pl.DataFrame] = await fetch_blocks(clients)
+    if boost_blocks_df is not None:
+        try:
+            await clients.write(MEV_BOOST_TABLE_NAME, boost_blocks_df)
+            logger.info("mev-boost-blocks updated")
+        except Exception as e:
+            logger.error(f"Error writing data to LanceDB: {e}")
+    else:
+        logger.warning("No data fetched to write.")
@@ -0,0 +1,117 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import polars as pl
+
+from lance_preconfs.config import INDEX, NOTIFICATIONS_FILE, NOTIFICATIONS_RETENTION, TABLE_INDEXES, URI
+
+logger = logging.getLogger(__name__)
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS write_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    min_block INTEGER,
+    max_block INTEGER,
+    created_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class WriteEvent:
+    """
+    Table `table` advanced to `version` with `rows` new or updated rows in blocks `[min_block, max_block]`.
+    """
+    id: int
+    table: str
+    version: str
+    rows: int
+    min_block: Optional[int]
+    max_block: Optional[int]
+    created_at: float
+
+
+class WriteNotifier:
+    """
+    Local channel for write events, kept in a SQLite queue at `<uri>/notifications.sqlite`. Ingesters
+    publish an event after each write; readers such as the dashboard poll for events after the last id
+    they saw. SQLite in WAL mode lets any number of processes publish and poll concurrently.
+    """
+
+    def __init__(self, uri: str = URI, retention: int = NOTIFICATIONS_RETENTION) -> None:
+        self.path: str = os.path.join(uri, NOTIFICATIONS_FILE)
+        self.retention: int = retention
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._published: int = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+        return self._conn
+
+    def publish(self, table: str, version: str, data: pl.DataFrame, index: Optional[str] = None) -> Optional[int]:
+        """
+        Record that `data` was written to `table`, now at `version`. Returns the event id.
+        """
+        if data.is_empty():
+            return None
+        index = index if index is not None else TABLE_INDEXES.get(table, INDEX)
+        blocks = data[index] if index in data.columns else None
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "INSERT INTO write_events (table_name, version, rows, min_block, max_block, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    table, version, data.shape[0],
+                    int(blocks.min()) if blocks is not None else None,
+                    int(blocks.max()) if blocks is not None else None,
+                    time.time(),
+                ),
+            )
+            self._published += 1
+            if self._published % 100 == 0:
+                conn.execute("DELETE FROM write_events WHERE created_at < ?", (time.time() - self.retention,))
+            return cursor.lastrowid
+
+    def poll(self, after_id: int = 0, tables: Optional[list[str]] = None) -> list[WriteEvent]:
+        """
+        Events after `after_id`, oldest first, optionally only for `tables`.
+        """
+        if not os.path.exists(self.path):
+            return []
+        query = "SELECT id, table_name, version, rows, min_block, max_block, created_at FROM write_events WHERE id > ?"
+        params: list = [after_id]
+        if tables:
+            query += f" AND table_name IN ({', '.join('?' for _ in tables)})"
+            params.extend(tables)
+        with self._lock:
+            rows = self._connect().execute(query + " ORDER BY id", params).fetchall()
+        return [WriteEvent(*row) for row in rows]
+
+    def latest_id(self) -> int:
+        """
+        Id of the newest event, 0 if there is none.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        with self._lock:
+            row = self._connect().execute("SELECT MAX(id) FROM write_events").fetchone()
+        return row[0] or 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,427 @@
+import datetime
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Optional
+
+import polars as pl
+import pyarrow as pa
+from lancedb import DBConnection
+
+from lance_preconfs.config import (
+    COLD_CLEANUP_SECONDS,
+    COMMITMENT_TABLE_NAME,
+    INDEX,
+    MEV_BOOST_TABLE_NAME,
+    PARTITION_BLOCKS,
+    RETENTION_ACTIONS,
+    RETENTION_LIVE_PARTITIONS,
+    TABLE_INDEXES,
+    TIMESTAMP_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+LIVE: str = "live"
+ARCHIVE: str = "archive"
+ROLLUP: str = "rollup"
+
+
+@dataclass
+class Partition:
+    """
+    One entry of a partition manifest. `start_block`/`end_block` are the bucket bounds, the `min_*`/`max_*`
+    fields the actual contents, which is what window reads are matched against.
+    """
+    table: str
+    start_block: int
+    end_block: int
+    rows: int = 0
+    min_block: Optional[int] = None
+    max_block: Optional[int] = None
+    min_timestamp: Optional[int] = None
+    max_timestamp: Optional[int] = None
+    tier: str = LIVE
+    compacted: bool = False
+
+    def overlaps(
+        self,
+        from_block: Optional[int],
+        to_block: Optional[int],
+        from_timestamp: Optional[int],
+        to_timestamp: Optional[int],
+    ) -> bool:
+        if self.min_block is None:
+            return False
+        if from_block is not None and self.max_block < from_block:
+            return False
+        if to_block is not None and self.min_block >= to_block:
+            return False
+        if self.min_timestamp is not None:
+            if from_timestamp is not None and self.max_timestamp < from_timestamp:
+                return False
+            if to_timestamp is not None and self.min_timestamp >= to_timestamp:
+                return False
+        return True
+
+
+def hourly_commitment_rollup(data: pl.DataFrame) -> pl.DataFrame:
+    """
+    Hourly per-provider commitment counts, slashes and bid totals.
+    """
+    return (
+        data.with_columns(pl.from_epoch("timestamp", time_unit="ms").dt.truncate("1h").alias("hour"))
+        .group_by("hour", "commiter")
+        .agg(
+            pl.len().alias("total_count"),
+            pl.col("isSlash").sum().alias("slash_count"),
+            pl.col("bid").cast(pl.Float64).sum().alias("total_bid"),
+            pl.col(INDEX).min().alias("min_block_number"),
+            pl.col(INDEX).max().alias("max_block_number"),
+        )
+    )
+
+
+def hourly_mev_boost_rollup(data: pl.DataFrame) -> pl.DataFrame:
+    """
+    Hourly block counts split by whether the block came through a mev-boost relay.
+    """
+    return (
+        data.with_columns(
+            pl.from_epoch("timestamp", time_unit="s").dt.truncate("1h").alias("hour"),
+            pl.col("relay").is_not_null().alias("mev_boost"),
+        )
+        .group_by("hour", "mev_boost")
+        .agg(
+            pl.len().alias("block_count"),
+            pl.col("value").cast(pl.Float64).sum().alias("total_value"),
+            pl.col(INDEX).min().alias("min_block_number"),
+            pl.col(INDEX).max().alias("max_block_number"),
+        )
+    )
+
+
+ROLLUPS: dict[str, Callable[[pl.DataFrame], pl.DataFrame]] = {
+    COMMITMENT_TABLE_NAME: hourly_commitment_rollup,
+    MEV_BOOST_TABLE_NAME: hourly_mev_boost_rollup,
+}
+
+
+def to_epoch(value: datetime.datetime, unit: str) -> int:
+    """
+    Convert a datetime to an integer epoch in `unit` ("s" or "ms").
+    """
+    seconds = value.timestamp()
+    return int(seconds * 1000) if unit == "ms" else int(seconds)
+
+
+class PartitionedTable:
+    """
+    Append-only table stored as per-`partition_blocks` Lance tables named `<table>__p<start block>`, listed
+    in a JSON manifest at `<uri>/<table>.manifest.json`. Window reads open only the partitions whose block
+    or time range overlaps the window, so recent-window latency does not grow with history. An existing
+    unpartitioned `<table>` dataset is registered as a single partition rather than rewritten. Reads
+    re-read the manifest when another process has replaced it, so long-lived readers see new partitions
+    and retention moves.
+    """
+
+    def __init__(self, db: DBConnection, uri: str, name: str, partition_blocks: int, index: str = INDEX) -> None:
+        self.db: DBConnection = db
+        self.uri: str = uri
+        self.name: str = name
+        self.partition_blocks: int = partition_blocks
+        self.index: str = index
+        self.timestamp: Optional[tuple[str, str]] = TIMESTAMP_COLUMNS.get(name)
+        self.archive_name: str = f"{name}__archive"
+        self.rollup_name: str = f"{name}__rollup"
+        self.manifest_path: str = os.path.join(uri, f"{name}.manifest.json")
+        self._manifest_stamp: Optional[tuple[int, int, int]] = None  # of the manifest `partitions` was read from
+        self.partitions: list[Partition] = self._load_manifest()
+
+    def _open(self, table: str):
+        try:
+            return self.db.open_table(table)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _stamp(self) -> Optional[tuple[int, int, int]]:
+        # every save replaces the file, so the inode changes even where mtimes are coarse
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def _load_manifest(self) -> list[Partition]:
+        stamp = self._stamp()
+        if stamp is not None:
+            with open(self.manifest_path) as f:
+                partitions = [Partition(**entry) for entry in json.load(f)["partitions"]]
+            self._manifest_stamp = stamp
+            return partitions
+
+        legacy = self._open(self.name)
+        if legacy is None:
+            return []
+        partition = Partition(table=self.name, start_block=0, end_block=0)
+        self._update_stats(partition, pl.from_arrow(legacy.to_lance().to_table(columns=self._stat_columns())))
+        if partition.min_block is None:
+            return []  # nothing to register; new rows go to partitions of their own
+        logger.info(f"Registering existing table {self.name} as a partition")
+        partition.start_block = partition.min_block
+        partition.end_block = partition.max_block + 1
+        partitions = [partition]
+        self._save_manifest(partitions)
+        return partitions
+
+    def reload(self) -> None:
+        """
+        Re-read the manifest, e.g. after another process appended partitions.
+        """
+        self.partitions = self._load_manifest()
+
+    def _reload_if_changed(self) -> None:
+        if self._stamp() != self._manifest_stamp:
+            self.reload()
+
+    def _save_manifest(self, partitions: Optional[list[Partition]] = None) -> None:
+        partitions = self.partitions if partitions is None else partitions
+        os.makedirs(self.uri, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"partitions": [asdict(p) for p in partitions]}, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)  # atomic swap so readers never see a partial manifest
+        self._manifest_stamp = self._stamp()
+
+    def _stat_columns(self) -> list[str]:
+        return [self.index] if self.timestamp is None else [self.index, self.timestamp[0]]
+
+    def _update_stats(self, partition: Partition, data: pl.DataFrame) -> None:
+        if data.is_empty():
+            return
+        partition.rows += data.shape[0]
+        blocks = data[self.index]
+        partition.min_block = blocks.min() if partition.min_block is None else min(partition.min_block, blocks.min())
+        partition.max_block = blocks.max() if partition.max_block is None else max(partition.max_block, blocks.max())
+        if self.timestamp is not None:
+            ts = data[self.timestamp[0]]
+            partition.min_timestamp = ts.min() if partition.min_timestamp is None else min(partition.min_timestamp, ts.min())
+            partition.max_timestamp = ts.max() if partition.max_timestamp is None else max(partition.max_timestamp, ts.max())
+
+    def max_block(self) -> Optional[int]:
+        """
+        Newest block stored, read from the manifest.
+        """
+        self._reload_if_changed()
+        blocks = [p.max_block for p in self.partitions if p.max_block is not None]
+        return max(blocks) if blocks else None
+
+    def append(self, data: pl.DataFrame) -> int:
+        """
+        Append rows to their block partitions. Returns the number of rows written. The manifest is saved
+        after every partition, so a retry after a failure or commit conflict part-way through sees the
+        partitions already written.
+        """
+        if data.is_empty():
+            return 0
+        data = data.with_columns(
+            (pl.col(self.index) // self.partition_blocks * self.partition_blocks).alias("__partition_start")
+        )
+        by_table = {p.table: p for p in self.partitions}
+        for (start,), rows in data.partition_by("__partition_start", as_dict=True, maintain_order=True).items():
+            rows = rows.drop("__partition_start")
+            table = f"{self.name}__p{start:012d}"
+            partition = by_table.get(table)
+            tbl = self._open(table)
+            if tbl is None:
+                self.db.create_table(name=table, data=rows.to_arrow())
+            else:
+                tbl.add(rows.to_arrow())
+            if partition is None:
+                partition = Partition(table=table, start_block=start, end_block=start + self.partition_blocks)
+                self.partitions.append(partition)
+                by_table[table] = partition
+            partition.compacted = False
+            self._update_stats(partition, rows.select(self._stat_columns()))
+            self._save_manifest()
+        return data.shape[0]
+
+    def window_filter(
+        self,
+        filter: Optional[str] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> Optional[str]:
+        """
+        Combine `filter` with a block window `[from_block, to_block)` and a time window `[start, end)`
+        into one Lance filter expression.
+        """
+        clauses = [f"({filter})"] if filter else []
+        if from_block is not None:
+            clauses.append(f"{self.index} >= {from_block}")
+        if to_block is not None:
+            clauses.append(f"{self.index} < {to_block}")
+        if self.timestamp is not None:
+            column, unit = self.timestamp
+            if start is not None:
+                clauses.append(f"{column} >= {to_epoch(start, unit)}")
+            if end is not None:
+                clauses.append(f"{column} < {to_epoch(end, unit)}")
+        return " AND ".join(clauses) if clauses else None
+
+    def select_partitions(
+        self,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        tiers: tuple[str, ...] = (LIVE, ARCHIVE),
+    ) -> list[Partition]:
+        """
+        Manifest entries whose contents overlap the block and time windows.
+        """
+        self._reload_if_changed()
+        unit = self.timestamp[1] if self.timestamp is not None else "s"
+        from_ts = to_epoch(start, unit) if start is not None else None
+        to_ts = to_epoch(end, unit) if end is not None else None
+        return [
+            p for p in self.partitions
+            if p.tier in tiers and p.overlaps(from_block, to_block, from_ts, to_ts)
+        ]
+
+    def to_arrow(
+        self,
+        columns: Optional[list[str]] = None,
+        filter: Optional[str] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> Optional[pa.Table]:
+        """
+        Read the raw rows of every overlapping live or archived partition, or None if there are none.
+        """
+        expression = self.window_filter(filter, from_block, to_block, start, end)
+        tables = []
+        for table in dict.fromkeys(p.table for p in self.select_partitions(from_block, to_block, start, end)):
+            tbl = self._open(table)
+            if tbl is not None:
+                tables.append(tbl.to_lance().to_table(columns=columns, filter=expression))
+        if not tables:
+            return None
+        return pa.concat_tables(tables, promote_options="default")
+
+    def rollups(self) -> Optional[pa.Table]:
+        """
+        Aggregates of partitions that were rolled up by the retention policy.
+        """
+        tbl = self._open(self.rollup_name)
+        return tbl.to_lance().to_table() if tbl is not None else None
+
+    def compact_table(self, table: str) -> None:
+        """
+        Compact, clean up and index one partition, archive or rollup table. Lance commits compaction
+        alongside concurrent appends, so this needs no write lock.
+        """
+        tbl = self._open(table)
+        if tbl is None:
+            return
+        tbl.compact_files()
+        tbl.cleanup_old_versions(datetime.timedelta(seconds=COLD_CLEANUP_SECONDS))
+        dataset = tbl.to_lance()
+        if any(self.index in idx["fields"] for idx in dataset.list_indices()):
+            dataset.optimize.optimize_indices()  # fold appended fragments into the index
+        elif self.index in dataset.schema.names:
+            dataset.create_scalar_index(self.index, index_type="BTREE")
+
+    def uncompacted(self) -> list[Partition]:
+        """
+        Copies of the live partitions that received rows since their last compaction.
+        """
+        return [replace(p) for p in self.partitions if p.tier == LIVE and not p.compacted]
+
+    def mark_compacted(self, compacted: list[Partition]) -> None:
+        """
+        Record the partitions of `compacted`, as returned by `uncompacted()`, as compacted, except those
+        that received rows after they were listed.
+        """
+        rows = {p.table: p.rows for p in compacted}
+        for partition in self.partitions:
+            if partition.tier == LIVE and rows.get(partition.table) == partition.rows:
+                partition.compacted = True
+        self._save_manifest()
+
+    def compact(self) -> None:
+        """
+        Compact and index live partitions that received rows since their last compaction.
+        """
+        compacted = self.uncompacted()
+        for partition in compacted:
+            self.compact_table(partition.table)
+        self.mark_compacted(compacted)
+
+    def _replace_rows(self, table: str, data: pa.Table, where: str) -> None:
+        tbl = self._open(table)
+        if tbl is None:
+            self.db.create_table(name=table, data=data)
+            return
+        tbl.delete(where)  # makes a retried move idempotent
+        tbl.add(data)
+
+    def apply_retention(
+        self,
+        live_partitions: Optional[int] = None,
+        action: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Move every live partition older than the newest `live_partitions`, oldest first and at most `limit`
+        of them, into the archive table, or replace it with aggregates in the rollup table. Returns the
+        number of partitions moved. The archive is not compacted; see `compact_table()`.
+        """
+        live_partitions = RETENTION_LIVE_PARTITIONS[self.name] if live_partitions is None else live_partitions
+        action = RETENTION_ACTIONS[self.name] if action is None else action
+        live = sorted(
+            (p for p in self.partitions if p.tier == LIVE and p.max_block is not None),
+            key=lambda p: p.max_block,
+        )
+        expired = live[:-live_partitions] if live_partitions > 0 else live
+        expired = expired[:limit] if limit is not None else expired
+        if not expired:
+            return 0
+
+        for partition in expired:
+            tbl = self._open(partition.table)
+            if tbl is None:
+                continue
+            source = partition.table
+            rows = tbl.to_lance().to_table()
+            if action == ROLLUP and self.name in ROLLUPS:
+                aggregates = ROLLUPS[self.name](pl.from_arrow(rows)).with_columns(
+                    pl.lit(partition.start_block).alias("partition_start_block")
+                )
+                self._replace_rows(self.rollup_name, aggregates.to_arrow(), f"partition_start_block = {partition.start_block}")
+                partition.table, partition.tier = self.rollup_name, ROLLUP
+            else:
+                self._replace_rows(
+                    self.archive_name, rows,
+                    f"{self.index} >= {partition.min_block} AND {self.index} <= {partition.max_block}",
+                )
+                partition.table, partition.tier = self.archive_name, ARCHIVE
+            # the manifest points at the new location before the old table is dropped
+            self._save_manifest()
+            self.db.drop_table(source)
+            logger.info(f"Moved partition {partition.start_block} of {self.name} to {partition.tier}")
+        return len(expired)
+
+
+def open_partitioned(db: DBConnection, uri: str, name: str) -> PartitionedTable:
+    """
+    Open the partitioned cold storage of `name` with its configured partition size.
+    """
+    return PartitionedTable(
+        db=db, uri=uri, name=name, partition_blocks=PARTITION_BLOCKS[name], index=TABLE_INDEXES.get(name, INDEX)
+    )
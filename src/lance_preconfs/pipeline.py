@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from lance_preconfs.config import PIPELINE_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+Stage = Callable[[Any], Awaitable[Any]]
+
+
+async def run_pipeline(source: AsyncIterator[Any], stages: list[Stage], queue_size: int = PIPELINE_QUEUE_SIZE) -> int:
+    """
+    Run `source` and `stages` concurrently, each stage consuming the previous one's results through a
+    bounded queue. A slow stage fills its input queue, which blocks the stage before it and finally
+    `source`, so fetching never runs more than `queue_size` batches ahead of writing. A stage returning
+    None drops the item. Items keep their order. If any stage fails, the others are cancelled and the
+    error is raised. Returns the number of items that went through the last stage.
+    """
+    queues: list[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+    completed = 0
+
+    async def feed() -> None:
+        async for item in source:
+            await queues[0].put(item)
+        await queues[0].put(_DONE)
+
+    async def work(index: int, stage: Stage) -> None:
+        nonlocal completed
+        last = index == len(stages) - 1
+        while True:
+            item = await queues[index].get()
+            if item is _DONE:
+                if not last:
+                    await queues[index + 1].put(_DONE)
+                return
+            result = await stage(item)
+            if last:
+                completed += 1
+            elif result is not None:
+                await queues[index + 1].put(result)
+
+    tasks = [asyncio.ensure_future(feed())] + [asyncio.ensure_future(work(i, stage)) for i, stage in enumerate(stages)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return completed
@@ -1,60 +1,202 @@
-import asyncio
+import logging
+import sys
+import threading
+from typing import Optional
+
+import duckdb
+import lancedb
 import polars as pl
+from lancedb import DBConnection
+
+from lance_preconfs.config import (
+    COMMITMENT_TABLE_NAME,
+    COMMITMENTS_L1_TABLE_NAME,
+    L1_TX_TABLE_NAME,
+    MEV_BOOST_TABLE_NAME,
+    URI,
+)
+from lance_preconfs.tiers import TieredTable, open_tiered
+
+logger = logging.getLogger(__name__)
+
+# Views over the base tables. Each base table `<name>` is itself a view over its cold partitions and hot table.
+VIEWS: dict[str, str] = {
+    "commitments_enriched": """
+        SELECT
+            to_timestamp(timestamp / 1000) AS datetime,
+            CAST(dispatchTimestamp AS BIGINT) - CAST(decayStartTimeStamp AS BIGINT) AS bid_decay_latency,
+            greatest(
+                (CAST(decayEndTimeStamp AS BIGINT) - CAST(dispatchTimestamp AS BIGINT))
+                / (CAST(decayEndTimeStamp AS BIGINT) - CAST(decayStartTimeStamp AS BIGINT)),
+                0
+            ) AS decay_multiplier,
+            isSlash,
+            block_number AS mev_commit_block_number,
+            blockNumber AS l1_block_number,
+            txnHash AS l1_txnHash,
+            CAST(bid AS DOUBLE) / 1e18 AS bid_eth,
+            commiter,
+            bidder
+        FROM commitments
+    """,
+    "commitments_priced": """
+        SELECT *, decay_multiplier * bid_eth AS decayed_bid_eth FROM commitments_enriched
+    """,
+    "slash_rates": """
+        SELECT
+            date_trunc('hour', datetime) AS hour,
+            count(*) FILTER (WHERE isSlash) AS slash_count,
+            count(*) AS total_count,
+            count(*) FILTER (WHERE isSlash) / count(*) AS slash_rate,
+            count(*) FILTER (WHERE NOT isSlash) AS non_slash_count
+        FROM commitments_enriched
+        GROUP BY ALL
+    """,
+    "provider_slash_rates": """
+        SELECT
+            date_trunc('hour', datetime) AS hour,
+            commiter,
+            count(*) FILTER (WHERE isSlash) AS slash_count,
+            count(*) AS total_count,
+            count(*) FILTER (WHERE isSlash) / count(*) AS slash_rate,
+            count(*) FILTER (WHERE NOT isSlash) AS non_slash_count
+        FROM commitments_enriched
+        GROUP BY ALL
+    """,
+    "bidder_totals": """
+        SELECT
+            bidder,
+            count(*) AS bid_count,
+            sum(bid_eth) AS total_eth_bids,
+            sum(decayed_bid_eth) AS total_decayed_eth_bids
+        FROM commitments_priced
+        GROUP BY ALL
+    """,
+    "preconf_per_block": """
+        SELECT
+            l1_block_number,
+            count(*) AS preconf_count,
+            sum(decayed_bid_eth) AS total_decayed_bid_eth,
+            sum(bid_eth) AS total_bid_eth,
+            bool_or(isSlash) AS isSlash
+        FROM commitments_priced
+        GROUP BY ALL
+    """,
+}
+
+# Named queries with `$param` placeholders, executed as prepared statements.
+QUERIES: dict[str, str] = {
+    "latest_block": "SELECT max(block_number) FROM commitments",
+    "commitments_in_range": """
+        SELECT * FROM commitments WHERE block_number >= $from_block AND block_number < $to_block
+    """,
+    "slash_rates_since": "SELECT * FROM slash_rates WHERE hour >= $since ORDER BY hour",
+    "provider_slash_rates_since": "SELECT * FROM provider_slash_rates WHERE hour >= $since ORDER BY hour, commiter",
+    "top_bidders": "SELECT * FROM bidder_totals ORDER BY bid_count DESC LIMIT $limit",
+    "preconf_blocks_in_range": """
+        SELECT * FROM preconf_per_block
+        WHERE l1_block_number >= $from_block AND l1_block_number < $to_block
+        ORDER BY l1_block_number
+    """,
+}
+
+
+class PreconfDB:
+    """
+    One long-lived DuckDB connection with every Lance dataset registered as a zero-copy Arrow scan, so
+    projections and filters are pushed down into Lance. Each base table is a view over its cold
+    partitions and hot table, re-registered only when the table version changes, and the analytical
+    views in `VIEWS` are defined on top. Access is serialized with a lock.
+    """
+
+    def __init__(self, uri: str = URI, db: Optional[DBConnection] = None) -> None:
+        db = db if db is not None else lancedb.connect(uri)
+        self.tables: dict[str, TieredTable] = {
+            name: open_tiered(name, uri=uri, db=db)
+            for name in (COMMITMENT_TABLE_NAME, L1_TX_TABLE_NAME, MEV_BOOST_TABLE_NAME, COMMITMENTS_L1_TABLE_NAME)
+        }
+        self.con: duckdb.DuckDBPyConnection = duckdb.connect()
+        self._versions: dict[str, str] = {}
+        self._registered: dict[str, list[str]] = {}
+        self._lock = threading.RLock()
+
+    def _register_table(self, name: str, table: TieredTable) -> None:
+        for source in self._registered.pop(name, []):
+            self.con.unregister(source)
+
+        sources = []
+        candidates = [p.table for p in table.cold.select_partitions()] + [table.hot_name]
+        for source in dict.fromkeys(candidates):
+            try:
+                dataset = table.db.open_table(source).to_lance()
+            except (FileNotFoundError, ValueError):
+                continue
+            self.con.register(source, dataset)
+            sources.append(source)
+        self._registered[name] = sources
+
+        self.con.execute(f"DROP VIEW IF EXISTS {name}")
+        if sources:
+            union = " UNION ALL BY NAME ".join(f"SELECT * FROM {source}" for source in sources)
+            self.con.execute(f"CREATE VIEW {name} AS {union}")
+
+    def refresh(self) -> None:
+        """
+        Re-register base tables whose data changed and rebuild the analytical views.
+        """
+        with self._lock:
+            changed = False
+            for name, table in self.tables.items():
+                version = table.version()
+                if self._versions.get(name) != version:
+                    table.cold.reload()  # pick up partitions added by the ingestion process
+                    self._register_table(name, table)
+                    self._versions[name] = version
+                    changed = True
+            if not changed:
+                return
+            for view, sql in VIEWS.items():
+                try:
+                    self.con.execute(f"CREATE OR REPLACE VIEW {view} AS {sql}")
+                except duckdb.Error as e:
+                    logger.debug(f"View {view} not available: {e}")
+
+    def sql(self, query: str, params: Optional[dict] = None) -> pl.DataFrame:
+        """
+        Run ad hoc SQL against the current data and return a Polars frame.
+        """
+        with self._lock:
+            self.refresh()
+            return self.con.execute(query, params or {}).pl()
+
+    def query(self, name: str, **params) -> pl.DataFrame:
+        """
+        Run a named query from `QUERIES` with its parameters.
+        """
+        return self.sql(QUERIES[name], params)
+
+    def latest_block(self) -> Optional[int]:
+        return self.query("latest_block").item()
+
+    def close(self) -> None:
+        with self._lock:
+            self.con.close()
+
+
+_shared: Optional[PreconfDB] = None
+_shared_lock = threading.Lock()
+
+
+def get_db(uri: str = URI) -> PreconfDB:
+    """
+    Process-wide shared `PreconfDB`, created on first use.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PreconfDB(uri=uri)
+        return _shared
+
 
-from lancedb_tables.lance_table import LanceTable
-from mev_commit_sdk_py.hypersync_client import Hypersync
-
-
-# query window data
-client = Hypersync(url='https://mev-commit.hypersync.xyz')
-
-
-async def get_data():
-    # get latest block height
-    block_height = await client.get_height()
-    from_block = block_height - 8000000
-
-    commit_stores: pl.DataFrame = asyncio.run(
-        client.get_commit_stores_v1(from_block=from_block))
-    encrypted_stores: pl.DataFrame = asyncio.run(
-        client.get_encrypted_commit_stores_v1(from_block=from_block))
-
-    # get commitment slashing
-    commits_processed = asyncio.run(
-        client.get_commits_processed_v1(from_block=from_block))
-
-    # join encrypted_stores to commit_stores. This narrows down the bids to the ones that were opened and committed to on chain.
-    commitments_df = (
-        encrypted_stores
-        .join(
-            commit_stores, on='commitmentIndex', how='inner').with_columns(
-            ('0x' + pl.col("txnHash")).alias('txnHash'))
-        .join(
-            commits_processed.select('commitmentIndex', 'isSlash'), on='commitmentIndex', how='inner')
-    ).select('blockNumber',    # holesky block number
-             'txnHash',        # holesky tx hash
-             'datetime',
-             'bid',
-             'decayed_bid_eth',
-             'commiter',
-             'bidder',
-             'isSlash',
-             'bid_latency',
-             'decayStartTimeStamp',
-             'decayEndTimeStamp',
-             'dispatchTimestamp',
-             'total_decay_range',
-             'decay_time_past',
-             'decay_percent'
-             )
-
-    # Write blocks and transactions data into lancedb tables.
-    commitment_table_name = "commitments"
-    index: str = "blockNumber"
-
-    # pull data into lance table
-    lance_tables = LanceTable()
-
-    # write blocks
-    lance_tables.write_table(uri="data", table=commitment_table_name, data=commitments_df, merge_on=index
-                             )
+if __name__ == "__main__":
+    print(get_db().sql(" ".join(sys.argv[1:]) or "SELECT * FROM slash_rates ORDER BY hour DESC LIMIT 24"))
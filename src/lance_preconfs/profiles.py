@@ -0,0 +1,236 @@
+import logging
+import math
+from typing import Optional
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+from lancedb import DBConnection
+
+from lance_preconfs.config import KEY_FILTER_CHUNK, PROFILE_INDEX_MIN_ROWS, PROFILES_TABLE_NAME
+from lance_preconfs.coordination import TableLock, retry_on_conflict
+
+logger = logging.getLogger(__name__)
+
+ROLES: tuple[str, ...] = ("bidder", "commiter")
+
+# Raw per-participant counts, in this order:
+BID_EDGES = np.arange(-7, 0)  # log10(bid in ETH) bin edges -> 8 bins
+LATENCY_EDGES = np.array([0, 100, 250, 500, 1000, 2000, 5000])  # bid decay latency (ms) -> 8 bins
+DIFF_BINS: int = 6  # l1_block_diff: <= -1, 0, 1, 2, >= 3, unknown
+HOURS: int = 24  # activity by hour of day (UTC)
+BID_SLICE = slice(0, 8)
+LATENCY_SLICE = slice(8, 16)
+SLASH_SLOT: int = 16
+DIFF_SLICE = slice(17, 17 + DIFF_BINS)
+HOUR_SLICE = slice(23, 23 + HOURS)
+TOTAL_SLOT: int = 47
+DIM: int = 48
+
+# The commitments_l1 columns profiles are counted from, as recorded per applied commitment.
+FEATURE_SCHEMA: dict[str, pl.DataType] = {
+    "commitmentIndex": pl.Utf8,
+    "bidder": pl.Utf8,
+    "commiter": pl.Utf8,
+    "bid_eth": pl.Float64,
+    "bid_decay_latency": pl.Float64,
+    "l1_block_diff": pl.Int64,
+    "datetime": pl.Datetime("ms"),
+    "isSlash": pl.Boolean,
+}
+
+
+def _diff_bins(diff: pl.Series) -> np.ndarray:
+    values = diff.fill_null(-10**9).to_numpy()
+    bins = np.clip(values, -1, 3) + 1  # <= -1 -> 0, 0 -> 1, 1 -> 2, 2 -> 3, >= 3 -> 4
+    return np.where(values == -10**9, 5, bins).astype(np.int64)
+
+
+def count_features(commits_l1_df: pl.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Raw feature counts per participant id ("bidder:<address>" / "commiter:<address>") for a batch of
+    `commits_l1_df` rows. Addresses are lower-cased. Counts are additive, so profiles can be refreshed
+    batch by batch.
+    """
+    bids = commits_l1_df["bid_eth"].fill_null(0).cast(pl.Float64).to_numpy()
+    with np.errstate(divide="ignore"):
+        bid_bins = np.digitize(np.log10(np.maximum(bids, 0)), BID_EDGES)
+    latency_bins = np.digitize(commits_l1_df["bid_decay_latency"].fill_null(0).to_numpy(), LATENCY_EDGES)
+    diff_bins = _diff_bins(commits_l1_df["l1_block_diff"])
+    hours = commits_l1_df["datetime"].dt.hour().fill_null(0).to_numpy().astype(np.int64)
+    slashes = commits_l1_df["isSlash"].fill_null(False).to_numpy().astype(np.float64)
+
+    counts: dict[str, np.ndarray] = {}
+    for role in ROLES:
+        addresses = commits_l1_df[role].str.to_lowercase().to_numpy()
+        for address in np.unique(addresses):
+            rows = addresses == address
+            vector = np.zeros(DIM)
+            vector[BID_SLICE] = np.bincount(bid_bins[rows], minlength=8)
+            vector[LATENCY_SLICE] = np.bincount(latency_bins[rows], minlength=8)
+            vector[SLASH_SLOT] = slashes[rows].sum()
+            vector[DIFF_SLICE] = np.bincount(diff_bins[rows], minlength=DIFF_BINS)
+            vector[HOUR_SLICE] = np.bincount(hours[rows], minlength=HOURS)
+            vector[TOTAL_SLOT] = rows.sum()
+            counts[f"{role}:{address}"] = vector
+    return counts
+
+
+def to_vector(counts: np.ndarray) -> np.ndarray:
+    """
+    Normalize raw counts into a behaviour vector: histograms become distributions, the slash count a
+    rate and the total a log-scaled activity level.
+    """
+    total = max(counts[TOTAL_SLOT], 1.0)
+    vector = counts / total
+    vector[TOTAL_SLOT] = min(1.0, math.log10(1 + counts[TOTAL_SLOT]) / 6)
+    return vector.astype(np.float32)
+
+
+def _profiles_table(ids: list[str], counts: list[np.ndarray]) -> pa.Table:
+    roles, addresses = zip(*(i.split(":", 1) for i in ids))
+    flat_counts = np.concatenate(counts).astype(np.float64)
+    flat_vectors = np.concatenate([to_vector(c) for c in counts])
+    return pa.table({
+        "id": pa.array(ids),
+        "role": pa.array(roles),
+        "address": pa.array(addresses),
+        "commitments": pa.array([int(c[TOTAL_SLOT]) for c in counts], pa.int64()),
+        "counts": pa.FixedSizeListArray.from_arrays(pa.array(flat_counts), DIM),
+        "vector": pa.FixedSizeListArray.from_arrays(pa.array(flat_vectors, pa.float32()), DIM),
+    })
+
+
+class ProfileStore:
+    """
+    Per-bidder and per-provider behaviour vectors in a Lance table with an IVF-PQ index. Vectors are
+    derived from additive counts stored next to them, so `update()` only touches the participants of
+    a new batch. The features of every commitment counted are recorded in `<name>__commitments`, keyed
+    by commitmentIndex, so a replayed row is not counted twice and a changed row replaces its old counts.
+    """
+
+    def __init__(self, db: DBConnection, name: str = PROFILES_TABLE_NAME) -> None:
+        self.db: DBConnection = db
+        self.name: str = name
+        self.applied_name: str = f"{name}__commitments"
+        self._lock: TableLock = TableLock(db.uri, name)
+
+    def _open(self, name: Optional[str] = None):
+        try:
+            return self.db.open_table(name or self.name)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def exists(self) -> bool:
+        """
+        Whether the profiles have been built. Profiles from before commitments were recorded count as missing.
+        """
+        return self._open() is not None and self._open(self.applied_name) is not None
+
+    def rebuild(self, commits_l1_df: pl.DataFrame) -> int:
+        """
+        Replace every profile with ones counted from `commits_l1_df`, the full commitments_l1 table.
+        Returns the number of profiles written.
+        """
+        with self._lock:
+            for table in (self.name, self.applied_name):
+                if self._open(table) is not None:
+                    self.db.drop_table(table)
+            return self.update(commits_l1_df)
+
+    def update(self, commits_l1_df: pl.DataFrame) -> int:
+        """
+        Add a batch of commitments to the profiles of the participants involved. Commitments counted
+        before, e.g. before their L1 inclusion was backfilled, have their earlier counts removed first,
+        so replaying a batch changes nothing. Returns the number of profiles written.
+        """
+        rows = (
+            commits_l1_df.select([pl.col(column).cast(dtype) for column, dtype in FEATURE_SCHEMA.items()])
+            .unique(subset="commitmentIndex", keep="last", maintain_order=True)
+        )
+        if rows.is_empty():
+            return 0
+        # counts are read, added to and written back, so concurrent updates are serialized
+        with self._lock:
+            batch = count_features(rows)
+            previous = self._applied(rows["commitmentIndex"].to_list())
+            if previous is not None:
+                for participant, counts in count_features(previous).items():
+                    batch[participant] = batch.get(participant, np.zeros(DIM)) - counts
+            batch = {participant: counts for participant, counts in batch.items() if counts.any()}
+            written = retry_on_conflict(lambda: self._merge(batch), f"update of {self.name}") if batch else 0
+            retry_on_conflict(lambda: self._record(rows), f"update of {self.applied_name}")
+            if written:
+                retry_on_conflict(lambda: self._maintain_index(self._open()), f"indexing of {self.name}")
+        return written
+
+    def _applied(self, indexes: list[str]) -> Optional[pl.DataFrame]:
+        tbl = self._open(self.applied_name)
+        if tbl is None:
+            return None
+        chunks = []
+        for start in range(0, len(indexes), KEY_FILTER_CHUNK):
+            quoted = ", ".join(f"'{i}'" for i in indexes[start:start + KEY_FILTER_CHUNK])
+            # quoted: Lance folds unquoted identifiers to lower case
+            chunks.append(pl.from_arrow(tbl.to_lance().to_table(filter=f"`commitmentIndex` IN ({quoted})")))
+        previous = pl.concat(chunks)
+        return previous if not previous.is_empty() else None
+
+    def _record(self, rows: pl.DataFrame) -> None:
+        tbl = self._open(self.applied_name)
+        if tbl is None:
+            self.db.create_table(name=self.applied_name, data=rows.to_arrow())
+            return
+        tbl.merge_insert("`commitmentIndex`").when_matched_update_all().when_not_matched_insert_all().execute(rows.to_arrow())
+
+    def _merge(self, batch: dict[str, np.ndarray]) -> int:
+        batch = dict(batch)
+        tbl = self._open()
+        if tbl is not None:
+            quoted = ", ".join(f"'{i}'" for i in batch)
+            existing = tbl.to_lance().to_table(columns=["id", "counts"], filter=f"id IN ({quoted})").to_pylist()
+            for row in existing:
+                batch[row["id"]] = batch[row["id"]] + np.array(row["counts"])
+
+        data = _profiles_table(list(batch), list(batch.values()))
+        if tbl is None:
+            self.db.create_table(name=self.name, data=data)
+        else:
+            tbl.merge_insert("id").when_matched_update_all().when_not_matched_insert_all().execute(data)
+        return data.num_rows
+
+    def _maintain_index(self, tbl) -> None:
+        dataset = tbl.to_lance()
+        rows = dataset.count_rows()
+        if any("vector" in idx["fields"] for idx in dataset.list_indices()):
+            dataset.optimize.optimize_indices()  # add updated profiles to the index
+        elif rows >= PROFILE_INDEX_MIN_ROWS:
+            tbl.create_index(
+                metric="cosine",
+                vector_column_name="vector",
+                num_partitions=max(1, int(math.sqrt(rows))),
+                num_sub_vectors=DIM // 4,
+            )
+            logger.info(f"Built IVF-PQ index on {self.name} with {rows} profiles")
+
+    def similar(self, address: str, role: str = "commiter", k: int = 10) -> Optional[pl.DataFrame]:
+        """
+        The `k` participants of the same role whose behaviour is closest to `address` (in any case), with
+        their cosine distance. Returns None if the address has no profile.
+        """
+        tbl = self._open()
+        if tbl is None:
+            return None
+        address = address.lower()
+        profile = tbl.to_lance().to_table(columns=["vector"], filter=f"id = '{role}:{address}'").to_pylist()
+        if not profile:
+            return None
+        results = (
+            tbl.search(profile[0]["vector"], vector_column_name="vector")
+            .metric("cosine")
+            .where(f"role = '{role}' AND address != '{address}'", prefilter=True)
+            .select(["address", "role", "commitments"])
+            .limit(k)
+            .to_arrow()
+        )
+        return pl.from_arrow(results)
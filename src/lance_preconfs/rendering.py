@@ -0,0 +1,114 @@
+from typing import Optional
+
+import numpy as np
+import polars as pl
+
+from lance_preconfs.config import CHART_MAX_POINTS, CHART_TOP_K
+from lance_preconfs.preconf_db import PreconfDB
+
+OTHER: str = "other"
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the visual shape of the
+    series. `x` must be sorted.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    bucket = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        # the next bucket's centroid is the third corner of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample(df: pl.DataFrame, x: str, y: str, max_points: int = CHART_MAX_POINTS, by: Optional[str] = None) -> pl.DataFrame:
+    """
+    Downsample a scatter series to at most `max_points` rows with LTTB, per `by` group if given.
+    """
+    df = df.drop_nulls([x, y]).sort(x)
+    if df.height <= max_points:
+        return df
+    if by is not None:
+        groups = df.partition_by(by, maintain_order=True)
+        return pl.concat([
+            downsample(group, x, y, max(3, max_points * group.height // df.height)) for group in groups
+        ])
+
+    x_values = df[x].to_physical().cast(pl.Float64).to_numpy()
+    y_values = df[y].cast(pl.Float64).to_numpy()
+    return df[lttb_indices(x_values, y_values, max_points)]
+
+
+def time_buckets(df: pl.DataFrame, time_col: str, every: str, by: Optional[str] = None) -> pl.DataFrame:
+    """
+    Row counts per time bucket (and per `by` value), so charts receive one row per bar.
+    """
+    keys = [time_col] if by is None else [time_col, by]
+    return (
+        df.with_columns(pl.col(time_col).dt.truncate(every))
+        .group_by(keys)
+        .agg(pl.len().alias("count"))
+        .sort(keys)
+    )
+
+
+def top_k(df: pl.DataFrame, category: str, value: str, k: int = CHART_TOP_K, rank_by: Optional[str] = None) -> pl.DataFrame:
+    """
+    Keep the `k` categories with the largest total of `rank_by` (default `value`) and sum the rest into
+    a single "other" category. Remaining columns are used as extra grouping keys.
+    """
+    rank_by = value if rank_by is None else rank_by
+    top = (
+        df.group_by(category)
+        .agg(pl.col(rank_by).sum())
+        .sort(rank_by, descending=True)
+        .head(k)[category]
+    )
+    keys = [c for c in df.columns if c not in (category, value) and c != rank_by]
+    return (
+        df.with_columns(
+            pl.when(pl.col(category).is_in(top)).then(pl.col(category)).otherwise(pl.lit(OTHER)).alias(category)
+        )
+        .group_by([category, *keys])
+        .agg(pl.col(value).sum())
+        .sort(value, descending=True)
+    )
+
+
+def count_rows(db: PreconfDB, view: str, where: str = "TRUE", params: Optional[dict] = None) -> int:
+    """
+    Number of rows of `view` matching `where`.
+    """
+    return db.sql(f"SELECT count(*) FROM {view} WHERE {where}", params).item()
+
+
+def page(
+    db: PreconfDB,
+    view: str,
+    page_number: int,
+    page_size: int,
+    where: str = "TRUE",
+    params: Optional[dict] = None,
+    order_by: str = "datetime DESC",
+) -> pl.DataFrame:
+    """
+    One page (1-based) of `view`, read from DuckDB so only that page is materialized and sent to the client.
+    """
+    params = dict(params or {}, limit=page_size, offset=max(0, page_number - 1) * page_size)
+    return db.sql(
+        f"SELECT * FROM {view} WHERE {where} ORDER BY {order_by} LIMIT $limit OFFSET $offset", params
+    )
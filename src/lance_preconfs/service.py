@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import itertools
+import logging
+import signal
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.commitments import run_commitments_cycle
+from lance_preconfs.config import (
+    COMMITMENTS_INTERVAL,
+    DEFAULT_NETWORK,
+    ENABLED_NETWORKS,
+    LOG_FORMAT,
+    MEV_BOOST_INTERVAL,
+    NETWORKS,
+    PROMOTION_INTERVAL,
+    SNAPSHOT_INTERVAL,
+    NetworkConfig,
+)
+from lance_preconfs.mev_boost import run_mev_boost_cycle
+from lance_preconfs.snapshots import write_snapshot
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_GRACE: int = 60  # Time running cycles get to finish after a shutdown signal (in seconds)
+
+
+@dataclass
+class ServiceTask:
+    """
+    A periodic ingestion task. `cycle` runs once per iteration and the next iteration is scheduled
+    `interval` seconds after it finishes. When several tasks are due at once, the lowest `priority`
+    value runs first.
+    """
+    name: str
+    cycle: Callable[[SharedClients], Awaitable[None]]
+    interval: float
+    priority: int = 0
+
+
+async def run_promotion_cycle(clients: SharedClients) -> None:
+    """
+    Promote finalized rows from every hot table to its cold storage, then compact the changed cold
+    partitions and apply the retention policy.
+    """
+    for table in clients.tables:
+        try:
+            promoted = await asyncio.to_thread(table.promote)
+            if promoted:
+                logger.info(f"Promoted {promoted} rows from {table.hot_name} to {table.name}")
+            await asyncio.to_thread(table.compact)
+        except Exception as e:
+            logger.error(f"Error promoting {table.hot_name}: {e}")
+
+
+async def run_snapshot_cycle(clients: SharedClients) -> None:
+    """
+    Write a snapshot of the dashboard-ready frames for the dashboard to memory-map on startup.
+    """
+    try:
+        await asyncio.to_thread(write_snapshot, clients.uri, clients.db)
+    except Exception as e:
+        logger.error(f"Error writing dashboard snapshot: {e}")
+
+
+COMMITMENTS_TASK = ServiceTask(name="commitments", cycle=run_commitments_cycle, interval=COMMITMENTS_INTERVAL, priority=0)
+MEV_BOOST_TASK = ServiceTask(name="mev_boost", cycle=run_mev_boost_cycle, interval=MEV_BOOST_INTERVAL, priority=1)
+PROMOTION_TASK = ServiceTask(name="promotion", cycle=run_promotion_cycle, interval=PROMOTION_INTERVAL, priority=2)
+SNAPSHOT_TASK = ServiceTask(name="snapshot", cycle=run_snapshot_cycle, interval=SNAPSHOT_INTERVAL, priority=3)
+SOURCE_TASKS: dict[str, ServiceTask] = {"commitments": COMMITMENTS_TASK, "mev_boost": MEV_BOOST_TASK}
+
+
+def tasks_for(network: NetworkConfig, sources: Optional[list[str]] = None) -> list[ServiceTask]:
+    """
+    Ingestion tasks for `sources` of `network` (all of its sources by default) plus hot/cold promotion
+    of the tables those tasks write. The process running the network's first source also writes the
+    dashboard snapshots.
+    """
+    sources = network.sources if sources is None else sources
+    tasks = [SOURCE_TASKS[source] for source in sources] + [PROMOTION_TASK]
+    if network.sources and network.sources[0] in sources:
+        tasks.append(SNAPSHOT_TASK)
+    return tasks
+
+
+class Supervisor:
+    """
+    Runs ingestion tasks as coroutines on one event loop with shared clients. Due tasks are pulled
+    from a priority queue by `max_concurrency` workers. On SIGINT/SIGTERM no new cycles start,
+    running cycles get `shutdown_grace` seconds to finish and pending writes are flushed.
+    """
+
+    def __init__(
+        self,
+        tasks: list[ServiceTask],
+        clients: Optional[SharedClients] = None,
+        max_concurrency: int = 2,
+        shutdown_grace: float = SHUTDOWN_GRACE,
+    ) -> None:
+        self.tasks: list[ServiceTask] = tasks
+        self.clients: SharedClients = clients if clients is not None else SharedClients()
+        self.max_concurrency: int = max_concurrency
+        self.shutdown_grace: float = shutdown_grace
+        self._seq = itertools.count()
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._ready: Optional[asyncio.PriorityQueue] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def stop(self) -> None:
+        """
+        Request a graceful shutdown.
+        """
+        if self._stop is not None and not self._stop.is_set():
+            logger.info("Shutdown requested")
+            self._stop.set()
+
+    def _enqueue(self, task: ServiceTask) -> None:
+        self._timers.pop(task.name, None)
+        self._ready.put_nowait((task.priority, next(self._seq), task))
+
+    def _schedule(self, task: ServiceTask, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._timers[task.name] = loop.call_later(delay, self._enqueue, task)
+
+    async def _run_cycle(self, task: ServiceTask) -> None:
+        start = time.monotonic()
+        try:
+            await task.cycle(self.clients)
+        except Exception as e:
+            logger.error(f"An error occurred in task {task.name}: {e}")
+        logger.info(f"Task {task.name} cycle finished in {time.monotonic() - start:.2f}s")
+
+    async def _worker(self) -> None:
+        while not self._stop.is_set():
+            get = asyncio.ensure_future(self._ready.get())
+            stop = asyncio.ensure_future(self._stop.wait())
+            done, _ = await asyncio.wait({get, stop}, return_when=asyncio.FIRST_COMPLETED)
+            stop.cancel()
+            if self._stop.is_set():
+                get.cancel()
+                break
+
+            _, _, task = get.result()
+            await self._run_cycle(task)
+            if not self._stop.is_set():
+                self._schedule(task, task.interval)
+
+    async def run(self) -> None:
+        """
+        Run every task until a shutdown is requested.
+        """
+        loop = asyncio.get_running_loop()
+        self._ready = asyncio.PriorityQueue()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread or not supported on this platform
+
+        for task in self.tasks:
+            self._enqueue(task)
+        logger.info(f"Starting tasks: {', '.join(task.name for task in self.tasks)}")
+        workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_concurrency)]
+
+        await self._stop.wait()
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+        _, pending = await asyncio.wait(workers, timeout=self.shutdown_grace)
+        for worker in pending:
+            logger.warning("Cancelling a cycle that did not finish within the shutdown grace period")
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await self.clients.flush()
+        logger.info("Service stopped")
+
+
+def run_tasks(tasks: list[ServiceTask], network: NetworkConfig = NETWORKS[DEFAULT_NETWORK], log_format: str = LOG_FORMAT) -> None:
+    """
+    Run `tasks` for `network` in one service process until interrupted.
+    """
+    logging.basicConfig(level=logging.INFO, format=log_format)
+    asyncio.run(Supervisor(tasks, clients=SharedClients(network)).run())
+
+
+def run_networks(networks: list[str], processes: bool = False) -> None:
+    """
+    Ingest `networks`. A single network runs every ingester on one event loop; several networks (or
+    `processes`) run each (network, source) pair in its own worker process.
+    """
+    if len(networks) == 1 and not processes:
+        run_tasks(tasks_for(NETWORKS[networks[0]]), network=NETWORKS[networks[0]])
+    else:
+        from lance_preconfs.workers import run_workers
+        run_workers(networks)
+
+
+def main() -> None:
+    """
+    Run the ingestion service; the same as `lance-preconfs ingest`.
+    """
+    parser = argparse.ArgumentParser(description="Run the lance-preconfs ingestion service.")
+    parser.add_argument('--network', action='append', choices=sorted(NETWORKS), dest='networks',
+                        help=f"Network to ingest, repeatable (default: {', '.join(ENABLED_NETWORKS)})")
+    parser.add_argument('--processes', action='store_true', help="Run each (network, source) pair in its own process")
+    args = parser.parse_args()
+    run_networks(args.networks or ENABLED_NETWORKS, processes=args.processes)
+
+
+if __name__ == "__main__":
+    main()
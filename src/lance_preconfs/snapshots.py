@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from typing import Optional
+
+import lancedb
+import polars as pl
+import pyarrow as pa
+from lancedb import DBConnection
+
+from lance_preconfs import analytics
+from lance_preconfs.config import (
+    COMMITMENT_TABLE_NAME,
+    COMMITMENTS_L1_TABLE_NAME,
+    LOG_FORMAT,
+    MEV_BOOST_TABLE_NAME,
+    SNAPSHOT_DIR,
+    SNAPSHOT_KEEP,
+    SNAPSHOT_MAX_AGE,
+    URI,
+)
+from lance_preconfs.notifications import WriteNotifier
+from lance_preconfs.tiers import open_tiered
+
+logger = logging.getLogger(__name__)
+
+LATEST: str = "LATEST"  # file naming the current snapshot version
+MANIFEST: str = "manifest.json"
+
+
+def _read(db: DBConnection, uri: str, name: str) -> Optional[pl.DataFrame]:
+    try:
+        return pl.from_arrow(open_tiered(name, uri=uri, db=db).to_arrow())
+    except FileNotFoundError:
+        return None
+
+
+def dashboard_frames(uri: str = URI, db: Optional[DBConnection] = None) -> tuple[dict[str, pl.DataFrame], dict[str, str]]:
+    """
+    Compute the dashboard-ready frames from the Lance tables, skipping those whose tables are missing.
+    Returns the frames and the version of each table they were computed from.
+    """
+    db = db if db is not None else lancedb.connect(uri)
+    versions = {
+        name: open_tiered(name, uri=uri, db=db).version()
+        for name in (COMMITMENT_TABLE_NAME, COMMITMENTS_L1_TABLE_NAME, MEV_BOOST_TABLE_NAME)
+    }
+    frames: dict[str, pl.DataFrame] = {}
+
+    commitments = _read(db, uri, COMMITMENT_TABLE_NAME)
+    if commitments is not None:
+        frames["commit_df"] = analytics.prepare_commitments(commitments)
+
+    commits_l1 = _read(db, uri, COMMITMENTS_L1_TABLE_NAME)
+    if commits_l1 is not None:
+        commits_l1_df = commits_l1.sort(by="datetime", descending=True)
+        frames["commits_l1_df"] = commits_l1_df
+        frames["slash_rate_df"] = analytics.slash_rates(commits_l1_df)
+        frames["bidder_group_df"] = analytics.bidder_stats(commits_l1_df)
+
+    mev_boost_blocks = _read(db, uri, MEV_BOOST_TABLE_NAME)
+    if mev_boost_blocks is not None:
+        frames["mev_boost_relay_transformed_df"] = analytics.prepare_mev_boost(mev_boost_blocks)
+
+    return frames, versions
+
+
+def write_snapshot(uri: str = URI, db: Optional[DBConnection] = None) -> Optional[str]:
+    """
+    Write the dashboard frames as Arrow IPC files under `<uri>/snapshots/<version>/` and point
+    `<uri>/snapshots/LATEST` at them. Files are complete before the pointer moves, and only the newest
+    SNAPSHOT_KEEP versions are kept. Returns the new version, or None if there was nothing to write.
+    """
+    # events after this id may not be in the frames; the dashboard applies them on top of the snapshot
+    notification_id = WriteNotifier(uri).latest_id()
+    frames, table_versions = dashboard_frames(uri, db)
+    if not frames:
+        return None
+
+    root = os.path.join(uri, SNAPSHOT_DIR)
+    version = str(time.time_ns())
+    tmp_dir = os.path.join(root, f".{version}.tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    for name, frame in frames.items():
+        table = frame.to_arrow()
+        # uncompressed so readers can memory-map the buffers instead of decoding them
+        with pa.OSFile(os.path.join(tmp_dir, f"{name}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    with open(os.path.join(tmp_dir, MANIFEST), "w") as f:
+        json.dump(
+            {
+                "version": version,
+                "created_at": time.time(),
+                "frames": sorted(frames),
+                "tables": table_versions,
+                "notification_id": notification_id,
+            },
+            f,
+        )
+    os.replace(tmp_dir, os.path.join(root, version))
+
+    latest_tmp = os.path.join(root, f"{LATEST}.tmp")
+    with open(latest_tmp, "w") as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(root, LATEST))
+
+    for old in sorted(entry for entry in os.listdir(root) if entry.isdigit())[:-SNAPSHOT_KEEP]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    logger.info(f"Wrote dashboard snapshot {version}: {', '.join(sorted(frames))}")
+    return version
+
+
+def snapshot_manifest(uri: str = URI) -> Optional[dict]:
+    """
+    Manifest of the latest snapshot, or None if there is none.
+    """
+    root = os.path.join(uri, SNAPSHOT_DIR)
+    try:
+        with open(os.path.join(root, LATEST)) as f:
+            version = f.read().strip()
+        with open(os.path.join(root, version, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def load_snapshot(
+    uri: str = URI, max_age: float = SNAPSHOT_MAX_AGE, manifest: Optional[dict] = None
+) -> Optional[dict[str, pl.DataFrame]]:
+    """
+    Memory-map the frames of the latest snapshot, or of the one `manifest` describes. Returns None when
+    there is no snapshot or it is older than `max_age` seconds, in which case the caller computes its
+    frames live.
+    """
+    manifest = manifest if manifest is not None else snapshot_manifest(uri)
+    if manifest is None:
+        return None
+    version = manifest["version"]
+    age = time.time() - manifest["created_at"]
+    if age > max_age:
+        logger.info(f"Dashboard snapshot {version} is stale ({age:.0f}s old)")
+        return None
+
+    frames: dict[str, pl.DataFrame] = {}
+    for name in manifest["frames"]:
+        source = pa.memory_map(os.path.join(uri, SNAPSHOT_DIR, version, f"{name}.arrow"), "r")
+        frames[name] = pl.from_arrow(pa.ipc.open_file(source).read_all())
+    return frames
+
+
+if __name__ == "__main__":
+    # periodic job: python -m lance_preconfs.snapshots [uri]
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    write_snapshot(sys.argv[1] if len(sys.argv) > 1 else URI)
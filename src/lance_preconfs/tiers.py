@@ -0,0 +1,301 @@
+import datetime
+import logging
+import os
+from typing import Callable, Optional, TypeVar
+
+import lancedb
+import polars as pl
+import pyarrow as pa
+from lancedb import DBConnection
+from lancedb_tables.lance_table import LanceTable
+
+from lance_preconfs.config import (
+    CONFIRMATION_DEPTHS,
+    HOT_TABLE_SUFFIX,
+    INDEX,
+    PENDING_COLUMNS,
+    PENDING_MAX_BLOCKS,
+    TABLE_INDEXES,
+    TABLE_KEYS,
+    URI,
+)
+from lance_preconfs.coordination import TableLock, retry_on_conflict
+from lance_preconfs.partitions import PartitionedTable, open_partitioned
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TieredTable:
+    """
+    A chain table split by finality. Blocks within `confirmation_depth` of the newest block seen are
+    upserted into a small mutable hot table; finalized blocks are appended to the partitioned cold
+    storage, which is never rewritten, so it can be compacted and indexed freely.
+    Reads go through `to_arrow()`, which covers both tiers.
+
+    Tables with a unique `key` are merged on it instead of the block column and can be updated in place
+    with `update_hot()`. Rows with a null `pending_column` stay hot for up to `pending_blocks` past
+    finality so late data can still be filled in.
+
+    Writes, promotion and retention hold the table's advisory `TableLock`, so any number of threads and
+    processes can write to the same table. Each attempt starts from the latest committed state, and a
+    Lance commit conflict is retried instead of dropping the batch.
+    """
+
+    def __init__(
+        self,
+        db: DBConnection,
+        uri: str,
+        name: str,
+        confirmation_depth: int,
+        index: str = INDEX,
+        key: Optional[str] = None,
+        pending_column: Optional[str] = None,
+        pending_blocks: int = PENDING_MAX_BLOCKS,
+    ) -> None:
+        self.db: DBConnection = db
+        self.uri: str = uri
+        self.name: str = name
+        self.hot_name: str = f"{name}{HOT_TABLE_SUFFIX}"
+        self.confirmation_depth: int = confirmation_depth
+        self.index: str = index
+        self.key: Optional[str] = key
+        self.pending_column: Optional[str] = pending_column
+        self.pending_blocks: int = pending_blocks
+        self.lance_tables: LanceTable = LanceTable()
+        self.cold: PartitionedTable = open_partitioned(db, uri, name)
+        self._lock: TableLock = TableLock(uri, name)
+
+    def _open(self, table: str):
+        try:
+            return self.db.open_table(table)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _hot_max(self) -> Optional[int]:
+        tbl = self._open(self.hot_name)
+        if tbl is None:
+            return None
+        return pl.from_arrow(tbl.to_lance().to_table(columns=[self.index]))[self.index].max()
+
+    def cold_max(self) -> Optional[int]:
+        """
+        Newest block in the cold storage, read from its partition manifest.
+        """
+        return self.cold.max_block()
+
+    def latest_block(self) -> Optional[int]:
+        """
+        Newest block across both tiers.
+        """
+        blocks = [block for block in (self._hot_max(), self.cold_max()) if block is not None]
+        return max(blocks) if blocks else None
+
+    def version(self) -> str:
+        """
+        Token that changes whenever either tier changes: the hot table version and the cold manifest mtime.
+        """
+        hot = self._open(self.hot_name)
+        hot_version = hot.version if hot is not None else -1
+        manifest = self.cold.manifest_path
+        cold_version = os.stat(manifest).st_mtime_ns if os.path.exists(manifest) else -1
+        return f"{hot_version}.{cold_version}"
+
+    def _coordinated(self, operation: Callable[[], T], action: str) -> T:
+        """
+        Run `operation` holding the table's write lock, after re-reading the cold manifest that another
+        process may have changed, and retry it on commit conflicts.
+        """
+        with self._lock:
+            self.cold.reload()
+            return retry_on_conflict(operation, f"{action} of {self.name}", rebase=self.cold.reload)
+
+    def _final(self, finality: int) -> pl.Expr:
+        final = pl.col(self.index) <= finality
+        if self.pending_column is not None:
+            final = final & (
+                pl.col(self.pending_column).is_not_null() | (pl.col(self.index) <= finality - self.pending_blocks)
+            )
+        return final
+
+    def _final_filter(self, finality: int) -> str:
+        final = f"{self.index} <= {finality}"
+        if self.pending_column is not None:
+            final = f"{final} AND ({self.pending_column} IS NOT NULL OR {self.index} <= {finality - self.pending_blocks})"
+        return final
+
+    def _append_cold(self, data: pl.DataFrame) -> int:
+        if data.is_empty():
+            return 0
+        if self.key is None:
+            # a block is always appended whole, so skip the blocks of the batch the cold storage already has;
+            # an old batch can still bring blocks below the cold watermark that are not there yet
+            existing = self.cold.to_arrow(
+                columns=[self.index], from_block=data[self.index].min(), to_block=data[self.index].max() + 1
+            )
+            if existing is not None and existing.num_rows:
+                data = data.filter(~pl.col(self.index).is_in(pl.from_arrow(existing)[self.index].unique()))
+        else:
+            # rows held back as pending can be older than the cold watermark, so dedupe on the key, reading
+            # only the partitions that cover the batch; an anti-join keeps a rebuild of the whole history cheap
+            existing = self.cold.to_arrow(columns=[self.key], from_block=data[self.index].min())
+            if existing is not None and existing.num_rows:
+                data = data.join(pl.from_arrow(existing).unique(), on=self.key, how="anti")
+        return self.cold.append(data.sort(self.index))
+
+    def write(self, data: pl.DataFrame) -> None:
+        """
+        Upsert unfinalized rows into the hot table and append finalized rows to the cold storage.
+        """
+        if data.is_empty():
+            return
+        self._coordinated(lambda: self._write(data), "write")
+
+    def _write(self, data: pl.DataFrame) -> None:
+        head = self.latest_block()
+        batch_head = data[self.index].max()
+        head = batch_head if head is None else max(head, batch_head)
+        finality = head - self.confirmation_depth
+
+        finalized = data.filter(self._final(finality))
+        recent = data.filter(~self._final(finality))
+        if not finalized.is_empty():
+            # hot rows that are final at this head go first, so cold appends stay in block order
+            self._promote_final(finality)
+        if not recent.is_empty():
+            if self.key is None:
+                self.lance_tables.write_table(uri=self.uri, table=self.hot_name, data=recent, merge_on=self.index)
+            else:
+                self._merge_hot(recent, update=False)
+        if not finalized.is_empty():
+            self._append_cold(finalized)
+
+    def promote(self) -> int:
+        """
+        Move rows that became final from the hot table to the cold storage. Returns the number of rows
+        appended. The append happens before the delete and skips blocks already in the cold storage,
+        so an interrupted promotion is completed by the next one without duplicates.
+        """
+        return self._coordinated(self._promote, "promotion")
+
+    def _promote(self) -> int:
+        head = self.latest_block()
+        if head is None:
+            return 0
+        return self._promote_final(head - self.confirmation_depth)
+
+    def _promote_final(self, finality: int) -> int:
+        hot = self._open(self.hot_name)
+        if hot is None:
+            return 0
+        hot_df = pl.from_arrow(hot.to_lance().to_table())
+        if hot_df.is_empty():
+            return 0
+
+        finalized = hot_df.filter(self._final(finality))
+        if finalized.is_empty():
+            return 0
+
+        promoted = self._append_cold(finalized)
+        hot.delete(self._final_filter(finality))
+        return promoted
+
+    def hot_rows(self, filter: Optional[str] = None) -> Optional[pl.DataFrame]:
+        """
+        Rows of the hot table matching `filter`, or None if there is no hot table.
+        """
+        hot = self._open(self.hot_name)
+        if hot is None:
+            return None
+        return pl.from_arrow(hot.to_lance().to_table(filter=filter))
+
+    def update_hot(self, data: pl.DataFrame) -> None:
+        """
+        Replace hot rows that share a key with `data` and insert the others.
+        """
+        if self.key is None:
+            raise ValueError(f"Table {self.name} has no row key")
+        if data.is_empty():
+            return
+        self._coordinated(lambda: self._update_hot(data), "hot update")
+
+    def _update_hot(self, data: pl.DataFrame) -> None:
+        self._merge_hot(data, update=True)
+
+    def _merge_hot(self, data: pl.DataFrame, update: bool) -> None:
+        hot = self._open(self.hot_name)
+        if hot is None:
+            self.db.create_table(name=self.hot_name, data=data.to_arrow())
+            return
+        # Lance folds unquoted identifiers to lower case, so camelCase keys such as commitmentIndex are quoted
+        merge = hot.merge_insert(f"`{self.key}`")
+        if update:
+            merge = merge.when_matched_update_all()
+        merge.when_not_matched_insert_all().execute(data)
+
+    def compact(self) -> None:
+        """
+        Compact and index the cold partitions that changed, then apply the retention policy. Compaction
+        runs without the write lock, which is held only to record the result and for one retention move
+        at a time, so writers never wait for more than a single step of maintenance.
+        """
+        with self._lock:
+            self.cold.reload()
+            pending = self.cold.uncompacted()
+        for partition in pending:
+            retry_on_conflict(lambda: self.cold.compact_table(partition.table), f"compaction of {partition.table}")
+        if pending:
+            self._coordinated(lambda: self.cold.mark_compacted(pending), "compaction")
+
+        moved = 0
+        while step := self._coordinated(lambda: self.cold.apply_retention(limit=1), "retention"):
+            moved += step
+        if moved:
+            retry_on_conflict(
+                lambda: self.cold.compact_table(self.cold.archive_name), f"compaction of {self.cold.archive_name}"
+            )
+            logger.info(f"Retention moved {moved} partitions of {self.name}")
+
+    def to_arrow(
+        self,
+        columns: Optional[list[str]] = None,
+        filter: Optional[str] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> pa.Table:
+        """
+        Read both tiers as one Arrow table. `columns` and `filter` are pushed down into each Lance scan, and
+        a block window `[from_block, to_block)` or time window `[start, end)` opens only the overlapping
+        cold partitions.
+        """
+        tables = []
+        cold = self.cold.to_arrow(columns, filter, from_block, to_block, start, end)
+        if cold is not None:
+            tables.append(cold)
+        hot = self._open(self.hot_name)
+        if hot is not None:
+            expression = self.cold.window_filter(filter, from_block, to_block, start, end)
+            tables.append(hot.to_lance().to_table(columns=columns, filter=expression))
+        if not tables:
+            raise FileNotFoundError(f"Table {self.name} does not exist")
+        return pa.concat_tables(tables, promote_options="default")
+
+
+def open_tiered(name: str, uri: str = URI, db: Optional[DBConnection] = None) -> TieredTable:
+    """
+    Open the tiered view of `name` with its configured confirmation depth, block column, key and pending column.
+    """
+    if db is None:
+        db = lancedb.connect(uri)
+    return TieredTable(
+        db=db,
+        uri=uri,
+        name=name,
+        confirmation_depth=CONFIRMATION_DEPTHS[name],
+        index=TABLE_INDEXES.get(name, INDEX),
+        key=TABLE_KEYS.get(name),
+        pending_column=PENDING_COLUMNS.get(name),
+    )
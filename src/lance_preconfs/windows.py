@@ -0,0 +1,234 @@
+import datetime
+import json
+import logging
+import os
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import polars as pl
+from lancedb import DBConnection
+
+from lance_preconfs.config import (
+    SLASH_HISTORY_TABLE_NAME,
+    SLASH_WINDOW_BUCKET_SECONDS,
+    SLASH_WINDOWS,
+    SLASH_WINDOWS_FILE,
+)
+
+logger = logging.getLogger(__name__)
+
+ALL: str = "__all__"  # key of the counts over every provider
+HISTORY_HOURS: int = 7 * 24  # hourly snapshots kept in memory per key
+
+
+class WindowedCounts:
+    """
+    Exact total/slashed counts over several sliding windows, kept in a ring buffer of time buckets.
+    Each window keeps a running sum that is updated when a bucket is added or falls out of the window,
+    so reading a window is O(1) and advancing time costs one step per elapsed bucket.
+    """
+
+    def __init__(self, windows: dict[str, int] = SLASH_WINDOWS, bucket_seconds: int = SLASH_WINDOW_BUCKET_SECONDS) -> None:
+        self.bucket_seconds: int = bucket_seconds
+        self.window_buckets: dict[str, int] = {name: seconds // bucket_seconds for name, seconds in windows.items()}
+        self.slots: int = max(self.window_buckets.values())
+        self.total = np.zeros(self.slots, dtype=np.int64)
+        self.slashed = np.zeros(self.slots, dtype=np.int64)
+        self.sums: dict[str, list[int]] = {name: [0, 0] for name in windows}
+        self.head: Optional[int] = None  # newest bucket number seen
+        # hour number -> {window: (total, slashed)}, for O(1) reads of past window values
+        self.history: dict[int, dict[str, tuple[int, int]]] = {}
+        self._history_order: deque = deque()
+
+    def _snapshot(self, hour: int) -> None:
+        if hour in self.history:
+            return
+        self.history[hour] = {name: (s[0], s[1]) for name, s in self.sums.items()}
+        self._history_order.append(hour)
+        while len(self._history_order) > HISTORY_HOURS:
+            del self.history[self._history_order.popleft()]
+
+    def advance(self, bucket: int) -> None:
+        """
+        Move the head to `bucket`, expiring buckets that left each window.
+        """
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+
+        buckets_per_hour = 3600 // self.bucket_seconds
+        first_hour = self.head // buckets_per_hour + 1
+        last_hour = bucket // buckets_per_hour
+        # only the newest HISTORY_HOURS snapshots are kept, so older hours of a long gap are skipped
+        for hour in range(max(first_hour, last_hour - HISTORY_HOURS + 1), last_hour + 1):
+            # values as of the start of each new hour: expired up to its last bucket, before anything newer is counted
+            self._expire(hour * buckets_per_hour - 1)
+            self._snapshot(hour)
+        self._expire(bucket)
+
+    def _expire(self, bucket: int) -> None:
+        if bucket <= self.head:
+            return
+        if bucket - self.head >= self.slots:
+            self.total[:] = 0
+            self.slashed[:] = 0
+            self.sums = {name: [0, 0] for name in self.sums}
+        else:
+            for name, size in self.window_buckets.items():
+                # buckets past the head were never counted; their slots still hold long-expired buckets
+                for expired in range(self.head - size + 1, min(bucket - size, self.head) + 1):
+                    slot = expired % self.slots
+                    self.sums[name][0] -= self.total[slot]
+                    self.sums[name][1] -= self.slashed[slot]
+            for reused in range(self.head + 1, bucket + 1):
+                self.total[reused % self.slots] = 0
+                self.slashed[reused % self.slots] = 0
+        self.head = bucket
+
+    def add(self, bucket: int, total: int, slashed: int) -> None:
+        """
+        Count `total` commitments, `slashed` of them slashed, in time bucket `bucket`.
+        """
+        self.advance(bucket)
+        if bucket <= self.head - self.slots:
+            return  # older than the longest window
+        slot = bucket % self.slots
+        self.total[slot] += total
+        self.slashed[slot] += slashed
+        for name, size in self.window_buckets.items():
+            if bucket > self.head - size:
+                self.sums[name][0] += total
+                self.sums[name][1] += slashed
+
+    def window(self, name: str) -> tuple[int, int]:
+        """
+        `(total, slashed)` over window `name` ending at the head.
+        """
+        return self.sums[name][0], self.sums[name][1]
+
+    def window_at(self, name: str, hour: int) -> Optional[tuple[int, int]]:
+        """
+        `(total, slashed)` over window `name` at the start of `hour` (epoch hours), if still kept.
+        """
+        snapshot = self.history.get(hour)
+        return snapshot[name] if snapshot is not None else None
+
+
+class SlashRateEngine:
+    """
+    Per-provider sliding-window slash counts fed by ingested commitment batches. Window values are
+    exact to the bucket size and read in O(1); `publish()` writes them where the dashboard and the
+    read API can pick them up without scanning history.
+    """
+
+    def __init__(self, windows: dict[str, int] = SLASH_WINDOWS, bucket_seconds: int = SLASH_WINDOW_BUCKET_SECONDS) -> None:
+        self.windows: dict[str, int] = windows
+        self.bucket_seconds: int = bucket_seconds
+        self.counts: dict[str, WindowedCounts] = {}
+        self._published_hour: Optional[int] = None
+
+    def _counts(self, key: str) -> WindowedCounts:
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = WindowedCounts(self.windows, self.bucket_seconds)
+            self.counts[key] = counts
+        return counts
+
+    def ingest(self, commitments_df: pl.DataFrame) -> None:
+        """
+        Add a batch of raw commitments (`timestamp` in ms, `commiter`, `isSlash`).
+        """
+        if commitments_df.is_empty():
+            return
+        buckets = (
+            commitments_df.select(
+                (pl.col("timestamp") // (1000 * self.bucket_seconds)).alias("bucket"),
+                pl.col("commiter"),
+                pl.col("isSlash").fill_null(False).cast(pl.Int64),
+            )
+            .group_by("bucket", "commiter")
+            .agg(pl.len().alias("total"), pl.col("isSlash").sum().alias("slashed"))
+            .sort("bucket")
+        )
+        for bucket, commiter, total, slashed in buckets.iter_rows():
+            self._counts(commiter).add(bucket, total, slashed)
+            self._counts(ALL).add(bucket, total, slashed)
+
+    def advance_to(self, now: datetime.datetime) -> None:
+        """
+        Expire counts up to wall-clock time `now`, so windows reflect quiet periods too.
+        """
+        bucket = int(now.timestamp()) // self.bucket_seconds
+        for counts in self.counts.values():
+            counts.advance(bucket)
+
+    def rates(self) -> pl.DataFrame:
+        """
+        Current `(commiter, window, total, slashed, slash_rate)` for every provider and for ALL.
+        """
+        rows = []
+        for key, counts in self.counts.items():
+            for name in self.windows:
+                total, slashed = counts.window(name)
+                rows.append((key, name, total, slashed, slashed / total if total else 0.0))
+        return pl.DataFrame(
+            rows, schema=["commiter", "window", "total", "slashed", "slash_rate"], orient="row"
+        )
+
+    def rate_at(self, key: str, name: str, when: datetime.datetime) -> Optional[float]:
+        """
+        Slash rate of window `name` for `key` at the start of the hour containing `when`.
+        """
+        counts = self.counts.get(key)
+        value = counts.window_at(name, int(when.timestamp()) // 3600) if counts is not None else None
+        if value is None:
+            return None
+        total, slashed = value
+        return slashed / total if total else 0.0
+
+    def warm_up(self, commitments_df: pl.DataFrame) -> None:
+        """
+        Rebuild the windows from stored commitments, e.g. the last 7 days after a restart.
+        """
+        self.ingest(commitments_df.sort("timestamp"))
+
+    def publish(self, uri: str, db: Optional[DBConnection] = None, now: Optional[datetime.datetime] = None) -> None:
+        """
+        Write the current window values to `<uri>/slash_rate_windows.json` and, once per hour, append them
+        to the slash_rate_history table.
+        """
+        now = now if now is not None else datetime.datetime.now(datetime.timezone.utc)
+        self.advance_to(now)
+        rates = self.rates()
+        os.makedirs(uri, exist_ok=True)
+        path = os.path.join(uri, SLASH_WINDOWS_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"as_of": now.isoformat(), "rates": rates.to_dicts()}, f)
+        os.replace(tmp_path, path)
+
+        hour = int(now.timestamp()) // 3600
+        if db is not None and hour != self._published_hour and not rates.is_empty():
+            history = rates.with_columns(pl.lit(datetime.datetime.fromtimestamp(hour * 3600, tz=datetime.timezone.utc)).alias("hour"))
+            try:
+                db.open_table(SLASH_HISTORY_TABLE_NAME).add(history.to_arrow())
+            except (FileNotFoundError, ValueError):
+                db.create_table(name=SLASH_HISTORY_TABLE_NAME, data=history.to_arrow())
+            self._published_hour = hour
+
+
+def read_windows(uri: str) -> Optional[pl.DataFrame]:
+    """
+    The window values last published by the ingester, or None if there are none yet.
+    """
+    path = os.path.join(uri, SLASH_WINDOWS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        published = json.load(f)
+    if not published["rates"]:
+        return None
+    return pl.DataFrame(published["rates"]).with_columns(pl.lit(published["as_of"]).alias("as_of"))
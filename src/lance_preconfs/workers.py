@@ -0,0 +1,94 @@
+import logging
+import multiprocessing
+import signal
+import time
+from typing import Optional
+
+from lance_preconfs.config import LOG_FORMAT, NETWORKS
+
+logger = logging.getLogger(__name__)
+
+RESTART_BACKOFF: float = 5.0  # Initial delay before restarting a crashed worker (in seconds)
+MAX_RESTART_BACKOFF: float = 300.0
+STOP_TIMEOUT: float = 90.0  # Time workers get to shut down gracefully before they are killed (in seconds)
+
+
+def worker_main(network_name: str, source: str) -> None:
+    """
+    Process entry point: ingest one source of one network with its own clients, watermark and tables,
+    running the tasks `tasks_for` assigns to that source.
+    """
+    from lance_preconfs.service import run_tasks, tasks_for
+
+    network = NETWORKS[network_name]
+    log_format = LOG_FORMAT.replace('%(levelname)s', f'{network_name}/{source} - %(levelname)s')
+    run_tasks(tasks_for(network, sources=[source]), network=network, log_format=log_format)
+
+
+class WorkerPool:
+    """
+    One process per (network, source) pair. Workers share nothing, so a slow or stuck network only
+    delays its own tables. Crashed workers are restarted with exponential backoff; on SIGINT/SIGTERM
+    every worker is asked to stop gracefully.
+    """
+
+    def __init__(self, pairs: list[tuple[str, str]]) -> None:
+        self.pairs: list[tuple[str, str]] = pairs
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: dict[tuple[str, str], multiprocessing.Process] = {}
+        self.backoff: dict[tuple[str, str], float] = {pair: RESTART_BACKOFF for pair in pairs}
+        self.restart_at: dict[tuple[str, str], float] = {}
+        self._stopping: bool = False
+
+    def _start(self, pair: tuple[str, str]) -> None:
+        process = self.context.Process(target=worker_main, args=pair, name=f"{pair[0]}-{pair[1]}")
+        process.start()
+        self.processes[pair] = process
+        logger.info(f"Started worker {process.name} (pid {process.pid})")
+
+    def stop(self, *_) -> None:
+        self._stopping = True
+
+    def _check(self, pair: tuple[str, str], now: float) -> None:
+        process: Optional[multiprocessing.Process] = self.processes.get(pair)
+        if process is not None and process.is_alive():
+            return
+        if process is not None:
+            logger.error(f"Worker {process.name} exited with code {process.exitcode}")
+            del self.processes[pair]
+            self.restart_at[pair] = now + self.backoff[pair]
+            self.backoff[pair] = min(MAX_RESTART_BACKOFF, self.backoff[pair] * 2)
+        if now >= self.restart_at.get(pair, 0):
+            self._start(pair)
+
+    def run(self) -> None:
+        """
+        Start every worker and keep them running until a shutdown signal arrives.
+        """
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        while not self._stopping:
+            now = time.monotonic()
+            for pair in self.pairs:
+                self._check(pair, now)
+            time.sleep(1)
+
+        logger.info("Stopping workers")
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()  # SIGTERM: the worker's supervisor finishes its cycle and flushes
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for process in self.processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Killing worker {process.name}")
+                process.kill()
+
+
+def run_workers(networks: list[str]) -> None:
+    """
+    Ingest every source of `networks`, one worker process per (network, source) pair.
+    """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    pairs = [(name, source) for name in networks for source in NETWORKS[name].sources]
+    WorkerPool(pairs).run()
@@ -0,0 +1,50 @@
+# Frames shaped like the hypersync event queries and the stored tables, for the tests.
+import polars as pl
+
+from lance_preconfs.commitments import join_commitment_events
+
+
+def encrypted(*indexes: int, block: int) -> pl.DataFrame:
+    return pl.DataFrame({
+        "block_number": [block] * len(indexes),
+        "timestamp": [block * 1000] * len(indexes),
+        "commitmentIndex": [f"0x{i}" for i in indexes],
+        "commiter": ["0xprovider"] * len(indexes),
+        "commitmentDigest": [f"0xdigest{i}" for i in indexes],
+        "commitmentSignature": ["0xsig"] * len(indexes),
+        "dispatchTimestamp": [block * 1000] * len(indexes),
+    })
+
+
+def opened(*indexes: int, block: int) -> pl.DataFrame:
+    return pl.DataFrame({
+        "block_number": [block] * len(indexes),
+        "commitmentIndex": [f"0x{i}" for i in indexes],
+        "blockNumber": [1] * len(indexes),
+        "txnHash": [f"{i:064x}" for i in indexes],
+        "bid": [10] * len(indexes),
+        "bidder": ["0xbidder"] * len(indexes),
+        "decayStartTimeStamp": [0] * len(indexes),
+        "decayEndTimeStamp": [0] * len(indexes),
+        "commitmentHash": [f"0xhash{i}" for i in indexes],
+        "revertingTxHashes": [""] * len(indexes),
+        "bidHash": [f"0xbid{i}" for i in indexes],
+        "bidSignature": ["0xsig"] * len(indexes),
+        "sharedSecretKey": ["0xkey"] * len(indexes),
+    })
+
+
+def processed(*indexes: int, block: int) -> pl.DataFrame:
+    return pl.DataFrame({
+        "block_number": [block] * len(indexes),
+        "commitmentIndex": [f"0x{i}" for i in indexes],
+        "isSlash": [False] * len(indexes),
+    })
+
+
+def commitments_frame(*indexes: int, block: int) -> pl.DataFrame:
+    return join_commitment_events(opened(*indexes, block=block), encrypted(*indexes, block=block), processed(*indexes, block=block))
+
+
+def l1_txs_frame(*indexes: int, block: int) -> pl.DataFrame:
+    return pl.DataFrame({"hash": [f"0x{i:064x}" for i in indexes], "block_number": [block] * len(indexes)})
@@ -0,0 +1,81 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import polars as pl
+import pytest
+
+from lance_preconfs import commitments
+from lance_preconfs.api import ReadApi, make_handler
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.commitments import build_hash_index
+from lance_preconfs.config import COMMITMENT_TABLE_NAME, COMMITMENTS_L1_TABLE_NAME, L1_TX_TABLE_NAME, NetworkConfig
+from lance_preconfs.inclusion import rebuild_inclusion
+
+from helpers import commitments_frame, l1_txs_frame
+
+
+@pytest.fixture
+def clients(tmp_path, monkeypatch) -> SharedClients:
+    monkeypatch.setattr(commitments, "HASH_INDEXES", {})
+    clients = SharedClients(NetworkConfig(name="test", uri=str(tmp_path), l1_hypersync_url="http://localhost"))
+    clients.table(COMMITMENT_TABLE_NAME).write(commitments_frame(1, 2, block=100))
+    clients.table(L1_TX_TABLE_NAME).write(l1_txs_frame(1, 2, block=5))
+    rebuild_inclusion(clients)
+    build_hash_index(clients)
+    return clients
+
+
+@pytest.fixture
+def server(clients):
+    api = ReadApi(uri=clients.network.uri)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(api))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(url: str, etag: str = None) -> tuple[int, dict, bytes]:
+    req = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_commitments_by_block_range_as_json(server):
+    status, headers, body = request(f"{server}/commitments?from_block=100&to_block=101")
+    assert status == 200 and headers["Content-Type"] == "application/json"
+    rows = json.loads(body)
+    assert sorted(row["commitmentIndex"] for row in rows) == ["0x1", "0x2"]
+    assert request(f"{server}/commitments")[0] == 400
+    assert request(f"{server}/unknown")[0] == 404
+
+
+def test_unchanged_data_answers_304(server):
+    _, headers, _ = request(f"{server}/bidders")
+    status, _, body = request(f"{server}/bidders", etag=headers["ETag"])
+    assert status == 304 and body == b""
+
+
+def test_preconf_share_without_mev_boost_data_is_empty(server):
+    status, _, body = request(f"{server}/mev-boost/preconf-share")
+    assert status == 200 and json.loads(body) == []
+
+
+def test_inclusion_backfill_changes_the_hash_lookup_version(clients, server):
+    url = f"{server}/commitments?hash=0x{2:064x}"
+    _, headers, body = request(url)
+    assert [row["commitmentIndex"] for row in json.loads(body)] == ["0x2"]
+
+    table = clients.table(COMMITMENTS_L1_TABLE_NAME)
+    backfilled = pl.from_arrow(table.to_arrow(filter="`commitmentIndex` = '0x2'")).with_columns(pl.lit(7).alias("l1_block_diff"))
+    table.update_hot(backfilled)
+    status, new_headers, body = request(url, etag=headers["ETag"])
+    assert status == 200 and new_headers["ETag"] != headers["ETag"]
+    assert [row["l1_block_diff"] for row in json.loads(body)] == [7]
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_import_does_not_load_heavy_dependencies():
+    result = run_python("-c", (
+        "import sys, lance_preconfs.cli; "
+        "print(' '.join(m for m in ('polars', 'lancedb', 'duckdb', 'pyarrow', 'hypersync') if m in sys.modules))"
+    ))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_help_runs_without_heavy_dependencies():
+    result = run_python("-X", "importtime", "-m", "lance_preconfs.cli", "--help")
+    assert result.returncode == 0, result.stderr
+    assert "bench" in result.stdout
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    assert not imported & {"polars", "lancedb", "duckdb"}
@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from lance_preconfs import commitments
+from lance_preconfs.commitments import CommitmentEventMatcher, fetch_ranges
+from lance_preconfs.fetch_planner import AdaptiveRangePlanner
+
+from helpers import commitments_frame, encrypted, opened, processed
+
+
+def test_matcher_joins_events_across_ranges():
+    matcher = CommitmentEventMatcher()
+    # commitment 1 is stored in the first range and processed in the second
+    first = matcher.match((opened(1, 2, block=10), encrypted(1, 2, block=10), processed(2, block=11)))
+    assert first["commitmentIndex"].to_list() == ["0x2"]
+
+    second = matcher.match((None, None, processed(1, block=20)))
+    assert second["commitmentIndex"].to_list() == ["0x1"]
+    assert all(frame is None or frame.is_empty() for frame in matcher.pending)
+
+
+def test_matcher_ignores_events_seen_twice():
+    matcher = CommitmentEventMatcher()
+    matcher.match((opened(1, block=10), encrypted(1, block=10), None))
+    again = matcher.match((opened(1, block=10), encrypted(1, block=10), processed(1, block=12)))
+    assert again["commitmentIndex"].to_list() == ["0x1"]
+
+
+def test_matcher_drops_events_past_the_horizon():
+    matcher = CommitmentEventMatcher(max_pending_blocks=100)
+    matcher.match((None, encrypted(1, block=10), None))
+    matcher.match((None, encrypted(2, block=500), None))
+    assert matcher.pending[1]["commitmentIndex"].to_list() == ["0x2"]
+
+
+def test_failed_range_is_not_skipped(monkeypatch):
+    calls: list[tuple[int, int]] = []
+
+    async def fetch(clients, from_block, to_block):
+        calls.append((from_block, to_block))
+        if from_block == 100:
+            raise RuntimeError("backend unavailable")
+        return None, None, processed(1, block=from_block)
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(commitments, "fetch_commitment_events", fetch)
+    monkeypatch.setattr(commitments.asyncio, "sleep", no_sleep)
+    planner = AdaptiveRangePlanner(initial_span=100, min_span=100, max_retries=2)
+
+    async def collect() -> list:
+        return [events async for events in fetch_ranges(SimpleNamespace(), planner, 0, 399)]
+
+    yielded = asyncio.run(collect())
+    assert len(yielded) == 1  # only the range before the failing one
+    assert calls == [(0, 100), (100, 200), (100, 200), (100, 200)]
+
+
+def test_failed_commitments_write_is_raised():
+    class FailingClients:
+        async def write(self, table, data):
+            raise OSError("disk full")
+
+    batch = commitments_frame(1, block=10)
+    with pytest.raises(OSError):
+        asyncio.run(commitments.write_commitments_batch(FailingClients(), batch, None))
+
+
+def test_empty_ranges_are_skipped_not_retried():
+    class EventClient:
+        # raises like the SDK when a range has no events; every event type is at block 5000 only
+        async def execute_event_query(self, event_name, from_block, to_block):
+            if not from_block <= 5000 < to_block:
+                raise ValueError(f"No data returned for event name: {event_name} from blocks {from_block} to {to_block}")
+            frames = {"OpenedCommitmentStored": opened, "UnopenedCommitmentStored": encrypted, "CommitmentProcessed": processed}
+            return frames[event_name](1, block=5000)
+
+    clients = SimpleNamespace(mev_commit=EventClient())
+    planner = AdaptiveRangePlanner(initial_span=1000, min_span=1000, max_retries=0)
+
+    async def collect() -> list:
+        return [events async for events in fetch_ranges(clients, planner, 0, 9999)]
+
+    yielded = asyncio.run(collect())
+    assert len(yielded) == 1
+    assert [frame["block_number"].to_list() for frame in yielded[0]] == [[5000], [5000], [5000]]
+    assert planner.consecutive_timeouts == 0
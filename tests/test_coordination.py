@@ -0,0 +1,114 @@
+import fcntl
+import os
+import threading
+
+import lancedb
+import polars as pl
+import pytest
+
+from lance_preconfs.config import L1_TX_TABLE_NAME
+from lance_preconfs.coordination import TableLock, retry_on_conflict
+from lance_preconfs.tiers import open_tiered
+
+
+def blocks(start: int, end: int) -> pl.DataFrame:
+    return pl.DataFrame({"block_number": list(range(start, end)), "hash": [f"0x{b:x}" for b in range(start, end)]})
+
+
+def test_lock_is_reentrant(tmp_path):
+    lock = TableLock(str(tmp_path), "t", timeout=0.2)
+    with lock:
+        with TableLock(str(tmp_path), "t", timeout=0.2):
+            pass
+    with lock:  # released again
+        pass
+
+
+def test_lock_held_by_another_thread_times_out(tmp_path):
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with TableLock(str(tmp_path), "t"):
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    try:
+        with pytest.raises(TimeoutError):
+            with TableLock(str(tmp_path), "t", timeout=0.2):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_lock_held_by_another_process_times_out(tmp_path):
+    lock = TableLock(str(tmp_path), "t", timeout=0.2)
+    os.makedirs(os.path.dirname(lock.path))
+    with open(lock.path, "a") as other:  # a separate open file behaves like another process's flock
+        fcntl.flock(other, fcntl.LOCK_EX)
+        with pytest.raises(TimeoutError):
+            with lock:
+                pass
+    with lock:
+        pass
+
+
+def test_conflicts_are_retried_after_rebase():
+    attempts, rebases = [], []
+
+    def operation():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("Commit conflict for version 7")
+        return "done"
+
+    assert retry_on_conflict(operation, "test", backoff=0, rebase=lambda: rebases.append(1)) == "done"
+    assert len(attempts) == 3 and len(rebases) == 2
+
+
+def test_other_errors_and_exhausted_retries_are_raised():
+    def fail():
+        raise ValueError("bad data")
+
+    with pytest.raises(ValueError):
+        retry_on_conflict(fail, "test", backoff=0)
+
+    def conflict():
+        raise RuntimeError("conflict")
+
+    with pytest.raises(RuntimeError):
+        retry_on_conflict(conflict, "test", retries=2, backoff=0)
+
+
+def test_retried_append_does_not_duplicate_committed_partitions(tmp_path):
+    table = open_tiered(L1_TX_TABLE_NAME, uri=str(tmp_path), db=lancedb.connect(str(tmp_path)))
+    create_table = table.db.create_table
+    failed = []
+
+    def conflicting_create_table(name, *args, **kwargs):
+        if name.endswith("__p000000007200") and not failed:
+            failed.append(name)
+            raise RuntimeError("Commit conflict: another writer committed first")
+        return create_table(name, *args, **kwargs)
+
+    table.db.create_table = conflicting_create_table
+    table.write(blocks(7100, 7400))  # the first partition commits before the second conflicts
+    table.promote()
+    assert failed
+    stored = pl.from_arrow(table.to_arrow(columns=["block_number"]))["block_number"].sort().to_list()
+    assert stored == list(range(7100, 7400))
+
+
+def test_rows_appended_during_compaction_stay_uncompacted(tmp_path):
+    table = open_tiered(L1_TX_TABLE_NAME, uri=str(tmp_path), db=lancedb.connect(str(tmp_path)))
+    table.write(blocks(0, 200))
+    pending = table.cold.uncompacted()
+    table.write(blocks(200, 300))  # lands while the listed partitions are being compacted
+    table.cold.mark_compacted(pending)
+    assert [p.compacted for p in table.cold.partitions] == [False]
+
+    table.compact()
+    assert [p.compacted for p in table.cold.partitions] == [True]
@@ -0,0 +1,38 @@
+from lance_preconfs.fetch_planner import AdaptiveRangePlanner
+
+
+def test_next_range_is_capped_at_the_target():
+    planner = AdaptiveRangePlanner(initial_span=100)
+    assert planner.next_range(0, 1_000) == (0, 100)
+    assert planner.next_range(950, 1_000) == (950, 1_000)
+
+
+def test_span_halves_on_timeout_and_grows_after_successes():
+    planner = AdaptiveRangePlanner(initial_span=1_000, min_span=300, max_span=1_500, grow_after=2)
+    planner.record_timeout()
+    assert planner.span == 500
+    planner.record_timeout()
+    assert planner.span == 300  # floored at min_span
+
+    planner.record_success()
+    assert planner.span == 300
+    planner.record_success()
+    assert planner.span == 600
+    for _ in range(4):
+        planner.record_success()
+    assert planner.span == 1_500  # capped at max_span
+
+
+def test_backoff_is_bounded_and_gives_up_after_max_retries():
+    planner = AdaptiveRangePlanner(base_backoff=1.0, max_backoff=3.0, max_retries=3)
+    delays = [planner.record_timeout() for _ in range(3)]
+    assert all(0 <= delay <= cap for delay, cap in zip(delays, (1.0, 2.0, 3.0)))
+    assert planner.record_timeout() is None
+    assert planner.consecutive_timeouts == 0  # the next cycle starts over
+
+
+def test_success_resets_the_timeout_count():
+    planner = AdaptiveRangePlanner(max_retries=1)
+    planner.record_timeout()
+    planner.record_success()
+    assert planner.record_timeout() is not None
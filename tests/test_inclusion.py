@@ -0,0 +1,53 @@
+import asyncio
+
+import polars as pl
+
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.config import COMMITMENT_TABLE_NAME, COMMITMENTS_L1_TABLE_NAME, L1_TX_TABLE_NAME, NetworkConfig
+from lance_preconfs.inclusion import build_profiles, rebuild_inclusion, write_inclusion
+from lance_preconfs.profiles import ProfileStore
+
+from helpers import commitments_frame, l1_txs_frame
+
+
+def make_clients(tmp_path) -> SharedClients:
+    return SharedClients(NetworkConfig(name="test", uri=str(tmp_path), l1_hypersync_url="http://localhost"))
+
+
+def inclusion_indexes(clients: SharedClients) -> list[str]:
+    table = pl.from_arrow(clients.table(COMMITMENTS_L1_TABLE_NAME).to_arrow(columns=["commitmentIndex"]))
+    return sorted(table["commitmentIndex"].to_list())
+
+
+def test_history_is_built_before_new_batches(tmp_path):
+    clients = make_clients(tmp_path)
+    clients.table(COMMITMENT_TABLE_NAME).write(commitments_frame(1, 2, block=100))
+    clients.table(L1_TX_TABLE_NAME).write(l1_txs_frame(1, 2, block=5))
+
+    # a batch arriving before the build is left to it rather than creating the table
+    batch = commitments_frame(3, block=200)
+    clients.table(COMMITMENT_TABLE_NAME).write(batch)
+    asyncio.run(write_inclusion(clients, batch, None))
+    assert clients.table(COMMITMENTS_L1_TABLE_NAME).latest_block() is None
+
+    assert rebuild_inclusion(clients) == 3
+    assert inclusion_indexes(clients) == ["0x1", "0x2", "0x3"]
+    assert rebuild_inclusion(clients) == 0
+    assert ProfileStore(clients.db).exists()
+    assert build_profiles(clients) == 0
+
+    batch = commitments_frame(4, block=300)
+    asyncio.run(write_inclusion(clients, batch, l1_txs_frame(4, block=6)))
+    assert inclusion_indexes(clients) == ["0x1", "0x2", "0x3", "0x4"]
+
+
+def test_profiles_are_built_from_existing_commitments_l1(tmp_path):
+    clients = make_clients(tmp_path)
+    clients.table(COMMITMENT_TABLE_NAME).write(commitments_frame(1, 2, block=100))
+    clients.table(L1_TX_TABLE_NAME).write(l1_txs_frame(1, 2, block=5))
+    rebuild_inclusion(clients)
+    profiles = ProfileStore(clients.db)
+    clients.db.drop_table(profiles.applied_name)  # profiles from before commitments were recorded
+
+    assert build_profiles(clients) == 2  # one provider and one bidder
+    assert profiles.exists()
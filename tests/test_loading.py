@@ -0,0 +1,72 @@
+import lancedb
+import polars as pl
+
+from lance_preconfs.config import L1_TX_TABLE_NAME
+from lance_preconfs.loading import TableLoader, splice
+from lance_preconfs.notifications import WriteNotifier
+from lance_preconfs.tiers import open_tiered
+
+
+def blocks(start: int, end: int) -> pl.DataFrame:
+    return pl.DataFrame({"block_number": list(range(start, end)), "hash": [f"0x{b:x}" for b in range(start, end)]})
+
+
+def write(uri: str, data: pl.DataFrame) -> None:
+    table = open_tiered(L1_TX_TABLE_NAME, uri=uri, db=lancedb.connect(uri))
+    table.write(data)
+    WriteNotifier(uri).publish(L1_TX_TABLE_NAME, table.version(), data)
+
+
+def test_splice_keeps_the_frame_order():
+    ascending = splice(blocks(0, 5), blocks(3, 7).reverse(), "block_number", 3)
+    assert ascending["block_number"].to_list() == list(range(7))
+    descending = splice(blocks(0, 5).reverse(), blocks(3, 7), "block_number", 3)
+    assert descending["block_number"].to_list() == list(range(6, -1, -1))
+
+
+def test_refresh_appends_new_blocks_to_an_ascending_frame(tmp_path):
+    uri = str(tmp_path)
+    write(uri, blocks(0, 200))
+    loader = TableLoader(uri)
+    frame = loader.derive("sorted", L1_TX_TABLE_NAME, lambda df: df.sort("block_number"), index="block_number")
+    assert frame.tail(3)["block_number"].to_list() == [197, 198, 199]
+
+    write(uri, blocks(200, 203))
+    assert loader.refresh() == {L1_TX_TABLE_NAME}
+    refreshed = loader.derive("sorted", L1_TX_TABLE_NAME, lambda df: df, index="block_number")
+    assert refreshed.tail(3)["block_number"].to_list() == [200, 201, 202]
+    assert refreshed["block_number"].to_list() == list(range(203))
+    assert loader.refresh() == set()  # events are applied once
+    loader.close()
+
+
+def test_tables_load_on_first_access(tmp_path):
+    uri = str(tmp_path)
+    write(uri, blocks(0, 50))
+    loader = TableLoader(uri, prefetch=(L1_TX_TABLE_NAME,))
+    assert loader.frame(L1_TX_TABLE_NAME, timeout=30).height == 50
+    assert loader.arrow(L1_TX_TABLE_NAME).num_rows == 50  # the same load, not a new one
+    loader.close()
+
+
+def test_refresh_reads_only_from_the_first_written_block(tmp_path):
+    uri = str(tmp_path)
+    write(uri, blocks(0, 100))
+    loader = TableLoader(uri)
+    loader.frame(L1_TX_TABLE_NAME)
+    seen: list[list[int]] = []
+
+    def transform(df: pl.DataFrame) -> pl.DataFrame:
+        seen.append(sorted(df["block_number"].to_list()))
+        return df.sort("block_number", descending=True)
+
+    loader.derive("newest_first", L1_TX_TABLE_NAME, transform, index="block_number")
+    write(uri, blocks(100, 105))
+    write(uri, blocks(95, 98))  # a rewrite of earlier blocks in the same refresh
+    loader.refresh()
+
+    assert seen[-1] == list(range(95, 105))
+    frame = loader.derive("newest_first", L1_TX_TABLE_NAME, transform, index="block_number")
+    assert frame["block_number"].to_list() == list(range(104, -1, -1))
+    assert sorted(loader.frame(L1_TX_TABLE_NAME)["block_number"].to_list()) == list(range(105))
+    loader.close()
@@ -0,0 +1,60 @@
+import polars as pl
+import pytest
+
+from lance_preconfs import commitments
+from lance_preconfs.clients import SharedClients
+from lance_preconfs.commitments import build_hash_index
+from lance_preconfs.config import COMMITMENT_TABLE_NAME, L1_TX_TABLE_NAME, NetworkConfig
+from lance_preconfs.inclusion import rebuild_inclusion
+from lance_preconfs.lookup import HashIndex, HashLookup
+
+from helpers import commitments_frame, l1_txs_frame
+
+
+@pytest.fixture(autouse=True)
+def fresh_hash_indexes(monkeypatch):
+    # the per-network index handles would otherwise outlive each test's directory
+    monkeypatch.setattr(commitments, "HASH_INDEXES", {})
+
+
+def make_clients(tmp_path) -> SharedClients:
+    return SharedClients(NetworkConfig(name="test", uri=str(tmp_path), l1_hypersync_url="http://localhost"))
+
+
+def test_index_is_built_with_its_btree(tmp_path):
+    clients = make_clients(tmp_path)
+    clients.table(COMMITMENT_TABLE_NAME).write(commitments_frame(1, 2, block=100))
+    assert build_hash_index(clients) == 8  # four hash columns per commitment
+
+    index = HashIndex(clients.db)
+    assert index.exists()
+    indices = clients.db.open_table(index.name).to_lance().list_indices()
+    assert [idx["fields"] for idx in indices] == [["hash"]]
+    assert build_hash_index(clients) == 0
+
+
+def test_table_without_its_index_is_rebuilt(tmp_path):
+    clients = make_clients(tmp_path)
+    clients.table(COMMITMENT_TABLE_NAME).write(commitments_frame(1, block=100))
+    index = HashIndex(clients.db)
+    # as left by a build whose index failed: Polars strings, no BTREE
+    clients.db.create_table(index.name, data=pl.DataFrame({"hash": ["ab"]}).to_arrow())
+    assert not index.exists()
+
+    assert build_hash_index(clients) == 4
+    assert index.exists()
+    assert index.find("ab") is None
+
+
+def test_resolve_finds_the_commitment_and_its_l1_tx(tmp_path):
+    clients = make_clients(tmp_path)
+    clients.table(COMMITMENT_TABLE_NAME).write(commitments_frame(1, 2, block=100))
+    clients.table(L1_TX_TABLE_NAME).write(l1_txs_frame(1, 2, block=5))
+    rebuild_inclusion(clients)
+    build_hash_index(clients)
+
+    lookup = HashLookup(uri=str(tmp_path), db=clients.db)
+    result = lookup.resolve(f"0x{2:064X}")  # the txnHash of commitment 2, in any case
+    assert result["commitments"]["commitmentIndex"].to_list() == ["0x2"]
+    assert result["l1_txs"]["hash"].to_list() == [f"0x{2:064x}"]
+    assert lookup.resolve("0x" + "f" * 64) is None
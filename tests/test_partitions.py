@@ -0,0 +1,59 @@
+import lancedb
+import polars as pl
+
+from lance_preconfs.config import L1_TX_TABLE_NAME
+from lance_preconfs.partitions import ARCHIVE, LIVE, PartitionedTable
+
+
+def blocks(start: int, end: int) -> pl.DataFrame:
+    return pl.DataFrame({"block_number": list(range(start, end)), "hash": [f"0x{b:x}" for b in range(start, end)]})
+
+
+def open_table(path, partition_blocks: int = 100) -> PartitionedTable:
+    return PartitionedTable(lancedb.connect(str(path)), str(path), L1_TX_TABLE_NAME, partition_blocks=partition_blocks)
+
+
+def read_blocks(table: PartitionedTable, **window) -> list[int]:
+    rows = table.to_arrow(columns=["block_number"], **window)
+    return [] if rows is None else sorted(pl.from_arrow(rows)["block_number"].to_list())
+
+
+def test_rows_are_split_by_block_range(tmp_path):
+    table = open_table(tmp_path)
+    assert table.append(blocks(50, 250)) == 200
+    assert [(p.start_block, p.min_block, p.max_block, p.rows) for p in table.partitions] == [
+        (0, 50, 99, 50), (100, 100, 199, 100), (200, 200, 249, 50),
+    ]
+    assert table.max_block() == 249
+    assert [p.start_block for p in table.select_partitions(from_block=120, to_block=210)] == [100, 200]
+    assert read_blocks(table, from_block=195, to_block=205) == list(range(195, 205))
+
+
+def test_readers_pick_up_partitions_written_elsewhere(tmp_path):
+    writer = open_table(tmp_path)
+    reader = open_table(tmp_path)
+    writer.append(blocks(0, 100))
+    assert reader.max_block() == 99
+    writer.append(blocks(100, 150))
+    assert read_blocks(reader, from_block=90) == list(range(90, 150))
+
+    writer.apply_retention(live_partitions=1, action=ARCHIVE)
+    assert [p.tier for p in reader.select_partitions()] == [ARCHIVE, LIVE]
+    assert read_blocks(reader) == list(range(0, 150))
+
+
+def test_empty_legacy_table_is_not_registered(tmp_path):
+    db = lancedb.connect(str(tmp_path))
+    db.create_table(L1_TX_TABLE_NAME, data=blocks(0, 1).clear().to_arrow())
+    table = open_table(tmp_path)
+    assert table.partitions == []
+    table.append(blocks(0, 10))
+    assert table.max_block() == 9
+
+
+def test_legacy_table_is_registered_as_one_partition(tmp_path):
+    db = lancedb.connect(str(tmp_path))
+    db.create_table(L1_TX_TABLE_NAME, data=blocks(10, 20).to_arrow())
+    table = open_table(tmp_path)
+    assert [(p.table, p.start_block, p.end_block) for p in table.partitions] == [(L1_TX_TABLE_NAME, 10, 20)]
+    assert read_blocks(table) == list(range(10, 20))
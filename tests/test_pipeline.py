@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from lance_preconfs.pipeline import run_pipeline
+
+
+async def numbers(count: int):
+    for number in range(count):
+        yield number
+
+
+def test_items_flow_through_stages_in_order():
+    written: list[int] = []
+
+    async def double(item: int) -> int:
+        return item * 2
+
+    async def drop_odd(item: int):
+        return item if item % 4 == 0 else None
+
+    async def write(item: int) -> None:
+        written.append(item)
+
+    completed = asyncio.run(run_pipeline(numbers(10), [double, drop_odd, write], queue_size=1))
+    assert written == [0, 4, 8, 12, 16]
+    assert completed == 5
+
+
+def test_failed_write_stops_later_batches():
+    written: list[int] = []
+
+    async def write(item: int) -> None:
+        if item == 3:
+            raise RuntimeError("write failed")
+        written.append(item)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_pipeline(numbers(100), [write], queue_size=2))
+    assert written == [0, 1, 2]
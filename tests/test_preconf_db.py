@@ -0,0 +1,62 @@
+import datetime
+
+import lancedb
+import polars as pl
+
+from lance_preconfs import analytics
+from lance_preconfs.config import COMMITMENT_TABLE_NAME
+from lance_preconfs.preconf_db import PreconfDB
+from lance_preconfs.tiers import open_tiered
+
+from helpers import commitments_frame
+
+
+def write_commitments(uri: str, data: pl.DataFrame) -> None:
+    open_tiered(COMMITMENT_TABLE_NAME, uri=uri, db=lancedb.connect(uri)).write(data)
+
+
+def fixture(uri: str) -> pl.DataFrame:
+    # commitments 1-3 land in L1 block 1; only commitment 2 is slashed
+    data = commitments_frame(1, 2, 3, block=100).with_columns(
+        (pl.col("commitmentIndex") == "0x2").alias("isSlash"),
+        pl.col("bid") * 10**16,
+    )
+    write_commitments(uri, data)
+    return data
+
+
+def test_range_queries_and_views(tmp_path):
+    uri = str(tmp_path)
+    fixture(uri)
+    db = PreconfDB(uri=uri)
+    assert db.latest_block() == 100
+    assert db.query("commitments_in_range", from_block=100, to_block=101).height == 3
+    assert db.query("commitments_in_range", from_block=0, to_block=100).is_empty()
+
+    rates = db.query("slash_rates_since", since=datetime.datetime(1970, 1, 1))
+    assert rates.select("slash_count", "total_count").rows() == [(1, 3)]
+    assert db.query("top_bidders", limit=5)["bid_count"].to_list() == [3]
+    db.close()
+
+
+def test_slashed_block_rule_matches_analytics(tmp_path):
+    uri = str(tmp_path)
+    data = fixture(uri)
+    db = PreconfDB(uri=uri)
+    blocks = db.query("preconf_blocks_in_range", from_block=0, to_block=10)
+    assert blocks.select("l1_block_number", "preconf_count", "isSlash").rows() == [(1, 3, True)]
+
+    polars_blocks = analytics.preconf_blocks(analytics.prepare_commitments(data))
+    assert polars_blocks.select("l1_block_number", "isSlash").rows() == [(1, True)]
+    db.close()
+
+
+def test_new_writes_are_visible_after_refresh(tmp_path):
+    uri = str(tmp_path)
+    fixture(uri)
+    db = PreconfDB(uri=uri)
+    assert db.latest_block() == 100
+    write_commitments(uri, commitments_frame(4, block=200))
+    assert db.latest_block() == 200
+    assert db.sql("SELECT count(*) FROM commitments").item() == 4
+    db.close()
@@ -0,0 +1,52 @@
+import lancedb
+import numpy as np
+import polars as pl
+
+from lance_preconfs.inclusion import build_inclusion
+from lance_preconfs.profiles import TOTAL_SLOT, ProfileStore
+
+from helpers import commitments_frame, l1_txs_frame
+
+
+def inclusion(*indexes: int, found: bool = True) -> pl.DataFrame:
+    l1_txs = l1_txs_frame(*indexes, block=5)
+    return build_inclusion(commitments_frame(*indexes, block=100), l1_txs if found else None, l1_txs.clear())
+
+
+def profile_counts(store: ProfileStore) -> dict[str, np.ndarray]:
+    rows = store._open().to_lance().to_table(columns=["id", "counts"]).to_pylist()
+    return {row["id"]: np.array(row["counts"]) for row in rows}
+
+
+def test_replayed_batch_is_counted_once(tmp_path):
+    store = ProfileStore(lancedb.connect(str(tmp_path)))
+    store.update(inclusion(1, 2))
+    before = profile_counts(store)
+    assert before["commiter:0xprovider"][TOTAL_SLOT] == 2
+
+    assert store.update(inclusion(1, 2)) == 0
+    assert profile_counts(store).keys() == before.keys()
+    assert all((profile_counts(store)[i] == counts).all() for i, counts in before.items())
+
+
+def test_backfilled_rows_replace_their_earlier_counts(tmp_path):
+    store = ProfileStore(lancedb.connect(str(tmp_path)))
+    store.update(inclusion(1, 2, found=False))
+    store.update(inclusion(1, found=True))
+    counts = profile_counts(store)["commiter:0xprovider"]
+    assert counts[TOTAL_SLOT] == 2
+
+    rebuilt = ProfileStore(lancedb.connect(str(tmp_path / "rebuilt")))
+    rebuilt.rebuild(pl.concat([inclusion(1, found=True), inclusion(2, found=False)]))
+    assert (profile_counts(rebuilt)["commiter:0xprovider"] == counts).all()
+
+
+def test_addresses_are_normalized(tmp_path):
+    store = ProfileStore(lancedb.connect(str(tmp_path)))
+    batch = inclusion(1, 2).with_columns(
+        pl.Series("commiter", ["0xABC", "0xDEF"]), pl.Series("bidder", ["0xBidder", "0xbidder"])
+    )
+    store.update(batch)
+    assert set(profile_counts(store)) == {"commiter:0xabc", "commiter:0xdef", "bidder:0xbidder"}
+    similar = store.similar("0xABC")
+    assert similar["address"].to_list() == ["0xdef"]
@@ -0,0 +1,49 @@
+import datetime
+
+import numpy as np
+import polars as pl
+
+from lance_preconfs.rendering import downsample, lttb_indices, time_buckets
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    y[800] = -20.0
+    indices = lttb_indices(x, y, 20)
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert {437, 800} <= set(indices.tolist())
+
+
+def test_lttb_returns_every_point_below_threshold():
+    x = np.arange(10, dtype=np.float64)
+    assert lttb_indices(x, x, 10).tolist() == list(range(10))
+    assert lttb_indices(x, x, 2).tolist() == list(range(10))
+
+
+def test_downsample_splits_points_between_groups():
+    df = pl.DataFrame({
+        "t": list(range(300)) * 2,
+        "v": [float(i % 7) for i in range(600)],
+        "g": ["a"] * 300 + ["b"] * 300,
+    })
+    sampled = downsample(df, "t", "v", max_points=100, by="g")
+    assert sampled.group_by("g").len().sort("g")["len"].to_list() == [50, 50]
+
+
+def test_time_buckets_counts_rows_per_bucket():
+    start = datetime.datetime(2024, 1, 1)
+    df = pl.DataFrame({
+        "datetime": [start + datetime.timedelta(minutes=m) for m in (0, 10, 59, 60, 130)],
+        "commiter": ["a", "b", "a", "a", "b"],
+    })
+    assert time_buckets(df, "datetime", "1h")["count"].to_list() == [3, 1, 1]
+    by_commiter = time_buckets(df, "datetime", "1h", by="commiter")
+    assert by_commiter.rows() == [
+        (start, "a", 2), (start, "b", 1),
+        (start + datetime.timedelta(hours=1), "a", 1),
+        (start + datetime.timedelta(hours=2), "b", 1),
+    ]
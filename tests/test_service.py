@@ -0,0 +1,25 @@
+from lance_preconfs import service
+from lance_preconfs.config import NETWORKS
+from lance_preconfs.workers import worker_main
+
+
+def test_first_source_of_a_network_writes_snapshots():
+    network = NETWORKS["holesky"]
+    assert service.tasks_for(network) == [
+        service.COMMITMENTS_TASK, service.MEV_BOOST_TASK, service.PROMOTION_TASK, service.SNAPSHOT_TASK,
+    ]
+    assert service.SNAPSHOT_TASK in service.tasks_for(network, sources=["commitments"])
+    assert service.SNAPSHOT_TASK not in service.tasks_for(network, sources=["mev_boost"])
+
+
+def test_workers_run_the_tasks_of_their_source(monkeypatch):
+    started = {}
+
+    def run_tasks(tasks, network, log_format):
+        started[network.name] = tasks
+
+    monkeypatch.setattr(service, "run_tasks", run_tasks)
+    worker_main("holesky", "commitments")
+    assert started["holesky"] == service.tasks_for(NETWORKS["holesky"], sources=["commitments"])
+    worker_main("mainnet", "mev_boost")
+    assert service.SNAPSHOT_TASK in started["mainnet"]  # mev_boost is mainnet's only source
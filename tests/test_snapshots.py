@@ -0,0 +1,77 @@
+import lancedb
+import polars as pl
+
+from lance_preconfs import analytics
+from lance_preconfs.config import COMMITMENT_TABLE_NAME
+from lance_preconfs.loading import TableLoader
+from lance_preconfs.notifications import WriteNotifier
+from lance_preconfs.snapshots import load_snapshot, snapshot_manifest, write_snapshot
+from lance_preconfs.tiers import open_tiered
+
+from helpers import commitments_frame
+
+
+def write(uri: str, data: pl.DataFrame) -> None:
+    table = open_tiered(COMMITMENT_TABLE_NAME, uri=uri, db=lancedb.connect(uri))
+    table.write(data)
+    WriteNotifier(uri).publish(COMMITMENT_TABLE_NAME, table.version(), data)
+
+
+def dashboard_loader(uri: str, max_age: float = 3600) -> tuple[TableLoader, pl.DataFrame]:
+    # what the dashboard does on startup
+    manifest = snapshot_manifest(uri)
+    frames = load_snapshot(uri, max_age=max_age, manifest=manifest) or {}
+    loader = TableLoader(uri)
+    if frames:
+        loader.cursor = manifest["notification_id"]
+    commit_df = loader.derive(
+        "commit_df", COMMITMENT_TABLE_NAME, analytics.prepare_commitments,
+        index="mev_commit_block_number", initial=frames.get("commit_df"),
+    )
+    return loader, commit_df
+
+
+def indexes(loader: TableLoader) -> list[int]:
+    commit_df = loader.derive("commit_df", COMMITMENT_TABLE_NAME, analytics.prepare_commitments, index="mev_commit_block_number")
+    return sorted(commit_df["mev_commit_block_number"].to_list())
+
+
+def test_snapshot_frames_match_the_tables(tmp_path):
+    uri = str(tmp_path)
+    assert write_snapshot(uri) is None  # nothing ingested yet
+    write(uri, commitments_frame(1, 2, block=100))
+    version = write_snapshot(uri)
+    manifest = snapshot_manifest(uri)
+    assert manifest["version"] == version and manifest["frames"] == ["commit_df"]
+    frames = load_snapshot(uri)
+    assert frames["commit_df"].height == 2
+
+
+def test_writes_after_the_snapshot_are_replayed(tmp_path):
+    uri = str(tmp_path)
+    write(uri, commitments_frame(1, 2, block=100))
+    write_snapshot(uri)
+    write(uri, commitments_frame(3, block=200))  # after the snapshot's notification cursor
+
+    loader, commit_df = dashboard_loader(uri)
+    assert commit_df.height == 2  # straight from the snapshot
+    assert loader.refresh() == {COMMITMENT_TABLE_NAME}
+    assert indexes(loader) == [100, 100, 200]  # only the newer write is applied, once
+    assert loader.refresh() == set()
+    loader.close()
+
+
+def test_stale_snapshot_falls_back_to_a_full_load(tmp_path):
+    uri = str(tmp_path)
+    write(uri, commitments_frame(1, 2, block=100))
+    write_snapshot(uri)
+    write(uri, commitments_frame(3, block=200))
+
+    manifest = snapshot_manifest(uri)
+    manifest["created_at"] -= 7200
+    assert load_snapshot(uri, max_age=3600, manifest=manifest) is None
+
+    loader, commit_df = dashboard_loader(uri, max_age=0)
+    assert sorted(commit_df["mev_commit_block_number"].to_list()) == [100, 100, 200]
+    assert loader.refresh() == set()  # the full load already has every write
+    loader.close()
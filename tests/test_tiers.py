@@ -0,0 +1,70 @@
+import lancedb
+import polars as pl
+
+from lance_preconfs.config import COMMITMENTS_L1_TABLE_NAME, L1_TX_TABLE_NAME
+from lance_preconfs.tiers import open_tiered
+
+
+def blocks(start: int, end: int) -> pl.DataFrame:
+    return pl.DataFrame({"block_number": list(range(start, end)), "hash": [f"0x{b:x}" for b in range(start, end)]})
+
+
+def stored_blocks(table) -> list[int]:
+    return sorted(pl.from_arrow(table.to_arrow(columns=["block_number"]))["block_number"].to_list())
+
+
+def test_batch_after_downtime_keeps_hot_rows(tmp_path):
+    table = open_tiered(L1_TX_TABLE_NAME, uri=str(tmp_path), db=lancedb.connect(str(tmp_path)))
+    table.write(blocks(100, 120))  # all within the confirmation depth, so hot
+    assert table.cold_max() is None
+
+    table.write(blocks(120, 400))  # the first batch is final now
+    table.promote()
+    assert stored_blocks(table) == list(range(100, 400))
+
+
+def test_old_batch_after_hot_batch(tmp_path):
+    table = open_tiered(L1_TX_TABLE_NAME, uri=str(tmp_path), db=lancedb.connect(str(tmp_path)))
+    table.write(blocks(1000, 1010))
+    table.write(blocks(500, 510))  # below the head, e.g. a catch-up range written late
+    table.write(blocks(100, 110))  # and below the cold watermark
+    table.promote()
+    table.write(blocks(2000, 2010))
+    table.promote()
+    assert stored_blocks(table) == list(range(100, 110)) + list(range(500, 510)) + list(range(1000, 1010)) + list(range(2000, 2010))
+
+
+def test_replayed_batch_is_not_duplicated(tmp_path):
+    table = open_tiered(L1_TX_TABLE_NAME, uri=str(tmp_path), db=lancedb.connect(str(tmp_path)))
+    table.write(blocks(100, 300))
+    table.promote()
+    table.write(blocks(100, 300))
+    table.promote()
+    assert stored_blocks(table) == list(range(100, 300))
+
+
+def inclusion_rows(indexes: range, block: int, l1_block=None) -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "mev_commit_block_number": [block + i for i in indexes],
+            "commitmentIndex": [f"0x{i}" for i in indexes],
+            "block_number": [l1_block] * len(indexes),
+        },
+        schema={"mev_commit_block_number": pl.Int64, "commitmentIndex": pl.Utf8, "block_number": pl.Int64},
+    )
+
+
+def test_keyed_rows_stay_hot_until_filled_in(tmp_path):
+    table = open_tiered(COMMITMENTS_L1_TABLE_NAME, uri=str(tmp_path), db=lancedb.connect(str(tmp_path)))
+    table.write(inclusion_rows(range(0, 5), block=100))
+    table.write(inclusion_rows(range(5, 10), block=10_000, l1_block=7))
+    table.promote()
+    assert table.cold_max() is None  # the first rows are final but still pending
+
+    table.update_hot(inclusion_rows(range(0, 5), block=100, l1_block=6))
+    table.write(inclusion_rows(range(0, 5), block=100, l1_block=6))  # a replay is not duplicated
+    table.promote()
+    stored = pl.from_arrow(table.to_arrow())
+    assert sorted(stored["commitmentIndex"].to_list()) == [f"0x{i}" for i in range(10)]
+    assert stored.filter(pl.col("block_number").is_null()).is_empty()
+    assert table.cold_max() == 104
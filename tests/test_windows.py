@@ -0,0 +1,37 @@
+from lance_preconfs.windows import HISTORY_HOURS, WindowedCounts
+
+WINDOWS = {"1h": 3600, "2h": 7200}  # 60 and 120 one-minute buckets
+
+
+def test_gap_longer_than_a_window_does_not_expire_stale_slots():
+    counts = WindowedCounts(WINDOWS, bucket_seconds=60)
+    counts.add(0, 5, 1)
+    counts.add(100, 3, 0)
+    assert counts.window("1h") == (3, 0)
+    assert counts.window("2h") == (8, 1)
+
+    counts.advance(181)  # slot 0 of bucket 120 still holds bucket 0, which already left the 1h window
+    assert counts.window("1h") == (0, 0)
+    assert counts.window("2h") == (3, 0)
+
+
+def test_gap_longer_than_every_window_resets():
+    counts = WindowedCounts(WINDOWS, bucket_seconds=60)
+    counts.add(0, 5, 1)
+    counts.advance(10_000)
+    assert counts.window("1h") == (0, 0)
+    assert counts.window("2h") == (0, 0)
+    counts.add(10_000, 2, 1)
+    assert counts.window("2h") == (2, 1)
+    assert len(counts.history) <= HISTORY_HOURS
+
+
+def test_hourly_snapshots_are_taken_after_expiry():
+    counts = WindowedCounts(WINDOWS, bucket_seconds=60)
+    counts.add(30, 4, 1)
+    counts.add(125, 1, 0)  # counted after the snapshots of hours 1 and 2
+    assert counts.window_at("1h", 1) == (4, 1)
+    assert counts.window_at("1h", 2) == (0, 0)  # bucket 30 left the hour window at the start of hour 2
+    assert counts.window_at("2h", 2) == (4, 1)
+    assert counts.window_at("1h", 3) is None
+    assert counts.window("1h") == (1, 0)